@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from comments.models import Comment
+from posts.admin import ModerationAdminMixin
+from posts.models import ModerationLog
+
+
+@admin.register(Comment)
+class CommentAdmin(ModerationAdminMixin, admin.ModelAdmin):
+    moderation_target = ModerationLog.Target.COMMENT
+    list_display = ("id", "post_id", "user", "status", "is_deleted", "created_at")
+    list_filter = ("status", "is_deleted")
+    search_fields = ("content",)
+    raw_id_fields = ("post", "user")
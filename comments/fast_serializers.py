@@ -0,0 +1,49 @@
+from typing import Any, Dict, Iterable, List
+
+from rest_framework import serializers
+
+from comments.models import Comment
+
+# 읽기 전용 빠른 직렬화 (게시글 상세에 포함되는 댓글)
+# - CommentResponseSerializer 와 바이트 단위로 동일한 dict 를 직접 구성
+# - 시리얼라이저 필드를 추가 / 변경하면 이 모듈도 함께 수정
+
+DELETED_COMMENT_CONTENT = "삭제된 댓글입니다."
+
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_comment_author(comment: Comment) -> Dict[str, Any]:
+    user = comment.user
+    role = getattr(user, "role", "")
+    result = {"id": user.id, "role": role}
+
+    # 기업회원 - 기업명 / 공방회원 - 공방명 표시
+    if role == "COMPANY":
+        result["company_name"] = getattr(user, "company_name", "")
+    elif role == "WORKSHOP":
+        result["workshop_name"] = getattr(user, "workshop_name", "")
+
+    return result
+
+
+def serialize_comment(comment: Comment) -> Dict[str, Any]:
+    # CommentResponseSerializer(comment).data 와 동일
+    to_datetime = _datetime_field.to_representation
+    return {
+        "id": None if comment.id is None else int(comment.id),
+        "content": (
+            DELETED_COMMENT_CONTENT
+            if comment.is_deleted
+            else None if comment.content is None else str(comment.content)
+        ),
+        "author": serialize_comment_author(comment),
+        "is_deleted": None if comment.is_deleted is None else bool(comment.is_deleted),
+        "created_at": None if comment.created_at is None else to_datetime(comment.created_at),
+        "updated_at": None if comment.updated_at is None else to_datetime(comment.updated_at),
+    }
+
+
+def serialize_comments(comments: Iterable[Comment]) -> List[Dict[str, Any]]:
+    # CommentResponseSerializer(comments, many=True).data 와 동일
+    return [serialize_comment(comment) for comment in comments]
@@ -1,7 +1,11 @@
 from django.db import models
 
+from config.managers import SoftDeleteManager
 from users.models import User
 
+# 공개 댓글 조건 (삭제 / 숨김 제외) - Comment.objects 조건이자 부분 인덱스 조건
+LIVE_COMMENT_CONDITION = models.Q(is_deleted=False, status="ACTIVE")
+
 
 class Comment(models.Model):
     # 회원(기업/공방)만 작성 가능
@@ -43,14 +47,30 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, help_text="작성일시")
     updated_at = models.DateTimeField(auto_now=True, help_text="수정일시")
 
+    # 삭제 / 숨김 댓글 포함 조회는 all_objects
+    LIVE_CONDITION = LIVE_COMMENT_CONDITION
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
     class Meta:
         db_table = "comments"
         ordering = ["-created_at"]
         indexes = [
             # 게시글 별 댓글 조회 최적화
             models.Index(fields=["post", "created_at"]),
-            # 삭제되지 않은 댓글 조회 최적화
-            models.Index(fields=["is_deleted"]),
+            # 게시글 별 공개 댓글 목록 (최신순, 커서 페이지네이션)
+            # (is_deleted 단일 인덱스 대신 공개 댓글만 담은 부분 인덱스 사용)
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                name="idx_comment_live_post_created",
+                condition=LIVE_COMMENT_CONDITION,
+            ),
+            # 보관 대상(삭제 후 일정 기간 지난 댓글) 조회
+            models.Index(
+                fields=["updated_at"],
+                name="idx_comment_deleted_updated",
+                condition=models.Q(is_deleted=True),
+            ),
         ]
 
     def __str__(self) -> str:
@@ -68,3 +88,23 @@ class Comment(models.Model):
 
         # (삭제된 객체 수, {모델명: 삭제된 객체 수}) 형태로 반환
         return (1, {f"{self._meta.model_name}": 1})
+
+
+class ArchivedComment(models.Model):
+    # 삭제 후 SOFT_DELETE_ARCHIVE_DAYS 가 지난 댓글 / 보관된 게시글의 댓글 보관
+    # (posts.archive.SoftDeleteArchiver)
+    # - data: 보관 시점의 댓글 행 전체
+
+    id = models.BigIntegerField(primary_key=True, help_text="원래 댓글 id")
+    post_id = models.BigIntegerField(help_text="댓글이 작성된 게시글 id")
+    user_id = models.BigIntegerField(help_text="댓글 작성자 id")
+    data = models.JSONField(help_text="보관 시점의 댓글 행")
+    created_at = models.DateTimeField(help_text="작성일시")
+    deleted_at = models.DateTimeField(help_text="삭제일시 (게시글과 함께 보관된 경우 보관일시)")
+    archived_at = models.DateTimeField(auto_now_add=True, help_text="보관일시")
+
+    class Meta:
+        db_table = "comments_archive"
+        indexes = [
+            models.Index(fields=["post_id"], name="idx_archivedcomment_post"),
+        ]
@@ -102,7 +102,7 @@ class CommentUpdateSerializer(BaseSerializer):
             raise ValidationError("수정할 댓글이 존재하지 않습니다.")
 
         # 권한 및 상태 검증
-        if self.instance.user != self.context["request"].user:
+        if self.instance.user_id != self.context["request"].user.id:
             raise ValidationError("자신의 댓글만 수정할 수 있습니다.")
         if self.instance.is_deleted:
             raise ValidationError("삭제된 댓글은 수정할 수 없습니다.")
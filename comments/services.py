@@ -1,15 +1,24 @@
-from typing import Any, Dict, List, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from django.db import models, transaction
-from django.db.models import F
+from django.db.models import F, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
 from comments.models import Comment
 from posts.models import Post
 
+CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 
 class CommentService:
+    @staticmethod
+    def get_comment_list_version(post_id: int) -> int:
+        # 댓글 목록 ETag 용: 댓글 작성 / 수정 / 삭제 시 증가하는 게시글 캐시 버전
+        return get_object_or_404(Post.objects.values_list("version", flat=True), id=post_id)
+
     @staticmethod
     def get_post_comments(
         post_id: int,
@@ -18,13 +27,11 @@ class CommentService:
     ) -> Tuple[List[Comment], int]:
 
         # 게시글 존재 여부 확인
-        get_object_or_404(Post, id=post_id, is_deleted=False)
+        get_object_or_404(Post, id=post_id)
 
         # 게시글 댓글 목록 조회
         queryset = (
-            Comment.objects.select_related("user")
-            .filter(post_id=post_id, is_deleted=False)
-            .order_by("-created_at")
+            Comment.objects.select_related("user").filter(post_id=post_id).order_by("-created_at")
         )
 
         total_count = queryset.count()
@@ -32,6 +39,69 @@ class CommentService:
 
         return comments, total_count
 
+    @staticmethod
+    def iter_post_comments(post_id: int, chunk_size: int = 1000) -> Tuple[Iterator[Comment], int]:
+        # 게시글의 모든 댓글을 서버 측 커서로 chunk_size 개씩 조회 (내보내기용)
+        # 댓글 수와 관계없이 메모리에는 chunk_size 개만 유지
+        post = get_object_or_404(Post.objects.only("id", "comment_count"), id=post_id)
+        queryset = (
+            Comment.objects.select_related("user")
+            .filter(post_id=post_id)
+            .order_by("-created_at", "-id")
+        )
+        return queryset.iterator(chunk_size=chunk_size), post.comment_count
+
+    @staticmethod
+    def get_post_comments_by_cursor(
+        post_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+    ) -> Tuple[List[Comment], bool, Optional[str], int]:
+        # 커서 기반 댓글 목록 조회 (created_at, id 역순)
+        # 전체 개수는 COUNT 쿼리 대신 게시글의 comment_count 사용
+
+        # 게시글 존재 여부 확인
+        post = get_object_or_404(Post.objects.only("id", "comment_count"), id=post_id)
+
+        queryset = Comment.objects.select_related("user").filter(post_id=post_id)
+
+        decoded_cursor = CommentService.decode_cursor(cursor)
+        if decoded_cursor:
+            created_at, comment_id = decoded_cursor
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=comment_id)
+            )
+
+        comments = list(queryset.order_by("-created_at", "-id")[: limit + 1])
+
+        has_next = len(comments) > limit
+        if has_next:
+            comments = comments[:-1]
+            next_cursor = CommentService.encode_cursor(comments[-1])
+        else:
+            next_cursor = None
+
+        return comments, has_next, next_cursor, post.comment_count
+
+    @staticmethod
+    def encode_cursor(comment: Comment) -> str:
+        # "<작성일시(epoch 마이크로초)>_<댓글 id>"
+        # 마이크로초 정수로 변환해 정밀도 손실 없이 비교
+        delta = comment.created_at - CURSOR_EPOCH
+        microseconds = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+        return f"{microseconds}_{comment.id}"
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        if not cursor:
+            return None
+        try:
+            microseconds, comment_id = cursor.split("_")
+            created_at = CURSOR_EPOCH + timedelta(microseconds=int(microseconds))
+            return created_at, int(comment_id)
+        except (ValueError, OverflowError):
+            raise ValidationError(f"Invalid cursor: {cursor}")
+
     @staticmethod
     @transaction.atomic
     def create_comment(
@@ -40,13 +110,13 @@ class CommentService:
         data: Dict[str, Any],
     ) -> Comment:
 
-        # 게시글과 작성자 정보를 한 번에 조회
-        # 게시글 존재 여부 확인
-        get_object_or_404(
-            Post,
-            id=post_id,
-            is_deleted=False,
+        # 게시글의 댓글 수 증가 + 상세 캐시 버전 증가
+        # 변경된 행이 없으면 없는(삭제 / 숨김) 게시글 => 게시글을 따로 조회하지 않음
+        updated = Post.objects.filter(id=post_id).update(
+            comment_count=F("comment_count") + 1, version=F("version") + 1
         )
+        if not updated:
+            raise Http404("게시글을 찾을 수 없습니다.")
 
         # 댓글 생성
         comment = Comment.objects.create(
@@ -55,9 +125,6 @@ class CommentService:
             content=data["content"],
         )
 
-        # 게시글의 댓글 수 증가
-        Post.objects.filter(id=post_id).update(comment_count=F("comment_count") + 1)
-
         return comment
 
     @staticmethod
@@ -68,11 +135,7 @@ class CommentService:
         data: Dict[str, Any],
     ) -> Comment:
 
-        comment = get_object_or_404(
-            Comment.objects.select_related("post"),
-            id=comment_id,
-            is_deleted=False,
-        )
+        comment = get_object_or_404(Comment.objects.select_related("post"), id=comment_id)
 
         # 권한 체크
         if comment.user_id != user_id:
@@ -86,29 +149,32 @@ class CommentService:
         comment.content = data["content"]
         comment.save()
 
+        # 게시글 상세 캐시 버전 증가
+        Post.all_objects.filter(id=comment.post_id).update(version=F("version") + 1)
+
         return comment
 
     @staticmethod
     @transaction.atomic
     def delete_comment(comment_id: int, user_id: int) -> None:
-        comment = get_object_or_404(
-            Comment.objects.select_for_update(), id=comment_id, is_deleted=False
-        )
+        comment = get_object_or_404(Comment.objects.select_for_update(), id=comment_id)
         if comment.user_id != user_id:
             raise PermissionDenied("자신의 댓글만 삭제할 수 있습니다.")
 
-        # 게시글의 댓글 수 감소. 음수가 되지 않도록 처리
-        Post.objects.filter(id=comment.post_id).update(
+        # 게시글의 댓글 수 감소. 음수가 되지 않도록 처리 + 상세 캐시 버전 증가
+        # (삭제 / 숨김 게시글의 댓글도 반영)
+        Post.all_objects.filter(id=comment.post_id).update(
             comment_count=models.Case(
                 models.When(comment_count__gt=0, then=F("comment_count") - 1), default=0
-            )
+            ),
+            version=F("version") + 1,
         )
         comment.delete()
 
     @classmethod
     def _validate_post(cls, post_id: int) -> None:
         # 게시글 유효성 검증
-        get_object_or_404(Post, id=post_id, is_deleted=False)
+        get_object_or_404(Post, id=post_id)
 
     @classmethod
     def _validate_comment_owner(cls, comment: Comment, user_id: int) -> None:
@@ -0,0 +1,151 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from comments.services import CommentService
+from config.testing import create_user
+from posts.models import Post
+from users.models import User
+
+
+class CommentCursorPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("writer")
+        cls.post = Post.objects.create(
+            user=cls.user, title="title", content="content", category=Post.Category.RATTAN
+        )
+        for i in range(25):
+            CommentService.create_comment(
+                post_id=cls.post.id, user_id=cls.user.id, data={"content": f"comment {i}"}
+            )
+        # 작성일시가 같은 댓글도 id 로 구분되어야 함
+        Comment.objects.filter(post=cls.post, id__lte=Comment.objects.order_by("id")[9].id).update(
+            created_at=timezone.now()
+        )
+        CommentService.delete_comment(
+            comment_id=Comment.objects.order_by("id").first().id, user_id=cls.user.id
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_pages_cover_all_live_comments_once(self) -> None:
+        expected = list(
+            Comment.objects.filter(post=self.post, is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        seen = []
+        cursor = ""
+        while True:
+            response = self.client.get(
+                f"/api/comment/{self.post.id}/comments/", {"cursor": cursor, "limit": 7}
+            )
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["total_count"], 24)
+            seen.extend(comment["id"] for comment in body["data"])
+            if not body["has_next"]:
+                self.assertIsNone(body["next_cursor"])
+                break
+            cursor = body["next_cursor"]
+
+        self.assertEqual(seen, expected)
+
+    def test_page_mode_is_kept(self) -> None:
+        response = self.client.get(
+            f"/api/comment/{self.post.id}/comments/", {"page": 2, "limit": 10}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pagination"]["total_pages"], 3)
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get(f"/api/comment/{self.post.id}/comments/", {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentListConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("writer")
+        cls.post = Post.objects.create(
+            user=cls.user, title="title", content="content", category=Post.Category.RATTAN
+        )
+        CommentService.create_comment(
+            post_id=cls.post.id, user_id=cls.user.id, data={"content": "first"}
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/comment/{self.post.id}/comments/"
+
+    def test_unchanged_list_returns_304_from_one_query(self) -> None:
+        for params in [{}, {"cursor": ""}]:
+            etag = self.client.get(self.url, params)["ETag"]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], etag)
+            queries = [q for q in context.captured_queries if "SAVEPOINT" not in q["sql"]]
+            self.assertEqual(len(queries), 1)
+
+    def test_comment_write_changes_etag(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+        CommentService.create_comment(
+            post_id=self.post.id, user_id=self.user.id, data={"content": "second"}
+        )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 2)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class CommentExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("writer")
+        cls.staff = create_user("staff", User.Role.COMPANY, is_staff=True)
+        cls.post = Post.objects.create(
+            user=cls.user, title="title", content="content", category=Post.Category.RATTAN
+        )
+        for i in range(30):
+            CommentService.create_comment(
+                post_id=cls.post.id, user_id=cls.user.id, data={"content": f"comment {i}"}
+            )
+        CommentService.delete_comment(
+            comment_id=Comment.objects.order_by("id").first().id, user_id=cls.user.id
+        )
+        cls.url = f"/api/comment/{cls.post.id}/comments/export/"
+
+    def test_staff_streams_all_live_comments(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        response = client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body["total_count"], 29)
+        self.assertEqual(
+            [comment["id"] for comment in body["data"]],
+            list(
+                Comment.objects.filter(post=self.post, is_deleted=False)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_non_staff_is_forbidden(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get(self.url).status_code, 403)
@@ -1,6 +1,12 @@
 from django.urls import path
 
-from .views import CommentCreateView, CommentDeleteView, CommentListView, CommentUpdateView
+from .views import (
+    CommentCreateView,
+    CommentDeleteView,
+    CommentExportView,
+    CommentListView,
+    CommentUpdateView,
+)
 
 app_name = "comments"
 
@@ -10,6 +16,11 @@ urlpatterns = [
         CommentListView.as_view(),
         name="comment-list",
     ),
+    path(
+        "<int:post_id>/comments/export/",
+        CommentExportView.as_view(),
+        name="comment-export",
+    ),
     path(
         "<int:post_id>/comments/create/",
         CommentCreateView.as_view(),
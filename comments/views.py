@@ -4,16 +4,24 @@ from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import authentication, status
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from comments.fast_serializers import serialize_comment
 from comments.models import Comment
 from comments.permissions import IsAuthenticatedWithUnauthorized
-from comments.serializers import CommentCreateSerializer, CommentSerializer, CommentUpdateSerializer
+from comments.serializers import (
+    CommentCreateSerializer,
+    CommentResponseSerializer,
+    CommentSerializer,
+    CommentUpdateSerializer,
+)
 from comments.services import CommentService
+from config.renderers import StreamingJSONResponse
+from posts.conditional import build_etag, is_not_modified, not_modified, with_etag
 from posts.models import Post
 
 
@@ -48,10 +56,30 @@ class CommentListView(APIView):
         parameters=[
             OpenApiParameter(name="page", type=int, description="Page number"),
             OpenApiParameter(name="limit", type=int, description="Items per page"),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                description="Cursor pagination (pass an empty value for the first page, "
+                "then next_cursor from the previous response)",
+            ),
         ],
         responses={200: CommentSerializer(many=True)},
     )
     def get(self, request: Request, post_id: int) -> Response:
+        # 게시글 캐시 버전만 조회해 변경이 없으면 304
+        version = CommentService.get_comment_list_version(post_id)
+        etag = build_etag("comments", post_id, version, request.query_params.urlencode())
+        if is_not_modified(request, etag):
+            return not_modified(request, etag)
+
+        # cursor 파라미터가 있으면 커서 기반, 없으면 기존 페이지 번호 기반 조회
+        if "cursor" in request.query_params:
+            response = self.get_by_cursor(request, post_id)
+        else:
+            response = self.get_by_page(request, post_id)
+        return with_etag(request, response, etag)
+
+    def get_by_page(self, request: Request, post_id: int) -> Response:
         # 게시글 목록 조회
         page, limit = self.validate_pagination_params(
             request.query_params.get("page"),
@@ -82,6 +110,26 @@ class CommentListView(APIView):
             }
         )
 
+    def get_by_cursor(self, request: Request, post_id: int) -> Response:
+        _, limit = self.validate_pagination_params(None, request.query_params.get("limit"))
+
+        comments, has_next, next_cursor, total_count = CommentService.get_post_comments_by_cursor(
+            post_id=post_id,
+            cursor=request.query_params.get("cursor"),
+            limit=limit,
+        )
+
+        serializer = CommentSerializer(comments, many=True, context={"request": request})
+
+        return Response(
+            {
+                "data": serializer.data,
+                "has_next": has_next,
+                "next_cursor": next_cursor,
+                "total_count": total_count,
+            }
+        )
+
 
 class CommentCreateView(APIView):
     serializer_class = CommentCreateSerializer
@@ -92,7 +140,7 @@ class CommentCreateView(APIView):
     # 댓글 작성
     def post(self, request: Request, post_id: int) -> Response:
         # post 존재 여부 확인
-        post = get_object_or_404(Post, id=post_id, is_deleted=False)
+        post = get_object_or_404(Post, id=post_id)
 
         serializer = CommentCreateSerializer(
             data=request.data, context={"request": request, "post": post}
@@ -118,7 +166,7 @@ class CommentUpdateView(APIView):
     @extend_schema(request=CommentUpdateSerializer, responses={200: CommentSerializer})
     # 댓글 수정
     def patch(self, request: Request, comment_id: int) -> Response:
-        comment = get_object_or_404(Comment, id=comment_id, is_deleted=False)
+        comment = get_object_or_404(Comment.objects.select_related("post"), id=comment_id)
 
         serializer = CommentUpdateSerializer(
             comment, data=request.data, context={"request": request}  # instance 추가
@@ -148,3 +196,19 @@ class CommentDeleteView(APIView):
         )
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# 게시글 댓글 전체 내보내기 (관리자 전용)
+class CommentExportView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses={200: CommentResponseSerializer(many=True)})
+    def get(self, request: Request, post_id: int) -> StreamingJSONResponse:
+        # 댓글 수가 많아도 전체 응답을 메모리에 만들지 않도록 원소 단위로 스트리밍
+        comments, total_count = CommentService.iter_post_comments(post_id=post_id)
+        return StreamingJSONResponse(
+            (serialize_comment(comment) for comment in comments),
+            request=request,
+            extra={"total_count": total_count},
+        )
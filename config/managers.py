@@ -0,0 +1,13 @@
+from django.db import models
+
+# 소프트 딜리트 모델용 매니저
+# - objects: 삭제 / 숨김되지 않은 행(모델의 LIVE_CONDITION)만 조회
+#   서비스 코드에서 is_deleted=False 조건 생략, 역참조(post.comments 등)도 같은 조건 적용
+# - all_objects: 삭제 / 숨김 행 포함 (관리자, id 로 지정한 캐시 버전 증가 등 쓰기, 보관 작업)
+# - LIVE_CONDITION 은 모델의 부분 인덱스 조건과 같은 Q 를 사용해야 해당 인덱스를 사용할 수 있음
+# - 저장(save) / 정방향 FK 접근(comment.post)은 Django 기본 매니저(_base_manager)를 쓰므로 영향 없음
+
+
+class SoftDeleteManager(models.Manager):
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(self.model.LIVE_CONDITION)
@@ -0,0 +1,66 @@
+import mimetypes
+import os
+from functools import lru_cache
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils._os import safe_join
+from django.utils.module_loading import import_string
+from django.views.static import serve
+
+from posts.storage import is_hashed_name
+
+# 미디어 파일 응답 (MEDIA_URL 하위 요청)
+# - MEDIA_SERVE_MODE="accel": 접근 확인 후 X-Accel-Redirect 헤더만 응답하고 파일 전송은 nginx 가 처리
+#   => 큰 파일 전송 동안 gunicorn 워커가 묶이지 않음 (Django 는 파일을 열거나 stat 하지 않음)
+#   nginx 예시:
+#     location /media/ { proxy_pass http://app; }
+#     location /protected-media/ { internal; alias /app/media/; }
+# - MEDIA_SERVE_MODE="django": Django 가 파일을 직접 전송 (개발 환경)
+# - 내용 해시 경로 파일은 내용이 바뀌지 않으므로 Cache-Control: immutable + 긴 max-age
+# - MEDIA_PRIVATE_DIRS (이어 올리기 중인 파일 등), 숨김 파일, MEDIA_ROOT 밖 경로는 404
+# - MEDIA_ACCESS_CHECK 함수가 False 를 반환하면 존재 여부를 노출하지 않도록 404
+
+
+@lru_cache(maxsize=None)
+def load_access_check(path: str) -> Optional[Callable[[HttpRequest, str], bool]]:
+    return import_string(path) if path else None
+
+
+def get_cache_control(name: str) -> str:
+    if is_hashed_name(name):
+        return f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_MAX_AGE}"
+
+
+def serve_media(request: HttpRequest, path: str) -> HttpResponse:
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    name = os.path.relpath(full_path, os.path.abspath(settings.MEDIA_ROOT)).replace(os.sep, "/")
+    parts = name.split("/")
+    if (
+        name == "."
+        or parts[0] in settings.MEDIA_PRIVATE_DIRS
+        or any(part.startswith(".") for part in parts)
+    ):
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    access_check = load_access_check(settings.MEDIA_ACCESS_CHECK)
+    if access_check is not None and not access_check(request, name):
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    if settings.MEDIA_SERVE_MODE == "accel":
+        content_type, _ = mimetypes.guess_type(name)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+    else:
+        response = serve(request, name, document_root=settings.MEDIA_ROOT)
+
+    response["Cache-Control"] = get_cache_control(name)
+    return response
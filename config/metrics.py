@@ -0,0 +1,404 @@
+import atexit
+import fcntl
+import hmac
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# 요청 지표 (Prometheus 텍스트 형식, GET /metrics)
+# - MetricsMiddleware: 요청마다 뷰(클래스 / 함수 이름), 메서드별로
+#   처리 시간, DB 쿼리 수, DB 쿼리 시간, 응답 크기 히스토그램과 상태 코드별 요청 수를 누적
+#   요청 경로에서는 프로세스 메모리의 버킷 카운터만 증가 (파일 / 네트워크 I/O 없음)
+# - gunicorn 워커 간 합산: 워커마다 METRICS_FLUSH_INTERVAL 초마다 백그라운드 스레드가
+#   METRICS_DIR/metrics_<pid>.json 에 자기 누적값을 통째로 기록 (임시 파일 + rename)
+#   /metrics 요청을 받은 워커가 모든 파일을 합산
+#   => 응답에는 다른 워커의 최근 주기까지의 값이 포함됨
+# - 종료된 워커의 파일은 합산 시 metrics_dead.json 에 더한 뒤 삭제 (카운터가 줄어들지 않음)
+#   (합산 / 정리는 파일 잠금으로 직렬화)
+# - METRICS_TOKEN 을 설정하면 Authorization: Bearer <토큰> 요청만 허용
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (이름, 설명, 버킷), 순서는 MetricsRegistry.observe 의 값 순서와 같음
+HISTOGRAMS = (
+    ("http_request_duration_seconds", "요청 처리 시간(초)", DURATION_BUCKETS),
+    ("http_request_db_queries", "요청당 DB 쿼리 수", QUERY_BUCKETS),
+    ("http_request_db_duration_seconds", "요청당 DB 쿼리 시간(초)", DB_DURATION_BUCKETS),
+    (
+        "http_response_size_bytes",
+        "응답 본문 크기(바이트, 크기를 알 수 없는 스트리밍 응답 제외)",
+        SIZE_BUCKETS,
+    ),
+)
+REQUESTS_TOTAL = ("http_requests_total", "상태 코드별 요청 수")
+
+UNMATCHED_VIEW = "<unmatched>"
+FILE_PATTERN = re.compile(r"^metrics_(\d+)\.json$")
+DEAD_FILE = "metrics_dead.json"
+LOCK_FILE = ".lock"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 히스토그램 한 개: [버킷별 개수..., +Inf 개수, 합계]
+Series = List[float]
+
+
+def new_series() -> List[Series]:
+    return [[0.0] * (len(buckets) + 2) for _, _, buckets in HISTOGRAMS]
+
+
+class MetricsSnapshot:
+    # 프로세스 / 파일 단위 누적값 (합산 가능)
+    # - histograms: (뷰, 메서드) => HISTOGRAMS 순서의 Series 목록
+    # - requests: (뷰, 메서드, 상태 코드) => 요청 수
+
+    def __init__(self) -> None:
+        self.histograms: Dict[Tuple[str, str], List[Series]] = {}
+        self.requests: Counter[Tuple[str, str, int]] = Counter()
+
+    def merge(self, other: "MetricsSnapshot") -> None:
+        for key, series in other.histograms.items():
+            target = self.histograms.get(key)
+            if target is None:
+                self.histograms[key] = [list(values) for values in series]
+                continue
+            for target_values, values in zip(target, series):
+                for index, value in enumerate(values):
+                    target_values[index] += value
+        self.requests.update(other.requests)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "histograms": [[*key, series] for key, series in self.histograms.items()],
+            "requests": [[*key, count] for key, count in self.requests.items()],
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "MetricsSnapshot":
+        snapshot = cls()
+        for view, method, series in data.get("histograms", []):
+            # 버킷 구성이 바뀐 이전 파일은 무시
+            if [len(values) for values in series] == [len(b) + 2 for _, _, b in HISTOGRAMS]:
+                snapshot.histograms[(view, method)] = series
+        for view, method, status, count in data.get("requests", []):
+            snapshot.requests[(view, method, int(status))] += count
+        return snapshot
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for position, (name, description, buckets) in enumerate(HISTOGRAMS):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for (view, method), series in sorted(self.histograms.items()):
+                values = series[position]
+                labels = f'view="{escape_label(view)}",method="{escape_label(method)}"'
+                cumulative = 0.0
+                for bound, count in zip((*buckets, "+Inf"), values):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else format_value(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {format_value(cumulative)}')
+                lines.append(f"{name}_sum{{{labels}}} {format_value(values[-1])}")
+                lines.append(f"{name}_count{{{labels}}} {format_value(cumulative)}")
+
+        name, description = REQUESTS_TOTAL
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for (view, method, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'{name}{{view="{escape_label(view)}",method="{escape_label(method)}",'
+                f'status="{status}"}} {format_value(count)}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    # 프로세스 단위 지표 누적 + 워커별 파일 기록 / 합산
+
+    def __init__(self) -> None:
+        self._snapshot = MetricsSnapshot()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # 이 프로세스가 자기 파일을 처음 기록한 디렉터리 (같은 pid 의 이전 프로세스 파일 정리용)
+        self._claimed: Optional[Tuple[int, str]] = None
+        # 요청마다 pid 를 확인하지 않도록 fork 시점에 프로세스별 상태 초기화
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # fork 된 워커는 부모의 누적값 / 잠금 / 기록 스레드를 이어받지 않음
+        self._snapshot = MetricsSnapshot()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._claimed = None
+
+    @property
+    def directory(self) -> str:
+        return settings.METRICS_DIR
+
+    @property
+    def flush_interval(self) -> float:
+        return float(settings.METRICS_FLUSH_INTERVAL)
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        duration: float,
+        queries: int,
+        db_duration: float,
+        size: Optional[int],
+    ) -> None:
+        # 요청마다 실행되므로 반복문 없이 히스토그램별로 직접 증가
+        with self._lock:
+            histograms = self._snapshot.histograms.get((view, method))
+            if histograms is None:
+                histograms = self._snapshot.histograms[(view, method)] = new_series()
+            durations, query_counts, db_durations, sizes = histograms
+            durations[bisect_left(DURATION_BUCKETS, duration)] += 1
+            durations[-1] += duration
+            query_counts[bisect_left(QUERY_BUCKETS, queries)] += 1
+            query_counts[-1] += queries
+            db_durations[bisect_left(DB_DURATION_BUCKETS, db_duration)] += 1
+            db_durations[-1] += db_duration
+            if size is not None:
+                sizes[bisect_left(SIZE_BUCKETS, size)] += 1
+                sizes[-1] += size
+            self._snapshot.requests[(view, method, status)] += 1
+
+        if self._thread is None:
+            self._ensure_flusher()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snapshot = MetricsSnapshot()
+
+    def flush(self) -> None:
+        # 자기 누적값 전체를 metrics_<pid>.json 에 기록
+        with self._lock:
+            data = json.dumps(self._snapshot.to_json())
+
+        pid = os.getpid()
+        directory = self.directory
+        os.makedirs(directory, exist_ok=True)
+        if self._claimed != (pid, directory):
+            # 같은 pid 를 쓰던 종료된 프로세스의 파일이 남아 있으면 먼저 종료 파일에 합산
+            with self._file_lock():
+                self._retire(pid)
+            self._claimed = (pid, directory)
+
+        path = os.path.join(directory, f"metrics_{pid}.json")
+        self._write(path, data)
+
+    def collect(self) -> MetricsSnapshot:
+        # 모든 워커 파일 + 종료된 워커 누적값 합산
+        self.flush()
+        total = MetricsSnapshot()
+        with self._file_lock():
+            for name in os.listdir(self.directory):
+                match = FILE_PATTERN.match(name)
+                if match and not self._is_alive(int(match.group(1))):
+                    self._retire(int(match.group(1)))
+
+            for name in os.listdir(self.directory):
+                if FILE_PATTERN.match(name) or name == DEAD_FILE:
+                    snapshot = self._read(os.path.join(self.directory, name))
+                    if snapshot is not None:
+                        total.merge(snapshot)
+        return total
+
+    def _retire(self, pid: int) -> None:
+        # 파일 잠금 안에서 호출: pid 파일을 종료 파일에 더하고 삭제
+        path = os.path.join(self.directory, f"metrics_{pid}.json")
+        snapshot = self._read(path)
+        if snapshot is None:
+            return
+        dead_path = os.path.join(self.directory, DEAD_FILE)
+        dead = self._read(dead_path) or MetricsSnapshot()
+        dead.merge(snapshot)
+        self._write(dead_path, json.dumps(dead.to_json()))
+        os.remove(path)
+
+    def _file_lock(self) -> "FileLock":
+        os.makedirs(self.directory, exist_ok=True)
+        return FileLock(os.path.join(self.directory, LOCK_FILE))
+
+    @staticmethod
+    def _read(path: str) -> Optional[MetricsSnapshot]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return MetricsSnapshot.from_json(json.load(f))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("지표 파일을 읽을 수 없음: %s", path)
+            return None
+
+    @staticmethod
+    def _write(path: str, data: str) -> None:
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _ensure_flusher(self) -> None:
+        # 프로세스별로 첫 요청에서 한 번만 스레드 시작
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("지표 파일 기록 실패")
+
+    def flush_on_exit(self) -> None:
+        # 요청을 받은 적이 있는 프로세스만 마지막 누적값 기록
+        if self._thread is not None:
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("지표 파일 기록 실패")
+
+
+class FileLock:
+    # METRICS_DIR 를 공유하는 프로세스 간 배타 잠금 (flock)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+metrics_registry = MetricsRegistry()
+atexit.register(metrics_registry.flush_on_exit)
+
+
+class QueryTimer:
+    # 스레드의 기본 DB 커넥션에서 실행된 쿼리 수 / 시간 누적 (execute_wrappers 에 한 번만 등록)
+    # - 요청마다 등록 / 해제하면 커넥션 조회(asgiref Local) 비용이 요청마다 들기 때문에
+    #   스레드별로 처음 한 번 등록하고, 미들웨어는 요청 전후 누적값의 차이를 사용
+    # - execute_wrapper() 는 목록 끝에서 꺼내므로 맨 앞에 등록해 다른 wrapper 순서에 영향 없음
+    __slots__ = ("count", "duration")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+_local = threading.local()
+
+
+def get_query_timer() -> QueryTimer:
+    timer = getattr(_local, "timer", None)
+    if timer is None:
+        timer = _local.timer = QueryTimer()
+        connections[DEFAULT_DB_ALIAS].execute_wrappers.insert(0, timer)
+    return timer
+
+
+def get_view_name(request: HttpRequest) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_VIEW
+    view_class = getattr(match.func, "view_class", None)
+    return view_class.__name__ if view_class is not None else match.func.__name__
+
+
+def get_response_size(response: HttpResponse) -> Optional[int]:
+    if not response.streaming:
+        return len(response.content)
+    length = response.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+class MetricsMiddleware:
+    # MIDDLEWARE 맨 앞에 두어 다른 미들웨어 처리 시간까지 포함
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timer = get_query_timer()
+        queries, db_duration = timer.count, timer.duration
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        metrics_registry.observe(
+            get_view_name(request),
+            request.method,
+            response.status_code,
+            duration,
+            timer.count - queries,
+            timer.duration - db_duration,
+            get_response_size(response),
+        )
+        return response
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=403)
+
+    return HttpResponse(metrics_registry.collect().render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,285 @@
+import cProfile
+import datetime
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+import uuid
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.metrics import get_view_name
+
+logger = logging.getLogger(__name__)
+
+# 요청 단위 프로파일링 (운영 환경에서 느린 요청 한 건의 원인 확인용)
+# - 관리자가 POST /api/profiling/token/ 으로 서명된 토큰을 받아
+#   X-Profile 헤더로 보내면 그 요청만 프로파일링
+#   - 토큰은 1회용 (PROFILING_TOKEN_MAX_AGE 초 안에 한 번만 사용 가능, 사용 시 캐시의 nonce 삭제)
+#     => 토큰이 유출되어도 프로파일링을 반복해서 일으킬 수 없음
+#     워커 간에 토큰을 공유하려면 CACHE_URL 로 공유 캐시 지정 필요
+#   - 쿼리 문자열은 접근 로그 / Referer 에 남으므로 토큰은 헤더로만 받음
+# - cProfile(결정적) 결과는 pstats 파일(.prof), 요청 스레드 스택을 PROFILING_SAMPLE_INTERVAL 초마다
+#   샘플링한 결과는 speedscope 파일(.speedscope.json, https://www.speedscope.app 에서 플레임그래프)
+#   요청 정보(경로, 뷰, 상태 코드, 처리 시간, 쿼리 수 / SQL 별 시간)는 .json 으로 PROFILING_DIR 에 저장
+#   응답의 X-Profile-Id 헤더가 파일 이름
+# - PROFILING_MAX_PROFILES 개를 넘으면 오래된 결과부터 삭제
+# - 토큰이 없는 요청은 헤더 확인만 하고 그대로 처리
+#   PROFILING_ENABLED=False 면 미들웨어를 사용하지 않음
+
+HEADER = "HTTP_X_PROFILE"
+TOKEN_SALT = "config.profiling"
+NONCE_CACHE_KEY = "profiling:nonce:{}"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+# 응답 정보에 포함할 SQL 최대 개수 (느린 순)
+MAX_SQL = 200
+# 매우 긴 요청에서 샘플이 무한히 쌓이지 않도록 제한
+MAX_SAMPLES = 100_000
+
+# 프로파일러는 프로세스에 하나만 실행할 수 있으므로 동시에 한 요청만 프로파일링
+_profile_lock = threading.Lock()
+
+
+def create_token(user_id: int) -> str:
+    nonce = secrets.token_urlsafe(16)
+    cache.set(NONCE_CACHE_KEY.format(nonce), user_id, settings.PROFILING_TOKEN_MAX_AGE)
+    return signing.dumps({"user_id": user_id, "nonce": nonce}, salt=TOKEN_SALT, compress=True)
+
+
+def use_token(token: str) -> Optional[Dict[str, Any]]:
+    # 서명 / 만료 확인 후 nonce 를 삭제 (삭제에 성공한 요청만 사용 가능)
+    try:
+        claims = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not cache.delete(NONCE_CACHE_KEY.format(claims.get("nonce"))):
+        return None
+    return claims
+
+
+class QueryRecorder:
+    # 프로파일링 요청의 SQL 별 실행 시간
+    def __init__(self) -> None:
+        self.queries: List[Tuple[str, float]] = []
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+
+class StackSampler:
+    # 요청 스레드의 호출 스택을 주기적으로 수집 (speedscope sampled 형식)
+    # - root 는 미들웨어 호출 프레임 (그 바깥의 WSGI 서버 프레임은 제외)
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.root = sys._getframe(1)
+        self.frames: List[Dict[str, Any]] = []
+        self.frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        last = self.started
+        while not self._stop.wait(self.interval) and len(self.samples) < MAX_SAMPLES:
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                stack = self._stack(frame)
+                if stack:
+                    self.samples.append(stack)
+                    self.weights.append(now - last)
+            last = now
+
+    def _stack(self, frame: Optional[FrameType]) -> List[int]:
+        stack = []
+        while frame is not None and frame is not self.root:
+            code = frame.f_code
+            key = (code.co_filename, code.co_name, code.co_firstlineno)
+            index = self.frame_index.get(key)
+            if index is None:
+                index = self.frame_index[key] = len(self.frames)
+                self.frames.append({"name": key[1], "file": key[0], "line": key[2]})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "config.profiling",
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": self.samples,
+                    "weights": self.weights,
+                }
+            ],
+        }
+
+
+class ProfilingMiddleware:
+    # MetricsMiddleware 다음에 두어 나머지 미들웨어 / 뷰 전체를 프로파일링
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = request.META.get(HEADER)
+        if not token:
+            return self.get_response(request)
+
+        claims = use_token(token)
+        if claims is None or not _profile_lock.acquire(blocking=False):
+            # 잘못된 / 만료된 / 사용한 토큰, 다른 요청을 프로파일링 중이면 그대로 처리
+            return self.get_response(request)
+        try:
+            return self.profile(request, claims)
+        finally:
+            _profile_lock.release()
+
+    def profile(self, request: HttpRequest, claims: Dict[str, Any]) -> HttpResponse:
+        recorder = QueryRecorder()
+        profiler = cProfile.Profile()
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(recorder):
+            with StackSampler(settings.PROFILING_SAMPLE_INTERVAL) as sampler:
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+
+        view = get_view_name(request)
+        created_at = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        profile_id = f"{created_at}-{view}-{uuid.uuid4().hex[:8]}"
+        try:
+            self.save(profile_id, request, response, claims, view, profiler, sampler, recorder)
+        except OSError:
+            logger.exception("프로파일 저장 실패: %s", profile_id)
+            return response
+
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    @staticmethod
+    def save(
+        profile_id: str,
+        request: HttpRequest,
+        response: HttpResponse,
+        claims: Dict[str, Any],
+        view: str,
+        profiler: cProfile.Profile,
+        sampler: StackSampler,
+        recorder: QueryRecorder,
+    ) -> None:
+        directory = settings.PROFILING_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, profile_id)
+
+        name = f"{request.method} {request.path} ({view})"
+        profiler.dump_stats(f"{path}.prof")
+        with open(f"{path}.speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(sampler.to_speedscope(name), f)
+
+        slowest = sorted(recorder.queries, key=lambda query: query[1], reverse=True)[:MAX_SQL]
+        info = {
+            "id": profile_id,
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "duration": sampler.duration,
+            "requested_by": claims.get("user_id"),
+            "query_count": len(recorder.queries),
+            "db_duration": sum(duration for _, duration in recorder.queries),
+            "queries": [{"sql": sql, "duration": duration} for sql, duration in slowest],
+            "created_at": time.time(),
+        }
+        with open(f"{path}.json", "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+
+        prune_profiles(directory, settings.PROFILING_MAX_PROFILES)
+
+
+def prune_profiles(directory: str, keep: int) -> None:
+    # 파일 이름이 생성 시각 순이므로 이름 순으로 오래된 결과부터 삭제
+    profile_ids = sorted(name[: -len(".json")] for name in os.listdir(directory) if is_info(name))
+    for profile_id in profile_ids[: max(len(profile_ids) - keep, 0)]:
+        for suffix in (".json", ".prof", ".speedscope.json"):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def is_info(name: str) -> bool:
+    return name.endswith(".json") and not name.endswith(".speedscope.json")
+
+
+# 프로파일링 토큰 발급 (관리자 전용)
+class ProfilingTokenView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request=None,
+        responses={
+            201: inline_serializer(
+                name="ProfilingToken",
+                fields={
+                    "token": serializers.CharField(),
+                    "expires_in": serializers.IntegerField(),
+                    "header": serializers.CharField(),
+                },
+            )
+        },
+    )
+    def post(self, request: Request) -> Response:
+        return Response(
+            {
+                "token": create_token(request.user.id),
+                "expires_in": settings.PROFILING_TOKEN_MAX_AGE,
+                "header": "X-Profile",
+            },
+            status=201,
+        )
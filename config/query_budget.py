@@ -0,0 +1,164 @@
+import contextlib
+import os
+import sys
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+
+# 엔드포인트별 쿼리 수 검사 (테스트용)
+# - QueryInspector: 요청 중 실행된 쿼리를 호출 위치(프로젝트 코드의 가장 안쪽 프레임)와 함께 기록
+#   - 지연 로딩: 관계 descriptor(obj.user, obj.images.all() 등)가 prefetch 없이 쿼리를 실행한 경우
+#   - 직렬화 중 반복 쿼리: 시리얼라이저 실행 중 같은 SQL 이 두 번 이상 실행된 경우 (객체마다 조회)
+# - QueryBudgetMixin.assertQueryBudget: 쿼리 수 상한 + 위 N+1 패턴이 없는지 확인
+#   실패 메시지에 쿼리별 호출 위치를 포함
+# - iter_routes: URLconf 의 모든 경로 (테스트에서 예산이 지정되지 않은 경로 확인용)
+
+PROJECT_ROOT = os.path.join(str(settings.BASE_DIR), "")
+SITE_PACKAGES = (os.sep + "site-packages" + os.sep, os.sep + "dist-packages" + os.sep)
+RELATED_DESCRIPTORS = os.path.join("db", "models", "fields", "related_descriptors.py")
+FAST_SERIALIZERS = "fast_serializers.py"
+# 커서 실행 모듈 (이 프레임 안쪽은 다른 execute wrapper 이므로 호출 위치에서 제외)
+CURSOR_UTILS = os.path.join("db", "backends", "utils.py")
+# 트랜잭션 제어 문장은 집계하지 않음 (테스트에서는 ATOMIC_REQUESTS 가 savepoint 로 실행됨)
+TRANSACTION_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryRecord(NamedTuple):
+    sql: str
+    duration: float
+    frame: str  # "<파일>:<줄> in <함수>" (프로젝트 코드 기준)
+    lazy: bool  # 관계 지연 로딩
+    serializing: bool  # 시리얼라이저 실행 중
+
+
+class QueryInspector:
+    # connection.execute_wrapper 로 쿼리마다 호출 스택을 확인
+    # (프레임 객체만 따라가므로 traceback 문자열을 만들지 않음)
+
+    def __init__(self, using: str = "default") -> None:
+        self.connection = connections[using]
+        self.queries: List[QueryRecord] = []
+        self._wrapper: Optional[contextlib.AbstractContextManager] = None
+
+    def __enter__(self) -> "QueryInspector":
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._wrapper.__exit__(*exc_info)
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+        if sql.startswith(TRANSACTION_STATEMENTS):
+            return execute(sql, params, many, context)
+        frame, lazy, serializing = self.inspect_stack(sys._getframe(1))
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                QueryRecord(sql, time.perf_counter() - start, frame, lazy, serializing)
+            )
+
+    @staticmethod
+    def inspect_stack(frame: Optional[FrameType]) -> Tuple[str, bool, bool]:
+        location = ""
+        descriptor = prefetch = serializing = in_cursor = False
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.endswith(CURSOR_UTILS):
+                in_cursor = True
+            elif filename.endswith(RELATED_DESCRIPTORS):
+                descriptor = True
+            elif code.co_name == "prefetch_related_objects":
+                prefetch = True
+            elif code.co_name == "to_representation" or filename.endswith(FAST_SERIALIZERS):
+                serializing = True
+
+            if (
+                not location
+                and in_cursor
+                and filename.startswith(PROJECT_ROOT)
+                and not any(part in filename for part in SITE_PACKAGES)
+            ):
+                location = (
+                    f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}"
+                )
+            frame = frame.f_back
+        return location or "<unknown>", descriptor and not prefetch, serializing
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def n_plus_one(self) -> List[QueryRecord]:
+        # 관계 지연 로딩 + 직렬화 중 같은 SQL 이 반복된 쿼리
+        repeated = Counter(query.sql for query in self.queries if query.serializing)
+        return [
+            query
+            for query in self.queries
+            if query.lazy or (query.serializing and repeated[query.sql] > 1)
+        ]
+
+    def report(self) -> str:
+        suspects = set(map(id, self.n_plus_one()))
+        lines = []
+        for index, query in enumerate(self.queries, 1):
+            mark = " [N+1]" if id(query) in suspects else ""
+            lines.append(f"{index:3}. {query.frame}{mark}\n     {query.sql[:200]}")
+        return "\n".join(lines)
+
+
+class QueryBudgetMixin:
+    # TestCase 용 쿼리 예산 검사
+
+    @contextlib.contextmanager
+    def assertQueryBudget(self, budget: int, using: str = "default") -> Iterator[QueryInspector]:
+        with QueryInspector(using) as inspector:
+            yield inspector
+
+        suspects = inspector.n_plus_one()
+        if suspects:
+            frames = sorted({query.frame for query in suspects})
+            self.fail(
+                f"N+1 쿼리 {len(suspects)}개 (호출 위치: {', '.join(frames)})\n"
+                f"{inspector.report()}"
+            )
+        if inspector.count > budget:
+            self.fail(f"쿼리 {inspector.count}개 실행 (예산 {budget}개)\n{inspector.report()}")
+
+    def assertConstantQueries(
+        self, request: Callable[[int], Any], sizes: Sequence[int], budget: int
+    ) -> Dict[int, int]:
+        # 페이지 크기(sizes)를 바꿔 호출해도 쿼리 수가 같아야 함
+        counts = {}
+        for size in sizes:
+            with self.assertQueryBudget(budget) as inspector:
+                request(size)
+            counts[size] = inspector.count
+        if len(set(counts.values())) > 1:
+            self.fail(f"페이지 크기에 따라 쿼리 수가 달라짐: {counts}")
+        return counts
+
+
+def iter_routes(
+    resolver: Optional[URLResolver] = None, prefix: str = "", exclude: Sequence[str] = ()
+) -> Iterator[Tuple[str, Optional[str]]]:
+    # URLconf 의 모든 경로 (경로 문자열, 이름), exclude 로 시작하는 include 는 제외
+    for pattern in (resolver or get_resolver()).url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            if not any(route.startswith(excluded) for excluded in exclude):
+                yield from iter_routes(pattern, route, exclude)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.name
@@ -0,0 +1,122 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import orjson
+from django.db.models.fields.files import FieldFile
+from django.http import StreamingHttpResponse
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+# JSON 응답 렌더링
+# - orjson 으로 인코딩
+# - 출력은 DRF JSONRenderer 와 같음 (압축 구분자, 유니코드 그대로, \u2028 / \u2029 이스케이프)
+#   datetime 은 DRF 형식(UTC 는 "Z")을 따르도록 orjson 기본 변환을 사용하지 않음
+#   단, orjson 은 NaN / Infinity 를 오류 대신 null 로 인코딩
+# - DRF 기본 변환(datetime, Decimal, UUID, 지연 문자열 등)에 더해
+#   ImageField / FileField 값은 파일 URL(요청이 있으면 절대 URL)로 변환
+# - 들여쓰기 요청(브라우저블 API, ?indent)은 표준 json 으로 처리
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+# 스트리밍 응답의 전송 단위 (바이트)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_drf_encoder = JSONEncoder()
+
+
+def encode_default(obj: Any, request: Optional[Request] = None) -> Any:
+    if isinstance(obj, FieldFile):
+        if not obj:
+            return None
+        url = obj.url
+        return request.build_absolute_uri(url) if request is not None else url
+    return _drf_encoder.default(obj)
+
+
+def dumps(data: Any, request: Optional[Request] = None) -> bytes:
+    # 압축 형식 JSON 인코딩 (스트리밍 응답의 원소 단위 인코딩에도 사용)
+    ret = orjson.dumps(
+        data, default=lambda obj: encode_default(obj, request), option=ORJSON_OPTIONS
+    )
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        request = renderer_context.get("request")
+
+        # 들여쓰기 요청 / 설정(UNICODE_JSON, COMPACT_JSON)이 기본값과 다르면 표준 json 사용
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            if indent is None:
+                separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+            else:
+                separators = INDENT_SEPARATORS
+            ret = json.dumps(
+                data,
+                default=lambda obj: encode_default(obj, request),
+                indent=indent,
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                separators=separators,
+            )
+            return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+        return dumps(data, request)
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    # 큰 목록 응답을 배열 원소 단위로 인코딩하며 전송
+    # - 전체 응답 문자열을 메모리에 만들지 않고 STREAM_CHUNK_SIZE 단위로 전송
+    # - 형식: {"<key>": [원소, ...], <extra 필드>...}
+    # - items 는 queryset.iterator() 등 지연 반복자를 사용해야 메모리가 일정하게 유지됨
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        request: Optional[Request] = None,
+        key: str = "data",
+        extra: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(self.stream(items, request, key, extra), **kwargs)
+
+    @staticmethod
+    def stream(
+        items: Iterable[Any],
+        request: Optional[Request],
+        key: str,
+        extra: Optional[Dict[str, Any]],
+    ) -> Iterator[bytes]:
+        buffer = bytearray(b"{" + dumps(key) + b":[")
+        first = True
+        for item in items:
+            if not first:
+                buffer += b","
+            buffer += dumps(item, request)
+            first = False
+
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+
+        buffer += b"]"
+        if extra:
+            # {"a":1} => ,"a":1}
+            buffer += b"," + dumps(extra, request)[1:]
+        else:
+            buffer += b"}"
+        yield bytes(buffer)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import environ
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # THIRD PARTY
     "rest_framework",
     "rest_framework_simplejwt",
@@ -72,6 +74,10 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "users.User"
 
 MIDDLEWARE = [
+    # 요청 지표 (다른 미들웨어 처리 시간까지 포함하도록 맨 앞)
+    "config.metrics.MetricsMiddleware",
+    # 요청 단위 프로파일링 (서명된 토큰이 있는 요청만, 지표 미들웨어 다음)
+    "config.profiling.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -114,6 +120,11 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON 응답은 orjson 기반 렌더러 사용 (출력 형식은 DRF 기본 렌더러와 동일)
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 # JWT 설정
@@ -185,6 +196,88 @@ USE_TZ = True
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# 파일 저장소 (게시글 이미지는 내용 해시 경로로 저장)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "post_images": {"BACKEND": "posts.storage.ContentHashStorage"},
+}
+
+# 미디어 파일 응답 방식 (config.media.serve_media)
+# - django: Django 가 파일을 직접 전송 (개발용)
+# - accel: X-Accel-Redirect 헤더만 응답하고 전송은 nginx 가 처리
+#   nginx 설정: location MEDIA_ACCEL_PREFIX { internal; alias <MEDIA_ROOT>/; }
+# - ACCESS_CHECK: 파일별 접근 확인 함수 경로 (예: posts.media.can_access_post_media), 빈 값이면 확인 안 함
+# - 내용 해시 경로 파일은 IMMUTABLE_MAX_AGE, 그 외 파일은 MAX_AGE 동안 캐시
+MEDIA_SERVE_MODE = env("MEDIA_SERVE_MODE", default="django")
+MEDIA_ACCEL_PREFIX = env("MEDIA_ACCEL_PREFIX", default="/protected-media/")
+MEDIA_ACCESS_CHECK = env("MEDIA_ACCESS_CHECK", default="")
+MEDIA_IMMUTABLE_MAX_AGE = env.int("MEDIA_IMMUTABLE_MAX_AGE", default=365 * 24 * 60 * 60)
+MEDIA_MAX_AGE = env.int("MEDIA_MAX_AGE", default=60 * 60)
+# 외부에 제공하지 않는 MEDIA_ROOT 하위 디렉터리 (이어 올리기 중인 파일)
+MEDIA_PRIVATE_DIRS = ["uploads"]
+
+# 미디어 정리 작업 설정 (collect_orphaned_media 명령)
+# - GRACE_PERIOD: 수정된 지 이 시간(초)이 지나지 않은 파일은 참조가 없어도 유지 (저장 중인 파일 보호)
+# - UPLOAD_EXPIRY: 이 시간(초) 동안 변경이 없는 이어 올리기 세션은 게시글에 연결되지 않은 것으로 보고 삭제
+# - DELETED_POST_DAYS: 삭제된 지 이 일수가 지난 게시글의 이미지 삭제
+#   보관 작업이 이미지 경로를 기록할 수 있도록 SOFT_DELETE_ARCHIVE_DAYS 보다 커야 함 (posts.E001)
+#   (보관 작업이 건너뛴 게시글만 대상이 됨)
+MEDIA_GC_GRACE_PERIOD = env.int("MEDIA_GC_GRACE_PERIOD", default=24 * 60 * 60)
+MEDIA_GC_UPLOAD_EXPIRY = env.int("MEDIA_GC_UPLOAD_EXPIRY", default=24 * 60 * 60)
+MEDIA_GC_DELETED_POST_DAYS = env.int("MEDIA_GC_DELETED_POST_DAYS", default=120)
+
+# 삭제된 게시글 / 댓글 보관 (archive_deleted_rows 명령)
+# - 삭제된 지 이 일수가 지난 행을 posts_archive / comments_archive 로 이동
+SOFT_DELETE_ARCHIVE_DAYS = env.int("SOFT_DELETE_ARCHIVE_DAYS", default=90)
+
+# 요청 지표 (config.metrics, GET /metrics 에서 Prometheus 형식으로 제공)
+# - DIR: gunicorn 워커별 지표 파일 디렉터리 (같은 서버의 워커가 공유, 서버마다 따로 지정)
+# - FLUSH_INTERVAL: 워커가 자기 지표 파일을 갱신하는 주기(초)
+# - TOKEN: 설정하면 Authorization: Bearer <토큰> 요청만 /metrics 조회 가능 (운영 환경은 필수)
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_DIR = env("METRICS_DIR", default=os.path.join(tempfile.gettempdir(), "hands-metrics"))
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=5)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# 요청 단위 프로파일링 (config/profiling.py)
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=True)
+PROFILING_DIR = env("PROFILING_DIR", default=os.path.join(tempfile.gettempdir(), "hands-profiles"))
+PROFILING_TOKEN_MAX_AGE = env.int("PROFILING_TOKEN_MAX_AGE", default=600)  # 토큰 유효 시간(초)
+PROFILING_SAMPLE_INTERVAL = env.float("PROFILING_SAMPLE_INTERVAL", default=0.001)  # 샘플링 간격(초)
+PROFILING_MAX_PROFILES = env.int("PROFILING_MAX_PROFILES", default=50)  # 보관 개수
+
+# 캐시 설정 (운영 환경에서는 CACHE_URL 로 워커 간 공유 캐시 지정, 예: redis://...)
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# 게시글 상세 응답 캐시 유지 시간(초)
+POST_DETAIL_CACHE_TIMEOUT = env.int("POST_DETAIL_CACHE_TIMEOUT", default=300)
+
+# 비로그인 게시글 목록 응답 캐시 유지 시간(초) / 만료 후 재생성 중 이전 응답 제공 시간(초)
+POST_LIST_CACHE_TIMEOUT = env.int("POST_LIST_CACHE_TIMEOUT", default=10)
+POST_LIST_CACHE_STALE_TIMEOUT = env.int("POST_LIST_CACHE_STALE_TIMEOUT", default=30)
+
+# 조회수 쓰기 버퍼 설정
+# - 조회수 증가분을 메모리에 모아 FLUSH_INTERVAL(초)마다 일괄 반영 (0 이하면 즉시 반영)
+# - 누적분이 MAX_PENDING 이상이면 주기와 관계없이 즉시 반영 (비정상 종료 시 유실 상한)
+VIEW_COUNT_FLUSH_INTERVAL = env.float("VIEW_COUNT_FLUSH_INTERVAL", default=5)
+VIEW_COUNT_MAX_PENDING = env.int("VIEW_COUNT_MAX_PENDING", default=1000)
+
+# 게시글 이미지 변형본 설정
+# - 업로드 후 백그라운드 프로세스 풀(WORKERS 개)에서 WIDTHS 너비별 WebP 변형본 생성
+# - WORKERS 가 0 이면 백그라운드 생성 없이 generate_image_variants 명령으로만 생성
+POST_IMAGE_VARIANT_WIDTHS = env.list(
+    "POST_IMAGE_VARIANT_WIDTHS", cast=int, default=[320, 720, 1280]
+)
+POST_IMAGE_VARIANT_QUALITY = env.int("POST_IMAGE_VARIANT_QUALITY", default=80)
+POST_IMAGE_VARIANT_WORKERS = env.int("POST_IMAGE_VARIANT_WORKERS", default=2)
+
+# 업로드 이미지 검증 설정
+# - MAX_PIXELS: 이미지 한 장의 최대 픽셀 수 (헤더 기준, 디컴프레션 폭탄 차단)
+# - VALIDATION_WORKERS: 여러 이미지를 동시에 검사하는 스레드 수
+POST_IMAGE_MAX_PIXELS = env.int("POST_IMAGE_MAX_PIXELS", default=40_000_000)
+POST_IMAGE_VALIDATION_WORKERS = env.int("POST_IMAGE_VALIDATION_WORKERS", default=4)
+
 # Static files 설정
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 SECRET_KEY = env("SECRET_KEY")
@@ -15,3 +17,10 @@ DATABASES = {
     }
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+
+# 미디어 파일은 nginx 가 전송 (Django 는 접근 확인 후 X-Accel-Redirect 만 응답)
+MEDIA_SERVE_MODE = env("MEDIA_SERVE_MODE", default="accel")
+
+# /metrics 는 라우트 이름 / 트래픽 / 오류율을 노출하므로 운영 환경에서는 토큰 필수
+if METRICS_ENABLED and not METRICS_TOKEN:
+    raise ImproperlyConfigured("METRICS_ENABLED 이면 METRICS_TOKEN 을 설정해야 합니다.")
@@ -0,0 +1,48 @@
+import tempfile
+from typing import Any, Dict, Optional
+
+from django.test import override_settings
+
+from users.models import User
+
+# 테스트 공용 도우미
+# - user_fields / create_user: 이름으로 필수 필드를 채운 사용자 (이메일 <이름>@example.com)
+# - TempMediaRootMixin: 테스트마다 임시 MEDIA_ROOT 사용 (업로드 파일이 저장소 media/ 에 남지 않음)
+
+TEST_PHONE = "010-1234-5678"
+
+
+def user_fields(name: str, role: str = User.Role.WORKSHOP, **extra: Any) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        "email": f"{name}@example.com",
+        "name": name,
+        "nickname": name,
+        "phone": TEST_PHONE,
+        "role": role,
+    }
+    if role == User.Role.WORKSHOP:
+        fields["workshop_name"] = "공방"
+    elif role == User.Role.COMPANY:
+        fields["company_name"] = "기업"
+    fields.update(extra)
+    return fields
+
+
+def create_user(
+    name: str, role: str = User.Role.WORKSHOP, password: Optional[str] = None, **extra: Any
+) -> User:
+    user = User(**user_fields(name, role, **extra))
+    if password is not None:
+        user.set_password(password)
+    user.save()
+    return user
+
+
+class TempMediaRootMixin:
+    # MEDIA_ROOT 외에 함께 바꿀 설정 (ex. POST_IMAGE_VARIANT_WORKERS=0)
+    media_settings: Dict[str, Any] = {}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root, **self.media_settings))
@@ -0,0 +1,584 @@
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from comments.services import CommentService
+from config.metrics import MetricsSnapshot, metrics_registry, new_series
+from config.profiling import create_token
+from config.query_budget import QueryBudgetMixin, QueryInspector, iter_routes
+from config.testing import TempMediaRootMixin, create_user
+from contacts.models import Inquiry
+from posts.models import Post, PostImage, PostImageUpload
+from posts.serializers import PostListSerializer
+from posts.services import PostService
+from users.models import User
+
+
+class EndpointQueryBudgetTest(TempMediaRootMixin, QueryBudgetMixin, TestCase):
+    # config/urls.py 의 모든 엔드포인트 쿼리 수 상한 (캐시 미적중 기준)
+    # - 목록은 페이지 크기를 바꿔도 쿼리 수가 같아야 함 (항목마다 조회하지 않음)
+    # - 직렬화 중 관계 지연 로딩 / 반복 쿼리가 있으면 호출 위치와 함께 실패
+    # 새 경로를 추가하면 BUDGETS 에도 추가해야 함
+    BUDGETS: Dict[str, int] = {
+        "api/schema/": 0,
+        "api/docs/swagger/": 0,
+        "api/docs/redoc/": 0,
+        "api/users/profile/": 2,
+        "api/users/signup/": 3,
+        "api/users/login/": 2,
+        "api/users/token/refresh/": 1,
+        "api/users/password/change/": 1,
+        "api/users/check/<str:field>/": 1,
+        "api/users/schema/": 0,
+        "api/users/schema/swagger-ui/": 0,
+        "api/users/schema/redoc/": 0,
+        "api/posts/": 4,
+        "api/posts/create/": 15,
+        "api/posts/liked/": 1,
+        "api/posts/moderation/": 15,
+        "api/posts/cache/stats/": 0,
+        "api/posts/uploads/": 1,
+        "api/posts/uploads/<uuid:upload_id>/": 2,
+        "api/posts/uploads/<uuid:upload_id>/complete/": 2,
+        "api/posts/<int:post_id>/": 4,
+        "api/posts/<int:post_id>/update/": 8,
+        "api/posts/<int:post_id>/delete/": 12,
+        "api/posts/<int:post_id>/like/": 6,
+        "api/posts/<int:post_id>/liked/": 1,
+        "api/comment/<int:post_id>/comments/": 4,
+        "api/comment/<int:post_id>/comments/export/": 1,
+        "api/comment/<int:post_id>/comments/create/": 3,
+        "api/comment/<int:comment_id>/update/": 4,
+        "api/comment/<int:comment_id>/delete/": 3,
+        "api/contacts/": 1,
+        "api/contacts/<int:inquiry_id>/": 2,
+        "^media/(?P<path>.+)$": 0,
+        "metrics": 0,
+        "api/profiling/token/": 0,
+    }
+    media_settings = {"POST_IMAGE_VARIANT_WORKERS": 0}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        password = "password-1234!"
+        cls.admin = create_user("budget-admin", password=password, is_staff=True, is_superuser=True)
+        cls.company = create_user("budget-company", User.Role.COMPANY, password=password)
+        cls.authors = [create_user(f"budget-author-{i}", password=password) for i in range(4)]
+
+        # 작성자 / 카테고리 / 이미지 / 댓글 / 좋아요가 섞인 게시글 12개
+        categories = Post.Category.values
+        cls.posts = []
+        for i in range(12):
+            author = cls.authors[i % len(cls.authors)]
+            post = PostService.create_post(
+                user_id=author.id,
+                data={
+                    "title": f"라탄 바구니 {i}",
+                    "content": f"쿼리 예산 테스트 본문 {i}",
+                    "category": categories[i % len(categories)],
+                },
+            )
+            PostImage.objects.bulk_create(
+                PostImage(post=post, image_url=f"posts/{i:02x}/{j:064x}.png", width=8, height=8)
+                for j in range(2)
+            )
+            cls.posts.append(post)
+        cls.post = cls.posts[0]
+        for i, user in enumerate(cls.authors + [cls.company]):
+            for post in cls.posts[i::2]:
+                PostService.toggle_like(post_id=post.id, user_id=user.id)
+        cls.comments = [
+            CommentService.create_comment(
+                cls.post.id, cls.authors[i % len(cls.authors)].id, {"content": f"댓글 {i}"}
+            )
+            for i in range(12)
+        ]
+        cls.inquiry = Inquiry.objects.create(
+            name="홍길동",
+            email="inquiry@example.com",
+            content="문의",
+            preferred_contact="EMAIL",
+            inquiry_type="COMPANY",
+            organization_name="기업",
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.company)
+
+    def request(
+        self,
+        route: str,
+        method: str,
+        path: str,
+        expected: int = 200,
+        client: Optional[APIClient] = None,
+        **kwargs: Any,
+    ) -> Any:
+        with self.assertQueryBudget(self.BUDGETS[route]):
+            response = getattr(client or self.client, method)(path, **kwargs)
+        self.assertEqual(response.status_code, expected, getattr(response, "data", None))
+        return response
+
+    def test_reports_lazy_load_frame(self) -> None:
+        # prefetch 없이 직렬화하면 작성자 / 이미지를 게시글마다 조회 => 시리얼라이저 위치 보고
+        posts = Post.objects.order_by("id")[:3]
+        with self.assertRaisesRegex(
+            AssertionError, r"N\+1 .*posts/serializers\.py:\d+ in get_author"
+        ):
+            with self.assertQueryBudget(10):
+                PostListSerializer(posts, many=True, context={"liked_post_ids": set()}).data
+
+        with QueryInspector() as inspector:
+            PostListSerializer(
+                Post.objects.select_related("user").prefetch_related("images").order_by("id")[:3],
+                many=True,
+                context={"liked_post_ids": set()},
+            ).data
+        self.assertEqual((inspector.count, inspector.n_plus_one()), (2, []))
+
+    def test_every_route_has_budget(self) -> None:
+        routes = [route for route, _ in iter_routes(exclude=["admin/"])]
+        self.assertEqual(sorted(routes), sorted(self.BUDGETS))
+
+    def test_post_lists(self) -> None:
+        # 로그인 / 비로그인 x 전체 / 카테고리 / 검색 / TOP 10 (캐시 미적중)
+        route = "api/posts/"
+        for client in [self.client, APIClient()]:
+            for params in ["", "&category=RATTAN", "&search=라탄", "&top_liked=true"]:
+
+                def list_posts(limit: int) -> None:
+                    cache.clear()
+                    path = f"/api/posts/?limit={limit}{params}"
+                    response = self.request(route, "get", path, client=client)
+                    self.assertTrue(response.json()["data"])
+
+                self.assertConstantQueries(list_posts, [5, 10], self.BUDGETS[route])
+
+    def test_post_detail(self) -> None:
+        route = "api/posts/<int:post_id>/"
+        response = self.request(route, "get", f"/api/posts/{self.post.id}/")
+        self.assertEqual(len(response.json()["comments"]), 10)
+        self.request(route, "get", f"/api/posts/{self.posts[1].id}/", client=APIClient())
+
+    def test_post_writes(self) -> None:
+        self.client.force_authenticate(self.authors[0])
+        response = self.request(
+            "api/posts/create/",
+            "post",
+            "/api/posts/create/",
+            201,
+            data={
+                "title": "새 글",
+                "content": "쿼리 예산 테스트 새 글 본문",
+                "category": Post.Category.RATTAN,
+            },
+            format="json",
+        )
+        self.assertFalse(response.json()["is_liked"])
+        self.request(
+            "api/posts/<int:post_id>/update/",
+            "patch",
+            f"/api/posts/{self.post.id}/update/",
+            data={"title": "수정"},
+            format="json",
+        )
+        self.request("api/posts/<int:post_id>/like/", "post", f"/api/posts/{self.post.id}/like/")
+        self.request("api/posts/<int:post_id>/liked/", "get", f"/api/posts/{self.post.id}/liked/")
+        post_ids = ",".join(str(post.id) for post in self.posts)
+        self.request("api/posts/liked/", "get", f"/api/posts/liked/?post_ids={post_ids}")
+        self.request(
+            "api/posts/<int:post_id>/delete/",
+            "delete",
+            f"/api/posts/{self.post.id}/delete/",
+            204,
+        )
+
+    def test_uploads_and_media(self) -> None:
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), (1, 2, 3)).save(buffer, "PNG")
+        content = buffer.getvalue()
+
+        response = self.request(
+            "api/posts/uploads/",
+            "post",
+            "/api/posts/uploads/",
+            201,
+            data={"filename": "a.png", "size": len(content)},
+            format="json",
+        )
+        upload_id = response.json()["id"]
+        route = "api/posts/uploads/<uuid:upload_id>/"
+        self.request(route, "get", f"/api/posts/uploads/{upload_id}/")
+        self.request(
+            route,
+            "put",
+            f"/api/posts/uploads/{upload_id}/",
+            data=content,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes 0-{len(content) - 1}/{len(content)}",
+        )
+        response = self.request(
+            "api/posts/uploads/<uuid:upload_id>/complete/",
+            "post",
+            f"/api/posts/uploads/{upload_id}/complete/",
+        )
+        image_name = PostImageUpload.objects.get(id=upload_id).image_name
+        self.request("^media/(?P<path>.+)$", "get", f"{settings.MEDIA_URL}{image_name}")
+        self.request(route, "delete", f"/api/posts/uploads/{upload_id}/", 204)
+
+    def test_comments(self) -> None:
+        route = "api/comment/<int:post_id>/comments/"
+
+        def list_comments(limit: int) -> None:
+            self.request(route, "get", f"/api/comment/{self.post.id}/comments/?limit={limit}")
+            self.request(
+                route, "get", f"/api/comment/{self.post.id}/comments/?cursor=&limit={limit}"
+            )
+
+        self.assertConstantQueries(list_comments, [2, 10], self.BUDGETS[route] * 2)
+
+        self.client.force_authenticate(self.authors[0])
+        self.request(
+            "api/comment/<int:post_id>/comments/create/",
+            "post",
+            f"/api/comment/{self.post.id}/comments/create/",
+            201,
+            data={"content": "새 댓글"},
+            format="json",
+        )
+        self.request(
+            "api/comment/<int:comment_id>/update/",
+            "patch",
+            f"/api/comment/{self.comments[0].id}/update/",
+            data={"content": "수정"},
+            format="json",
+        )
+        self.request(
+            "api/comment/<int:comment_id>/delete/",
+            "delete",
+            f"/api/comment/{self.comments[0].id}/delete/",
+            204,
+        )
+
+        self.client.force_authenticate(self.admin)
+        response = self.request(
+            "api/comment/<int:post_id>/comments/export/",
+            "get",
+            f"/api/comment/{self.post.id}/comments/export/",
+        )
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["total_count"], 12)
+
+    def test_admin_endpoints(self) -> None:
+        with override_settings(
+            METRICS_DIR=os.path.join(settings.MEDIA_ROOT, ".metrics"), METRICS_TOKEN="secret"
+        ):
+            self.request("metrics", "get", "/metrics", 403)
+            self.request("metrics", "get", "/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+        self.client.force_authenticate(self.admin)
+        self.request("api/posts/cache/stats/", "get", "/api/posts/cache/stats/")
+        self.request(
+            "api/posts/moderation/",
+            "post",
+            "/api/posts/moderation/",
+            201,
+            data={"target": "POST", "action": "HIDE", "user_id": self.authors[1].id},
+            format="json",
+        )
+        self.request("api/profiling/token/", "post", "/api/profiling/token/", 201)
+
+    def test_users(self) -> None:
+        self.request("api/users/profile/", "get", "/api/users/profile/")
+        self.request(
+            "api/users/profile/", "patch", "/api/users/profile/", data={"nickname": "새 닉네임"}
+        )
+        self.request(
+            "api/users/check/<str:field>/",
+            "post",
+            "/api/users/check/nickname/",
+            data={"nickname": "unused"},
+        )
+        self.request(
+            "api/users/password/change/",
+            "post",
+            "/api/users/password/change/",
+            data={
+                "current_password": "password-1234!",
+                "new_password": "new-password-1234!",
+                "new_password2": "new-password-1234!",
+            },
+        )
+
+        self.client = APIClient()
+        self.request(
+            "api/users/signup/",
+            "post",
+            "/api/users/signup/",
+            201,
+            data={
+                "email": "budget-new@example.com",
+                "password": "password-1234!",
+                "password2": "password-1234!",
+                "name": "new",
+                "nickname": "budget-new",
+                "phone": "010-1234-5678",
+                "role": User.Role.WORKSHOP,
+                "workshop_name": "공방",
+            },
+        )
+        response = self.request(
+            "api/users/login/",
+            "post",
+            "/api/users/login/",
+            data={"email": self.authors[0].email, "password": "password-1234!"},
+        )
+        self.request(
+            "api/users/token/refresh/",
+            "post",
+            "/api/users/token/refresh/",
+            data={"refresh": response.json()["refresh"]},
+        )
+
+    def test_contacts(self) -> None:
+        self.client = APIClient()
+        route = "api/contacts/<int:inquiry_id>/"
+        self.request(route, "get", f"/api/contacts/{self.inquiry.id}/")
+        self.request(
+            route,
+            "patch",
+            f"/api/contacts/{self.inquiry.id}/",
+            data={"content": "수정", "preferred_contact": "EMAIL", "email": "a@example.com"},
+            format="json",
+        )
+        self.request(
+            "api/contacts/",
+            "post",
+            "/api/contacts/",
+            201,
+            data={
+                "name": "홍길동",
+                "email": "new-inquiry@example.com",
+                "content": "문의",
+                "preferred_contact": "EMAIL",
+                "inquiry_type": "COMPANY",
+                "organization_name": "기업",
+            },
+            format="json",
+        )
+
+    def test_schema(self) -> None:
+        for route in ["api/schema/", "api/users/schema/"]:
+            self.request(route, "get", f"/{route}")
+        for route in [
+            "api/docs/swagger/",
+            "api/docs/redoc/",
+            "api/users/schema/swagger-ui/",
+            "api/users/schema/redoc/",
+        ]:
+            self.request(route, "get", f"/{route}")
+
+
+class MetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("metrics")
+        cls.post = PostService.create_post(
+            user_id=cls.user.id,
+            data={"title": "지표", "content": "지표 테스트 본문", "category": Post.Category.RATTAN},
+        )
+
+    def setUp(self) -> None:
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(METRICS_DIR=self.directory, METRICS_TOKEN=""))
+        metrics_registry.reset()
+        self.addCleanup(metrics_registry.reset)
+        cache.clear()
+
+    def scrape(self) -> Dict[str, float]:
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_records_view_latency_queries_and_size(self) -> None:
+        for _ in range(2):
+            self.client.get("/api/posts/")
+        responses = [self.client.get(f"/api/posts/{post_id}/") for post_id in [self.post.id, 0]]
+        self.client.get("/no-such-path/")
+
+        samples = self.scrape()
+        labels = '{view="PostListView",method="GET"}'
+        self.assertEqual(samples[f"http_request_duration_seconds_count{labels}"], 2)
+        self.assertEqual(
+            samples[
+                'http_request_duration_seconds_bucket{view="PostListView",method="GET",le="+Inf"}'
+            ],
+            2,
+        )
+        self.assertGreater(samples[f"http_request_db_queries_sum{labels}"], 0)
+        self.assertGreater(samples[f"http_request_db_duration_seconds_sum{labels}"], 0)
+
+        detail = '{view="PostDetailView",method="GET"}'
+        self.assertEqual(
+            samples[f"http_response_size_bytes_sum{detail}"],
+            sum(len(response.content) for response in responses),
+        )
+        self.assertEqual(
+            samples['http_requests_total{view="PostDetailView",method="GET",status="200"}'], 1
+        )
+        self.assertEqual(
+            samples['http_requests_total{view="PostDetailView",method="GET",status="404"}'], 1
+        )
+        self.assertEqual(
+            samples['http_requests_total{view="<unmatched>",method="GET",status="404"}'], 1
+        )
+
+    def test_aggregates_worker_files(self) -> None:
+        self.client.get("/api/posts/")
+
+        # 다른 워커(살아 있는 부모 프로세스)와 종료된 워커의 지표 파일
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        snapshot = MetricsSnapshot()
+        snapshot.requests[("PostListView", "GET", "200")] = 5
+        snapshot.histograms[("PostListView", "GET")] = new_series()
+        snapshot.histograms[("PostListView", "GET")][0][0] = 5
+        for pid in [os.getppid(), dead.pid]:
+            with open(os.path.join(self.directory, f"metrics_{pid}.json"), "w") as f:
+                json.dump(snapshot.to_json(), f)
+
+        key = 'http_requests_total{view="PostListView",method="GET",status="200"}'
+        bucket = 'http_request_duration_seconds_bucket{view="PostListView",method="GET",le="0.005"}'
+        for _ in range(2):
+            # 종료된 워커 파일은 합산 파일로 옮겨지고 다시 조회해도 한 번만 더해짐
+            samples = self.scrape()
+            self.assertEqual(samples[key], 11)
+            self.assertGreaterEqual(samples[bucket], 10)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, f"metrics_{dead.pid}.json")))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "metrics_dead.json")))
+
+    def test_token(self) -> None:
+        with override_settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+            self.assertEqual(response.status_code, 200)
+
+
+class ProfilingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("profiling")
+        cls.admin = create_user("profiling-admin", is_staff=True)
+        cls.post = PostService.create_post(
+            user_id=cls.user.id,
+            data={
+                "title": "프로파일",
+                "content": "프로파일 본문",
+                "category": Post.Category.RATTAN,
+            },
+        )
+
+    def setUp(self) -> None:
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(PROFILING_DIR=self.directory))
+        self.client = APIClient()
+        cache.clear()
+
+    def issue_token(self) -> str:
+        self.client.force_authenticate(self.admin)
+        response = self.client.post("/api/profiling/token/")
+        self.client.force_authenticate(None)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["header"], "X-Profile")
+        return response.data["token"]
+
+    def test_token_requires_staff(self) -> None:
+        self.assertEqual(self.client.post("/api/profiling/token/").status_code, 401)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.post("/api/profiling/token/").status_code, 403)
+
+    def test_requests_without_valid_token_are_not_profiled(self) -> None:
+        forged = create_token(self.admin.id)[:-2] + "xx"
+        for kwargs in [{}, {"HTTP_X_PROFILE": forged}, {"HTTP_X_PROFILE": "nonsense"}]:
+            response = self.client.get(f"/api/posts/{self.post.id}/", **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("X-Profile-Id", response)
+        # 쿼리 문자열로 보낸 토큰은 사용하지 않음
+        token = self.issue_token()
+        response = self.client.get(f"/api/posts/{self.post.id}/?_profile={token}")
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_expired_token_is_ignored(self) -> None:
+        token = self.issue_token()
+        with override_settings(PROFILING_TOKEN_MAX_AGE=-1):
+            response = self.client.get(f"/api/posts/{self.post.id}/", HTTP_X_PROFILE=token)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_profiles_request(self) -> None:
+        token = self.issue_token()
+        response = self.client.get(f"/api/posts/{self.post.id}/", HTTP_X_PROFILE=token)
+        self.assertEqual(response.status_code, 200)
+        profile_id = response["X-Profile-Id"]
+        path = os.path.join(self.directory, profile_id)
+
+        # 1회용: 같은 토큰으로 다시 보내면 프로파일링하지 않음
+        response = self.client.get(f"/api/posts/{self.post.id}/", HTTP_X_PROFILE=token)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+        stats = pstats.Stats(f"{path}.prof")
+        self.assertTrue(any(name == "get" for _, _, name in stats.stats))
+
+        with open(f"{path}.json") as f:
+            info = json.load(f)
+        self.assertEqual(info["view"], "PostDetailView")
+        self.assertEqual(info["status"], 200)
+        self.assertEqual(info["requested_by"], self.admin.id)
+        self.assertGreater(info["query_count"], 0)
+        self.assertEqual(len(info["queries"]), info["query_count"])
+        self.assertAlmostEqual(
+            info["db_duration"], sum(query["duration"] for query in info["queries"])
+        )
+
+        with open(f"{path}.speedscope.json") as f:
+            speedscope = json.load(f)
+        profile = speedscope["profiles"][0]
+        self.assertEqual(profile["type"], "sampled")
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+        frame_count = len(speedscope["shared"]["frames"])
+        for sample in profile["samples"]:
+            self.assertTrue(all(0 <= index < frame_count for index in sample))
+
+    def test_retention(self) -> None:
+        profile_ids = []
+        with override_settings(PROFILING_MAX_PROFILES=2):
+            for _ in range(3):
+                response = self.client.get("/api/posts/", HTTP_X_PROFILE=self.issue_token())
+                self.assertEqual(response.status_code, 200)
+                profile_ids.append(response["X-Profile-Id"])
+
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(len(files), 6)
+        self.assertFalse(any(name.startswith(profile_ids[0]) for name in files))
+        self.assertIn(f"{profile_ids[2]}.prof", files)
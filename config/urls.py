@@ -15,14 +15,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
+from config.media import serve_media
+from config.metrics import metrics_view
+from config.profiling import ProfilingTokenView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # 요청 지표 (Prometheus 수집용)
+    path("metrics", metrics_view, name="metrics"),
+    # 요청 프로파일링 토큰 발급 (관리자 전용)
+    path("api/profiling/token/", ProfilingTokenView.as_view(), name="profiling-token"),
     # API URLs
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
@@ -31,6 +40,6 @@ urlpatterns = [
     path("api/posts/", include("posts.urls")),  # 게시글 관련 URLS
     path("api/comment/", include("comments.urls")),  # 댓글 관련 URLS
     path("api/contacts/", include("contacts.urls")),  # 문의 관련 URLS
-] + static(
-    settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-)  # 미디어 파일 서빙 설정 추가
+    # 미디어 파일 (운영 환경에서는 X-Accel-Redirect 로 nginx 가 전송)
+    re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.+)$", serve_media),
+]
@@ -1,3 +1,102 @@
-from django.contrib import admin
+from typing import Any, Dict, List
 
-from posts.models import Post
+from django.contrib import admin, messages
+from django.db.models import Model, QuerySet
+from django.forms import ModelForm
+from django.http import HttpRequest
+
+from posts.leaderboard import PostLeaderboard
+from posts.models import ModerationLog, Post
+from posts.moderation import ModerationService
+from posts.services import PostService
+
+
+class ModerationAdminMixin:
+    # 관리자 페이지 일괄 조치: 선택한 행을 ModerationService 로 처리
+    # (행마다 save() / delete() 하지 않고 배치 UPDATE + 댓글 수 / 랭킹 / 캐시 정리 + 조치 기록)
+    # - 삭제 / 숨김 행도 목록에 보이도록 all_objects 사용
+    # - 기본 일괄 삭제(delete_selected)는 행을 실제로 지우므로 제외
+    # - 변경 페이지의 삭제도 ModerationService 의 소프트 삭제로 처리
+    #   (모델 delete() 는 버전 / 랭킹 / 목록 캐시를 정리하지 않음)
+    moderation_target: str
+    actions = ["hide_selected", "soft_delete_selected"]
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        return self.model.all_objects.all()
+
+    def get_actions(self, request: HttpRequest) -> Dict[str, Any]:
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def delete_model(self, request: HttpRequest, obj: Model) -> None:
+        self.moderate_ids(request, [obj.id], ModerationLog.Action.DELETE)
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet) -> None:
+        self.moderate_ids(
+            request, list(queryset.values_list("id", flat=True)), ModerationLog.Action.DELETE
+        )
+
+    def moderate(self, request: HttpRequest, queryset: QuerySet, action: str) -> None:
+        log = self.moderate_ids(request, list(queryset.values_list("id", flat=True)), action)
+        self.message_user(request, f"{log.affected_count}개 처리했습니다.", messages.SUCCESS)
+
+    def moderate_ids(self, request: HttpRequest, ids: List[int], action: str) -> ModerationLog:
+        return ModerationService.moderate(
+            moderator_id=request.user.id,
+            target=self.moderation_target,
+            action=action,
+            ids=ids,
+            reason="관리자 페이지",
+        )
+
+    @admin.action(description="선택한 항목 숨김")
+    def hide_selected(self, request: HttpRequest, queryset: QuerySet) -> None:
+        self.moderate(request, queryset, ModerationLog.Action.HIDE)
+
+    @admin.action(description="선택한 항목 삭제 (소프트 삭제)")
+    def soft_delete_selected(self, request: HttpRequest, queryset: QuerySet) -> None:
+        self.moderate(request, queryset, ModerationLog.Action.DELETE)
+
+
+@admin.register(Post)
+class PostAdmin(ModerationAdminMixin, admin.ModelAdmin):
+    moderation_target = ModerationLog.Target.POST
+    list_display = ("id", "title", "user", "category", "status", "is_deleted", "created_at")
+    list_filter = ("status", "category", "is_deleted")
+    search_fields = ("title",)
+    raw_id_fields = ("user",)
+    exclude = ("search_vector",)
+    # 카운터 / 캐시 버전은 다른 요청이 동시에 갱신하므로 수정 불가
+    readonly_fields = ("view_count", "like_count", "comment_count", "version")
+
+    def save_model(self, request: HttpRequest, obj: Post, form: ModelForm, change: bool) -> None:
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+
+        # 변경한 컬럼만 저장 후 검색 문서 / 랭킹 / 상세 캐시 버전 / 목록 캐시 갱신
+        obj.save(update_fields=[*form.changed_data, "updated_at"])
+        previous_category = form.initial.get("category", obj.category)
+        if "title" in form.changed_data or "content" in form.changed_data:
+            PostService.update_search_vector(obj)
+        if obj.category != previous_category:
+            PostLeaderboard.remove(obj, scopes=[previous_category])
+        PostLeaderboard.update(obj)
+        PostService.bump_version(obj.id)
+        PostService.invalidate_post_lists(previous_category, obj.category)
+
+
+@admin.register(ModerationLog)
+class ModerationLogAdmin(admin.ModelAdmin):
+    list_display = ("id", "target", "action", "affected_count", "moderator", "reason", "created_at")
+    list_filter = ("target", "action")
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
+
+    def has_delete_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class PostsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "posts"
+
+    def ready(self) -> None:
+        from posts.checks import check_media_gc_retention
+
+        checks.register(check_media_gc_retention)
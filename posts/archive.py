@@ -0,0 +1,119 @@
+import datetime
+from typing import Dict, List
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from posts.blobs import ImageBlobService
+from posts.models import Post, PostImage, PostLike, PostRanking
+
+# 삭제된 댓글 보관: 한 문장으로 삭제 + 보관 테이블 추가 (배치 행은 SKIP LOCKED 로 선택)
+ARCHIVE_COMMENTS_SQL = """
+WITH batch AS (
+    SELECT id FROM comments
+    WHERE is_deleted AND updated_at < %(cutoff)s
+    ORDER BY id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+),
+moved AS (
+    DELETE FROM comments AS c USING batch WHERE c.id = batch.id RETURNING c.*
+)
+INSERT INTO comments_archive (id, post_id, user_id, data, created_at, deleted_at, archived_at)
+SELECT id, post_id, user_id, to_jsonb(moved), created_at, updated_at, NOW() FROM moved
+"""
+
+# 보관하는 게시글의 댓글 (삭제 여부와 관계없이 전체)
+ARCHIVE_POST_COMMENTS_SQL = """
+WITH moved AS (
+    DELETE FROM comments WHERE post_id = ANY(%(post_ids)s) RETURNING *
+)
+INSERT INTO comments_archive (id, post_id, user_id, data, created_at, deleted_at, archived_at)
+SELECT id, post_id, user_id, to_jsonb(moved), created_at, NOW(), NOW() FROM moved
+"""
+
+# 게시글 보관: 검색 문서를 제외한 행 + 이미지 경로 목록
+# (참조하는 행(댓글 / 좋아요 / 이미지)은 같은 트랜잭션에서 삭제, FK 는 커밋 시 확인)
+ARCHIVE_POSTS_SQL = """
+WITH moved AS (
+    DELETE FROM posts WHERE id = ANY(%(post_ids)s) RETURNING *
+)
+INSERT INTO posts_archive (
+    id, user_id, category, title, data, created_at, deleted_at, archived_at
+)
+SELECT
+    id,
+    user_id,
+    category,
+    title,
+    (to_jsonb(moved) - 'search_vector') || jsonb_build_object(
+        'images',
+        COALESCE(
+            (
+                SELECT jsonb_agg(i.image_url ORDER BY i.id)
+                FROM post_images AS i
+                WHERE i.post_id = moved.id
+            ),
+            '[]'::jsonb
+        )
+    ),
+    created_at,
+    updated_at,
+    NOW()
+FROM moved
+"""
+
+
+class SoftDeleteArchiver:
+    # 삭제된 지 days 일이 지난 게시글 / 댓글을 보관 테이블(posts_archive, comments_archive)로 이동
+    # - batch_size 개씩 트랜잭션을 나누어 처리 (긴 잠금 / 큰 트랜잭션 방지)
+    # - 대상 행은 삭제 행 부분 인덱스(updated_at)로 찾고, 다른 작업이 잠근 행은 건너뜀
+    # - 게시글 보관 시 댓글은 함께 보관, 좋아요 / 랭킹은 삭제, 이미지는 참조 해제
+    #   (이미지 파일은 미디어 정리 작업에서 삭제)
+
+    @staticmethod
+    def run(days: int, batch_size: int = 1000) -> Dict[str, int]:
+        cutoff = timezone.now() - datetime.timedelta(days=days)
+        archived = {"comments": 0, "posts": 0}
+
+        while True:
+            count = SoftDeleteArchiver.archive_comments(cutoff, batch_size)
+            archived["comments"] += count
+            if count < batch_size:
+                break
+
+        while True:
+            post_ids = SoftDeleteArchiver.archive_posts(cutoff, batch_size)
+            archived["posts"] += len(post_ids)
+            if len(post_ids) < batch_size:
+                break
+
+        return archived
+
+    @staticmethod
+    @transaction.atomic
+    def archive_comments(cutoff: datetime.datetime, batch_size: int) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_COMMENTS_SQL, {"cutoff": cutoff, "limit": batch_size})
+            return cursor.rowcount
+
+    @staticmethod
+    @transaction.atomic
+    def archive_posts(cutoff: datetime.datetime, batch_size: int) -> List[int]:
+        post_ids = list(
+            Post.all_objects.select_for_update(skip_locked=True)
+            .filter(is_deleted=True, updated_at__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not post_ids:
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_POSTS_SQL, {"post_ids": post_ids})
+            cursor.execute(ARCHIVE_POST_COMMENTS_SQL, {"post_ids": post_ids})
+
+        PostLike.objects.filter(post_id__in=post_ids).delete()
+        PostRanking.objects.filter(post_id__in=post_ids).delete()
+        ImageBlobService.release_images(PostImage.objects.filter(post_id__in=post_ids))
+        return post_ids
@@ -0,0 +1,165 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from posts.models import ImageBlob, PostImage
+from posts.storage import HASHED_NAME_RE, get_post_image_storage, is_hashed_name
+
+LOCK_BLOBS_SQL = """
+SELECT id
+FROM image_blobs
+WHERE name = ANY(%s)
+ORDER BY name
+FOR UPDATE
+"""
+
+
+class ImageBlobService:
+    # 내용 해시 경로 파일(ImageBlob)의 참조 수 관리
+    # - 같은 파일을 여러 게시글 이미지가 공유하므로 PostImage 생성 / 삭제 시 참조 수 증감
+    # - 참조 수 증감은 이름별로 모아 한 번의 INSERT ... ON CONFLICT / UPDATE 로 처리
+    #   (감소는 SELECT ... ORDER BY name FOR UPDATE 로 이름 순으로 먼저 잠근 뒤 갱신
+    #    => 동시에 같은 파일들을 해제해도 교착 상태 없음)
+    # - 참조 수가 0 이 되어도 파일은 바로 지우지 않음 (같은 내용이 곧 다시 올라올 수 있고,
+    #   트랜잭션 롤백 시 파일 복구가 불가능하므로 정리 작업에서 유예 기간 후 삭제)
+    # - 카운터가 어긋난 경우(게시글 CASCADE 삭제 등) recount 로 post_images 기준 재계산
+
+    @staticmethod
+    def acquire(names: Iterable[str]) -> None:
+        counts = ImageBlobService._count(names)
+        if not counts:
+            return
+
+        storage = get_post_image_storage()
+        rows = []
+        for name, count in counts:
+            try:
+                size = storage.size(name)
+            except OSError:
+                size = 0
+            rows.append((name, ImageBlobService.digest(name), size, count))
+
+        values = ", ".join(["(%s, %s, %s, %s, now(), now())"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO image_blobs (name, sha256, size, ref_count, created_at, updated_at)
+                VALUES {values}
+                ON CONFLICT (name) DO UPDATE
+                SET ref_count = image_blobs.ref_count + EXCLUDED.ref_count, updated_at = now()
+                """,
+                [value for row in rows for value in row],
+            )
+
+    @staticmethod
+    def release(names: Iterable[str]) -> None:
+        counts = ImageBlobService._count(names)
+        if not counts:
+            return
+
+        # UPDATE ... FROM 은 조인 순서대로 행을 잠그므로 먼저 이름 순으로 잠근 뒤 갱신
+        values = ", ".join(["(%s, %s)"] * len(counts))
+        with transaction.atomic(savepoint=False), connection.cursor() as cursor:
+            cursor.execute(LOCK_BLOBS_SQL, [[name for name, _ in counts]])
+            cursor.execute(
+                f"""
+                UPDATE image_blobs AS b
+                SET ref_count = GREATEST(b.ref_count - v.n, 0), updated_at = now()
+                FROM (VALUES {values}) AS v(name, n)
+                WHERE b.name = v.name
+                """,
+                [value for row in counts for value in row],
+            )
+
+    @staticmethod
+    def release_images(queryset: QuerySet[PostImage]) -> int:
+        # 게시글 이미지 삭제 + 참조 수 감소 (삭제한 이미지 수 반환)
+        names = list(queryset.values_list("image_url", flat=True))
+        deleted, _ = queryset.delete()
+        ImageBlobService.release(names)
+        return deleted
+
+    @staticmethod
+    def recount() -> int:
+        # post_images 기준으로 참조 수 재계산 (변경된 행 수 반환)
+        # - 내용 해시 경로이지만 ImageBlob 행이 없는 파일(기록 누락)은 새로 등록
+        missing = (
+            PostImage.objects.exclude(image_url__in=ImageBlob.objects.values("name"))
+            .values_list("image_url", flat=True)
+            .distinct()
+        )
+        ImageBlobService.register(list(missing))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE image_blobs AS b
+                SET ref_count = c.n, updated_at = now()
+                FROM (
+                    SELECT s.id, COUNT(i.id) AS n
+                    FROM image_blobs AS s
+                    LEFT JOIN post_images AS i ON i.image_url = s.name
+                    GROUP BY s.id
+                ) AS c
+                WHERE b.id = c.id AND b.ref_count <> c.n
+                """
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def register(names: List[str]) -> None:
+        # 참조 수 0 으로 등록 (이미 있으면 변경 없음) - recount 에서 실제 값으로 갱신
+        storage = get_post_image_storage()
+        rows = []
+        for name in dict.fromkeys(names):
+            if not is_hashed_name(name):
+                continue
+            try:
+                size = storage.size(name)
+            except OSError:
+                size = 0
+            rows.append((name, ImageBlobService.digest(name), size))
+        if not rows:
+            return
+
+        values = ", ".join(["(%s, %s, %s, 0, now(), now())"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO image_blobs (name, sha256, size, ref_count, created_at, updated_at)
+                VALUES {values}
+                ON CONFLICT (name) DO NOTHING
+                """,
+                [value for row in rows for value in row],
+            )
+
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        # 논리 크기(게시글 이미지마다 파일이 있을 때) / 실제 저장 크기
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(size * ref_count), 0),
+                       COALESCE(SUM(ref_count), 0)
+                FROM image_blobs
+                """
+            )
+            blobs, physical_bytes, logical_bytes, references = cursor.fetchone()
+        return {
+            "blobs": blobs,
+            "references": references,
+            "physical_bytes": physical_bytes,
+            "logical_bytes": logical_bytes,
+        }
+
+    @staticmethod
+    def digest(name: str) -> str:
+        # posts/ab/<sha256>.jpg => <sha256>
+        return HASHED_NAME_RE.search(name).group(0).lstrip("/")[:64]
+
+    @staticmethod
+    def _count(names: Iterable[str]) -> List[Tuple[str, int]]:
+        # 내용 해시 경로가 아닌 기존 파일은 게시글 이미지마다 따로 있으므로 참조 수 관리 대상 아님
+        return sorted(Counter(name for name in names if name and is_hashed_name(name)).items())
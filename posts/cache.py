@@ -0,0 +1,171 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.request import Request
+
+
+class PostDetailCache:
+    # 게시글 상세 응답 캐시
+    # - 키: 게시글 id + 버전(posts.version) => 게시글 / 댓글 / 좋아요 변경 시 버전이 올라가
+    #   이전 캐시는 더 이상 조회되지 않음 (별도 삭제 없이 TTL 로 만료)
+    # - 사용자별 값(is_liked), 실시간 조회수(view_count)는 캐시하지 않고 조회 후 덮어씀
+    # - 적중 / 미적중 횟수는 캐시의 카운터로 집계 (CACHE_URL 공유 캐시면 모든 워커 합산)
+
+    KEY_PREFIX = "post_detail"
+
+    @staticmethod
+    def timeout() -> int:
+        return int(getattr(settings, "POST_DETAIL_CACHE_TIMEOUT", 300))
+
+    @classmethod
+    def key(cls, post_id: int, version: int, request: Request) -> str:
+        # 이미지 URL 이 요청 호스트 기준 절대 경로이므로 호스트별로 구분
+        base_url = hashlib.md5(request.build_absolute_uri("/").encode()).hexdigest()[:8]
+        return f"{cls.KEY_PREFIX}:{post_id}:{version}:{base_url}"
+
+    @classmethod
+    def get_or_build(
+        cls,
+        post_id: int,
+        version: int,
+        request: Request,
+        build: Callable[[], Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        # (응답 본문, 캐시 적중 여부) 반환
+        key = cls.key(post_id, version, request)
+        body = cache.get(key)
+        if body is not None:
+            cls._record(hit=True)
+            return body, True
+
+        cls._record(hit=False)
+        body = dict(build())
+        cache.set(key, body, cls.timeout())
+        return body, False
+
+    @classmethod
+    def stats_key(cls, name: str) -> str:
+        return f"{cls.KEY_PREFIX}:stats:{name}"
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        counts = cache.get_many([cls.stats_key("hits"), cls.stats_key("misses")])
+        hits = int(counts.get(cls.stats_key("hits"), 0))
+        misses = int(counts.get(cls.stats_key("misses"), 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+        }
+
+    @classmethod
+    def _record(cls, hit: bool) -> None:
+        # 요청마다 실행되므로 키가 있는 경우 incr 한 번만 호출
+        key = cls.stats_key("hits" if hit else "misses")
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+
+
+class PostListCache:
+    # 비로그인 사용자 게시글 목록 응답 캐시 (category, cursor, limit 별)
+    # - 카테고리별 세대(generation) 값을 키에 포함
+    #   => 게시글 작성/수정/삭제 시 해당 카테고리와 전체 목록의 세대만 증가 (대상 무효화)
+    # - 짧은 TTL 이후에는 한 요청만 재생성하고, 나머지 요청은 이전 응답을 그대로 사용
+    # - 캐시가 비어 있는 경우에도 재생성은 한 요청만 수행하고 나머지는 WAIT_TIMEOUT 까지만 대기
+    #   => 캐시 만료 시 동시에 수백 개의 목록 쿼리가 실행되는 것을 방지
+    #   재생성이 그보다 오래 걸리면 대기하던 요청도 직접 조회 (요청 스레드를 오래 붙잡지 않음)
+
+    KEY_PREFIX = "post_list"
+    SCOPE_ALL = "ALL"
+    # 재생성 잠금 유지 시간(초) / 대기 요청의 최대 대기 시간(초) / 확인 주기(초)
+    LOCK_TIMEOUT = 5
+    WAIT_TIMEOUT = 0.3
+    WAIT_INTERVAL = 0.05
+
+    @staticmethod
+    def timeout() -> int:
+        return int(getattr(settings, "POST_LIST_CACHE_TIMEOUT", 10))
+
+    @staticmethod
+    def stale_timeout() -> int:
+        # TTL 이 지난 뒤에도 재생성 동안 제공할 수 있는 시간
+        return int(getattr(settings, "POST_LIST_CACHE_STALE_TIMEOUT", 30))
+
+    @classmethod
+    def generation_key(cls, scope: str) -> str:
+        return f"{cls.KEY_PREFIX}:generation:{scope}"
+
+    @classmethod
+    def generation(cls, scope: str) -> int:
+        return int(cache.get_or_set(cls.generation_key(scope), 0, None))
+
+    @classmethod
+    def invalidate(cls, *categories: str) -> None:
+        # 해당 카테고리 목록과 전체 목록 캐시 무효화
+        for scope in {cls.SCOPE_ALL, *categories}:
+            key = cls.generation_key(scope)
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+    @classmethod
+    def key(
+        cls, category: Optional[str], cursor: Optional[int], limit: int, request: Request
+    ) -> str:
+        scope = category or cls.SCOPE_ALL
+        base_url = hashlib.md5(request.build_absolute_uri("/").encode()).hexdigest()[:8]
+        return (
+            f"{cls.KEY_PREFIX}:{scope}:{cls.generation(scope)}:" f"{cursor or 0}:{limit}:{base_url}"
+        )
+
+    @classmethod
+    def get_or_build(
+        cls,
+        category: Optional[str],
+        cursor: Optional[int],
+        limit: int,
+        request: Request,
+        build: Callable[[], Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], bool]:
+        # (응답 본문, 캐시 적중 여부) 반환
+        key = cls.key(category, cursor, limit, request)
+        entry = cache.get(key)
+        if entry is not None and entry["expires_at"] > time.time():
+            return entry["body"], True
+
+        # 재생성 잠금을 얻은 한 요청만 쿼리 실행
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, cls.LOCK_TIMEOUT):
+            try:
+                body = dict(build())
+                cache.set(
+                    key,
+                    {"body": body, "expires_at": time.time() + cls.timeout()},
+                    cls.timeout() + cls.stale_timeout(),
+                )
+                return body, False
+            finally:
+                cache.delete(lock_key)
+
+        # 다른 요청이 재생성 중: 만료된 응답이 있으면 그대로 사용
+        if entry is not None:
+            return entry["body"], True
+
+        # 캐시가 비어 있으면 WAIT_TIMEOUT 동안만 재생성 결과를 기다린 뒤 직접 생성
+        deadline = time.time() + cls.WAIT_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(cls.WAIT_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["body"], True
+
+        return dict(build()), False
@@ -0,0 +1,25 @@
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import Error
+
+
+def purges_before_archive(deleted_post_days: int, archive_days: int) -> bool:
+    # 미디어 정리 작업이 보관 작업보다 먼저 삭제된 게시글의 이미지 행을 지우는지
+    # (보관 시 posts_archive.data.images 에 이미지 경로가 남지 않음)
+    return 0 <= deleted_post_days <= archive_days
+
+
+def check_media_gc_retention(app_configs: Any = None, **kwargs: Any) -> List[Error]:
+    if not purges_before_archive(
+        settings.MEDIA_GC_DELETED_POST_DAYS, settings.SOFT_DELETE_ARCHIVE_DAYS
+    ):
+        return []
+    return [
+        Error(
+            "MEDIA_GC_DELETED_POST_DAYS 는 SOFT_DELETE_ARCHIVE_DAYS 보다 커야 합니다.",
+            hint="삭제된 게시글의 이미지를 보관 전에 지우면 보관 데이터에 이미지 경로가 남지 않습니다. "
+            "(음수면 미디어 정리 작업에서 삭제된 게시글의 이미지를 지우지 않음)",
+            id="posts.E001",
+        )
+    ]
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Any, Optional
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+# 조건부 GET (ETag / If-None-Match) 처리
+# - 응답 본문을 직렬화하지 않고 버전 카운터(posts.version, 조회수 등)만으로 ETag 생성
+#   => 변경이 없으면 가벼운 조회 한 번으로 304 응답
+# - 같은 내용이어도 바이트 단위로 같다는 보장은 없으므로 약한(W/) ETag 사용
+# - 사용자별 값(is_liked)이 포함된 응답은 사용자 id 를 ETag 에 포함하고 Authorization 으로 구분
+# - Last-Modified 는 보내지 않음: 좋아요 / 댓글 변경은 posts.updated_at 을 바꾸지 않으므로
+#   수정일시만으로는 변경 여부를 판단할 수 없음
+
+
+def build_etag(*parts: Any) -> str:
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    # If-None-Match 는 약한 비교 (W/ 접두어 무시)
+    header = request.headers.get("If-None-Match")
+    if not header or not etag:
+        return False
+
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    target = etag.removeprefix("W/")
+    return any(value.removeprefix("W/") == target for value in etags)
+
+
+def with_etag(request: Request, response: Response, etag: Optional[str]) -> Response:
+    # 클라이언트 / nginx 가 매 요청 ETag 로 재검증하도록 no-cache 지정
+    if etag:
+        response["ETag"] = etag
+    if request.user.is_authenticated:
+        response["Cache-Control"] = "private, no-cache"
+    else:
+        response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def not_modified(request: Request, etag: str) -> Response:
+    return with_etag(request, Response(status=status.HTTP_304_NOT_MODIFIED), etag)
@@ -0,0 +1,133 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from rest_framework import serializers
+
+from comments.fast_serializers import serialize_comments
+from posts import search
+from posts.image_variants import build_srcset, build_variants
+from posts.models import Post, PostImage, PostLike
+
+# 읽기 전용 빠른 직렬화 (게시글 목록 / 상세)
+# - DRF 필드별 처리 / SerializerMethodField 호출 없이 dict 를 직접 구성
+# - 출력은 PostListSerializer / PostDetailSerializer 와 바이트 단위로 동일해야 함
+#   => 필드 순서 / None 처리 / 타입 변환을 DRF 필드와 같게 유지 (posts.tests 의 parity 테스트)
+# - 날짜 형식은 설정(DATETIME_FORMAT, TIME_ZONE)을 따르도록 DRF 필드 변환을 그대로 사용
+# - 시리얼라이저 필드를 추가 / 변경하면 이 모듈도 함께 수정
+
+_datetime_field = serializers.DateTimeField()
+
+
+def to_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def to_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def to_bool(value: Any) -> Optional[bool]:
+    return None if value is None else bool(value)
+
+
+def to_datetime(value: Any) -> Optional[str]:
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def to_file_url(value: Any, request: Any) -> Optional[str]:
+    # serializers.ImageField 와 동일 (요청이 있으면 절대 URL)
+    if not value:
+        return None
+    try:
+        url = value.url
+    except AttributeError:
+        return None
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def serialize_author(post: Post) -> Dict[str, Any]:
+    user = post.user
+    return {
+        "id": user.id,
+        "nickname": getattr(user, "nickname", ""),
+        "workshop_name": getattr(user, "workshop_name", ""),
+    }
+
+
+def serialize_post_list(posts: Iterable[Post], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # PostListSerializer(posts, many=True, context=context).data 와 동일
+    liked_post_ids = context.get("liked_post_ids", ())
+    keyword = context.get("search_keyword")
+
+    return [
+        {
+            "id": to_int(post.id),
+            "title": to_str(post.title),
+            "category": to_str(post.category),
+            "view_count": to_int(post.view_count),
+            "like_count": to_int(post.like_count),
+            "comment_count": to_int(post.comment_count),
+            "author": serialize_author(post),
+            "created_at": to_datetime(post.created_at),
+            "is_deleted": to_bool(post.is_deleted),
+            "is_liked": post.id in liked_post_ids,
+            "highlight": (
+                search.build_highlight(post.title, post.snippet, keyword) if keyword else None
+            ),
+        }
+        for post in posts
+    ]
+
+
+def serialize_images(images: Iterable[PostImage], request: Any) -> List[Dict[str, Any]]:
+    result = []
+    for image in images:
+        variants = build_variants(image, request)
+        result.append(
+            {
+                "id": to_int(image.id),
+                "image_url": to_file_url(image.image_url, request),
+                "width": to_int(image.width),
+                "height": to_int(image.height),
+                "variants": variants,
+                "srcset": build_srcset(variants),
+                "created_at": to_datetime(image.created_at),
+            }
+        )
+    return result
+
+
+def is_post_liked(post: Post, context: Dict[str, Any]) -> bool:
+    # PostDetailSerializer.get_is_liked 와 동일
+    if "liked_post_ids" in context:
+        return post.id in context["liked_post_ids"]
+    user = context["request"].user
+    user_id = context.get("user_id", user.id if user.is_authenticated else None)
+    if not user_id:
+        return False
+
+    if "likes" in getattr(post, "_prefetched_objects_cache", {}):
+        return any(like.user_id == user_id for like in post.likes.all())
+
+    return PostLike.objects.filter(post=post, user_id=user_id).exists()
+
+
+def serialize_post_detail(post: Post, context: Dict[str, Any]) -> Dict[str, Any]:
+    # PostDetailSerializer(post, context=context).data 와 동일
+    request = context.get("request")
+    return {
+        "id": to_int(post.id),
+        "title": to_str(post.title),
+        "content": to_str(post.content),
+        "category": to_str(post.category),
+        "view_count": to_int(post.view_count),
+        "like_count": to_int(post.like_count),
+        "comment_count": to_int(post.comment_count),
+        "author": serialize_author(post),
+        "images": serialize_images(post.images.all(), request),
+        "is_liked": is_post_liked(post, context),
+        "comments": serialize_comments(post.comment_page),
+        "comments_has_next": to_bool(post.comments_has_next),
+        "comments_next_cursor": to_str(post.comments_next_cursor),
+        "created_at": to_datetime(post.created_at),
+        "updated_at": to_datetime(post.updated_at),
+    }
@@ -0,0 +1,52 @@
+import os
+from typing import Any, Dict, List, Sequence
+
+from PIL import Image, ImageOps
+
+# 이미지 변형본(리사이즈 + WebP) 생성 작업
+# - 프로세스 풀 워커에서 실행되므로 Django 를 import 하지 않음 (spawn 시 가볍게 로드)
+# - 입력 / 출력은 파일 경로와 기본 자료형만 사용 (pickle 가능)
+# - DB 반영은 요청 프로세스의 ImageVariantPipeline 에서 처리
+
+WEBP_FORMAT = "webp"
+ORIENTATION_TAG = 0x0112
+
+
+def variant_suffix(width: int) -> str:
+    # 원본 경로 뒤에 붙는 변형본 접미사 (posts/2025/01/01/a.jpg => posts/2025/01/01/a.320w.webp)
+    return f".{width}w.{WEBP_FORMAT}"
+
+
+def render_variants(source_path: str, widths: Sequence[int], quality: int) -> Dict[str, Any]:
+    # 원본 크기와 변형본 목록 반환
+    # - 원본보다 큰 너비는 확대하지 않고 원본 크기 변형본 하나로 대신함
+    # - EXIF 회전 정보를 반영한 방향 기준으로 크기 계산
+    root, _ = os.path.splitext(source_path)
+    widths = sorted(set(widths))
+    variants: List[Dict[str, Any]] = []
+
+    with Image.open(source_path) as image:
+        # 원본 크기는 헤더 기준 (90도 / 270도 회전 정보가 있으면 가로 / 세로 교환)
+        width, height = image.size
+        if image.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+            width, height = height, width
+
+        # JPEG 는 가장 큰 변형본 이상인 크기로 축소 디코딩 (전체 해상도 디코딩 생략)
+        if widths:
+            image.draft("RGB", (widths[-1], widths[-1]))
+        image = ImageOps.exif_transpose(image)
+
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for target in widths:
+            target = min(target, width)
+            target_height = max(1, round(height * target / width))
+            resized = image.resize((target, target_height), Image.Resampling.LANCZOS)
+            resized.save(root + variant_suffix(target), "WEBP", quality=quality, method=4)
+            variants.append({"width": target, "height": target_height, "format": WEBP_FORMAT})
+            if target == width:
+                break
+
+    return {"width": width, "height": height, "variants": variants}
@@ -0,0 +1,122 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, NamedTuple, Optional
+
+from django.conf import settings
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+
+class ImageInfo(NamedTuple):
+    format: str
+    content_type: str
+    extension: str
+    width: int
+    height: int
+
+
+class ImageValidator:
+    # 업로드 이미지 검증 (게시글 작성 / 수정 공통)
+    # - 클라이언트가 보낸 content_type 대신 파일 앞부분(매직 바이트)으로 형식 판별
+    # - 가로 / 세로 크기는 헤더만 읽어 확인 (픽셀 디코딩 / verify 없음)
+    # - 픽셀 수 제한으로 디컴프레션 폭탄 차단 (파일은 작지만 디코딩 시 수 GB 메모리를 쓰는 이미지)
+    # - 여러 파일은 스레드 풀에서 동시에 검사하고, 오류는 파일 순서대로 첫 번째 것을 반환
+    # - 픽셀 데이터 손상은 여기서 확인하지 않음 (변형본 생성 시 실패로 기록)
+
+    MAX_IMAGE_SIZE: int = 5 * 1024 * 1024  # 5MB
+    MAX_IMAGE_COUNT: int = 10
+    # (매직 바이트, PIL 형식, content_type, 저장 확장자)
+    SIGNATURES = (
+        (b"\xff\xd8\xff", "JPEG", "image/jpeg", ".jpg"),
+        (b"\x89PNG\r\n\x1a\n", "PNG", "image/png", ".png"),
+        (b"GIF87a", "GIF", "image/gif", ".gif"),
+        (b"GIF89a", "GIF", "image/gif", ".gif"),
+    )
+    SIGNATURE_SIZE = 8
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_pid: Optional[int] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def max_pixels(cls) -> int:
+        return int(getattr(settings, "POST_IMAGE_MAX_PIXELS", 40_000_000))
+
+    @classmethod
+    def max_workers(cls) -> int:
+        return int(getattr(settings, "POST_IMAGE_VALIDATION_WORKERS", 4))
+
+    @classmethod
+    def validate(cls, files: List[Any]) -> List[Any]:
+        if not files:
+            return files
+
+        if len(files) > cls.MAX_IMAGE_COUNT:
+            raise ValidationError(f"이미지는 최대 {cls.MAX_IMAGE_COUNT}개까지 업로드 가능합니다")
+
+        if len(files) == 1 or cls.max_workers() <= 1:
+            infos = [cls.validate_image(image) for image in files]
+        else:
+            # map 결과는 입력 순서대로 반환되며, 실패한 파일의 예외는 해당 순서에서 발생
+            infos = list(cls._get_executor().map(cls.validate_image, files))
+
+        # 저장에는 판별한 형식 사용 (클라이언트가 보낸 파일 확장자 / content_type 무시)
+        for image, info in zip(files, infos):
+            image.content_type = info.content_type
+            image.name = os.path.splitext(os.path.basename(image.name or ""))[0] + info.extension
+        return files
+
+    @classmethod
+    def validate_image(cls, image: Any) -> ImageInfo:
+        if not hasattr(image, "size") or not hasattr(image, "read"):
+            raise ValidationError("올바르지 않은 이미지 파일입니다")
+
+        if image.size > cls.MAX_IMAGE_SIZE:
+            raise ValidationError(
+                f"이미지 크기는 {cls.MAX_IMAGE_SIZE // 1024 // 1024}MB를 초과할 수 없습니다"
+            )
+
+        image.seek(0)
+        signature = image.read(cls.SIGNATURE_SIZE)
+        image.seek(0)
+        matched = next((s for s in cls.SIGNATURES if signature.startswith(s[0])), None)
+        if matched is None:
+            allowed = ", ".join(sorted({signature[2] for signature in cls.SIGNATURES}))
+            raise ValidationError(f"허용된 이미지 형식: {allowed}")
+        _, image_format, content_type, extension = matched
+
+        # Image.open 은 헤더만 읽음 (load / verify 를 호출하지 않으므로 픽셀 디코딩 없음)
+        try:
+            with Image.open(image, formats=[image_format]) as opened:
+                width, height = opened.size
+        except Image.DecompressionBombError:
+            raise ValidationError(cls.too_many_pixels_message())
+        except Exception:
+            raise ValidationError("손상된 이미지 파일입니다")
+        finally:
+            image.seek(0)
+
+        if width <= 0 or height <= 0:
+            raise ValidationError("손상된 이미지 파일입니다")
+        if width * height > cls.max_pixels():
+            raise ValidationError(cls.too_many_pixels_message())
+
+        return ImageInfo(image_format, content_type, extension, width, height)
+
+    @classmethod
+    def too_many_pixels_message(cls) -> str:
+        return f"이미지 해상도는 {cls.max_pixels() // 1_000_000}백만 화소를 초과할 수 없습니다"
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        # 프로세스 전체에서 공유하는 검사용 스레드 풀 (요청마다 생성하지 않음)
+        # gunicorn 워커 fork 이후 프로세스별로 한 번만 생성
+        pid = os.getpid()
+        with cls._lock:
+            if cls._executor is None or cls._executor_pid != pid:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers(), thread_name_prefix="image-validation"
+                )
+                cls._executor_pid = pid
+            return cls._executor
@@ -0,0 +1,129 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from posts.image_processing import render_variants, variant_suffix
+from posts.models import Post, PostImage
+
+logger = logging.getLogger(__name__)
+
+
+class ImageVariantPipeline:
+    # 게시글 이미지 변형본(리사이즈 + WebP) 백그라운드 생성
+    # - 업로드 요청은 커밋 후 작업을 프로세스 풀에 넣기만 하고 바로 응답 (요청 스레드에서 리사이즈 없음)
+    # - 워커 프로세스가 원본 옆에 "<원본>.<너비>w.webp" 파일을 만들고 크기를 반환하면
+    #   완료 콜백에서 PostImage.width / height / variants 갱신 후 게시글 버전 증가 (상세 캐시 무효화)
+    # - 풀은 gunicorn 워커 fork 이후 프로세스별로 한 번만 생성
+    #   (스레드가 있는 프로세스에서 fork 하지 않도록 spawn 사용)
+    # - 생성 실패 / 서버 재시작으로 누락된 이미지는 generate_image_variants 명령으로 다시 생성
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._executor_pid: Optional[int] = None
+
+    @property
+    def widths(self) -> List[int]:
+        return list(getattr(settings, "POST_IMAGE_VARIANT_WIDTHS", [320, 720, 1280]))
+
+    @property
+    def quality(self) -> int:
+        return int(getattr(settings, "POST_IMAGE_VARIANT_QUALITY", 80))
+
+    @property
+    def max_workers(self) -> int:
+        return int(getattr(settings, "POST_IMAGE_VARIANT_WORKERS", 2))
+
+    def enqueue(self, images: Iterable[PostImage]) -> None:
+        # 트랜잭션 커밋 후 작업 등록 (롤백되면 등록하지 않음)
+        images = [image for image in images if image.id is not None and image.image_url]
+        if images:
+            transaction.on_commit(lambda: self.submit(images))
+
+    def submit(self, images: Sequence[PostImage]) -> None:
+        # 작업 수가 0 이면 백그라운드 생성 없이 명령으로만 생성
+        if self.max_workers <= 0:
+            return
+
+        executor = self._get_executor()
+        for image in images:
+            try:
+                source_path = image.image_url.path
+                future = executor.submit(render_variants, source_path, self.widths, self.quality)
+            except Exception:
+                logger.exception("이미지 변형본 작업 등록 실패: PostImage %s", image.id)
+                continue
+            future.add_done_callback(
+                lambda f, image=image: self._on_done(
+                    image.id, image.post_id, image.image_url.name, f
+                )
+            )
+
+    @staticmethod
+    def save_result(image_id: int, post_id: int, name: str, result: Dict[str, Any]) -> None:
+        # 워커 결과(원본 크기 / 변형본 크기) 반영
+        root, _ = os.path.splitext(name)
+        variants = [
+            {**variant, "name": root + variant_suffix(variant["width"])}
+            for variant in result["variants"]
+        ]
+        updated = PostImage.objects.filter(id=image_id).update(
+            width=result["width"], height=result["height"], variants=variants
+        )
+        if updated:
+            Post.all_objects.filter(id=post_id).update(version=F("version") + 1)
+
+    def _on_done(self, image_id: int, post_id: int, name: str, future: Future) -> None:
+        # 풀의 결과 처리 스레드에서 실행
+        try:
+            self.save_result(image_id, post_id, name, future.result())
+        except Exception:
+            logger.exception("이미지 변형본 생성 실패: PostImage %s", image_id)
+        finally:
+            # 스레드 전용 DB 커넥션 정리 (트랜잭션 안에서 바로 완료된 경우는 제외)
+            if not connection.in_atomic_block:
+                connection.close()
+
+    def _get_executor(self) -> Executor:
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._executor_pid != pid:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._executor_pid = pid
+            return self._executor
+
+
+def build_variants(image: PostImage, request: Any) -> List[Dict[str, Any]]:
+    # 직렬화용 변형본 목록 (요청이 있으면 절대 URL)
+    result = []
+    for variant in image.variants or []:
+        url = image.image_url.storage.url(variant["name"])
+        result.append(
+            {
+                "url": request.build_absolute_uri(url) if request is not None else url,
+                "width": variant["width"],
+                "height": variant["height"],
+                "format": variant["format"],
+            }
+        )
+    return result
+
+
+def build_srcset(variants: List[Dict[str, Any]]) -> Optional[str]:
+    # <img srcset> 값 (변형본이 아직 없으면 None)
+    if not variants:
+        return None
+    return ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants)
+
+
+image_variant_pipeline = ImageVariantPipeline()
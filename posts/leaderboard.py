@@ -0,0 +1,202 @@
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.models import OuterRef, QuerySet, Subquery
+
+from posts.models import Post, PostRanking
+
+LOCK_SCOPES_SQL = """
+SELECT pg_advisory_xact_lock(%s, hashtext(scope))
+FROM unnest(%s::text[]) AS scope
+ORDER BY scope
+"""
+
+
+class PostLeaderboard:
+    # 좋아요 TOP 게시글 랭킹 관리
+    # - 범위(전체 / 카테고리)별로 상위 LEADERBOARD_SIZE 개의 게시글만 post_rankings 에 유지
+    # - 좋아요 토글, 게시글 작성/삭제 시 해당 게시글만 증분 갱신
+    # - 조회는 랭킹 테이블 인덱스 순서대로 N개만 읽음 (posts 전체 정렬 없음)
+    # - 랭킹 테이블이 가득 차지 않은 경우 = 해당 범위의 모든 게시글이 포함된 상태
+    # - 조회는 쓰기를 하지 않음
+    #   배포 직후 등 랭킹이 구성되지 않은(비어 있는) 범위는 posts 부분 인덱스로 직접 조회
+    #   (rebuild_post_rankings 명령으로 재구성하면 랭킹 테이블 사용)
+    # - 범위별 추가 / 재구성은 advisory lock 으로 직렬화 (동시 추가로 LEADERBOARD_SIZE 초과 방지)
+    #   여러 범위는 이름 순으로 잠금 (ALL -> 카테고리)
+
+    LEADERBOARD_SIZE: int = 50
+    # pg_advisory_xact_lock(key1, key2) 의 key1 (key2 는 범위 이름 해시)
+    LOCK_NAMESPACE: int = 3001
+
+    @staticmethod
+    def scopes(post: Post) -> List[str]:
+        return [PostRanking.SCOPE_ALL, post.category]
+
+    @staticmethod
+    def is_ranked(post: Post) -> bool:
+        # 삭제 / 숨김 게시글은 랭킹에서 제외
+        return not post.is_deleted and post.status == Post.Status.ACTIVE
+
+    @classmethod
+    def get_top_post_ids(cls, category: Optional[str] = None, limit: int = 10) -> List[int]:
+        scope = category or PostRanking.SCOPE_ALL
+        limit = min(limit, cls.LEADERBOARD_SIZE)
+
+        post_ids = cls._ranked_post_ids(scope, limit)
+        if post_ids:
+            return post_ids
+        return list(cls._top_posts(scope).values_list("id", flat=True)[:limit])
+
+    @classmethod
+    def update(cls, post: Post, decreased: bool = False) -> None:
+        # 게시글의 좋아요 수 / 상태 변경을 랭킹에 반영
+        # 동시 좋아요 요청이 랭킹 행 잠금을 오래 잡지 않도록 트랜잭션으로 묶지 않음
+        # 좋아요 수는 post 의 값 대신 UPDATE 시점의 posts 값을 사용
+        # (동시 요청의 RETURNING 값이 순서가 바뀌어 기록되어도 마지막 갱신이 최신 값)
+        if not cls.is_ranked(post):
+            cls.remove(post)
+            return
+
+        scopes = cls.scopes(post)
+        # 이미 랭킹에 있는 범위는 한 번의 UPDATE 로 갱신
+        updated = PostRanking.objects.filter(post_id=post.id, scope__in=scopes).update(
+            like_count=Subquery(
+                Post.all_objects.filter(id=OuterRef("post_id")).order_by().values("like_count")
+            )
+        )
+        if updated == len(scopes):
+            ranked_scopes = set(scopes)
+        else:
+            ranked_scopes = set(
+                PostRanking.objects.filter(post_id=post.id, scope__in=scopes).values_list(
+                    "scope", flat=True
+                )
+            )
+
+        missing = [scope for scope in scopes if scope not in ranked_scopes]
+        if missing:
+            with transaction.atomic():
+                cls._lock_scopes(missing)
+                # 추가할 때도 잠금 후 현재 좋아요 수로 비교 / 기록
+                like_count = (
+                    Post.all_objects.filter(id=post.id).values_list("like_count", flat=True).first()
+                )
+                for scope in missing:
+                    cls._insert(scope, post, like_count or 0)
+
+        if decreased:
+            for scope in scopes:
+                if scope in ranked_scopes:
+                    cls._refill_if_last(scope, post)
+
+    @classmethod
+    @transaction.atomic
+    def remove(cls, post: Post, scopes: Optional[List[str]] = None) -> None:
+        # 랭킹에서 빠진 자리는 다음 순위 게시글로 채움
+        scopes = scopes or cls.scopes(post)
+        cls._lock_scopes(scopes)
+        for scope in scopes:
+            deleted, _ = PostRanking.objects.filter(scope=scope, post_id=post.id).delete()
+            if deleted:
+                cls._rebuild(scope)
+
+    @classmethod
+    @transaction.atomic
+    def remove_many(cls, post_ids: List[int]) -> None:
+        # 여러 게시글을 한 번의 DELETE 로 제거하고 빠진 범위만 한 번씩 재구성 (일괄 조치용)
+        scopes = set(
+            PostRanking.objects.filter(post_id__in=post_ids).values_list("scope", flat=True)
+        )
+        if not scopes:
+            return
+        cls._lock_scopes(list(scopes))
+        PostRanking.objects.filter(post_id__in=post_ids).delete()
+        for scope in sorted(scopes):
+            cls._rebuild(scope)
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, scope: str) -> None:
+        cls._lock_scopes([scope])
+        cls._rebuild(scope)
+
+    @classmethod
+    def _rebuild(cls, scope: str) -> None:
+        # 범위 전체 재구성: 공개 게시글 부분 인덱스(좋아요 순)로 상위 LEADERBOARD_SIZE 개만 조회
+        # (범위 잠금 후 호출)
+        top_posts = cls._top_posts(scope).values_list("id", "like_count", "created_at")[
+            : cls.LEADERBOARD_SIZE
+        ]
+
+        PostRanking.objects.filter(scope=scope).delete()
+        PostRanking.objects.bulk_create(
+            [
+                PostRanking(
+                    scope=scope, post_id=post_id, like_count=like_count, created_at=created_at
+                )
+                for post_id, like_count, created_at in top_posts
+            ],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def _top_posts(scope: str) -> QuerySet[Post]:
+        queryset = Post.objects.all()
+        if scope != PostRanking.SCOPE_ALL:
+            queryset = queryset.filter(category=scope)
+        return queryset.order_by("-like_count", "-created_at")
+
+    @classmethod
+    def _lock_scopes(cls, scopes: List[str]) -> None:
+        # 범위 이름 순으로 한 번에 잠금 (트랜잭션 종료 시 자동 해제)
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_SCOPES_SQL, [cls.LOCK_NAMESPACE, sorted(scopes)])
+
+    @staticmethod
+    def _ranked_post_ids(scope: str, limit: int) -> List[int]:
+        return list(
+            PostRanking.objects.filter(scope=scope)
+            .order_by("-like_count", "-created_at")
+            .values_list("post_id", flat=True)[:limit]
+        )
+
+    @classmethod
+    def _refill_if_last(cls, scope: str, post: Post) -> None:
+        # 랭킹 밖 게시글은 모두 최하위 점수 이하이므로
+        # 순위가 내려간 게시글이 최하위가 된 경우에만 밖의 게시글이 앞설 수 있음
+        rankings = PostRanking.objects.filter(scope=scope)
+        last = rankings.order_by("like_count", "created_at").values_list("post_id", flat=True)[:1]
+        if list(last) == [post.id] and rankings.count() >= cls.LEADERBOARD_SIZE:
+            cls.rebuild(scope)
+
+    @classmethod
+    def _insert(cls, scope: str, post: Post, like_count: int) -> None:
+        # 랭킹에 없는 게시글: 빈 자리가 있거나 최하위보다 앞서는 경우에만 추가 (범위 잠금 후 호출)
+        rankings = PostRanking.objects.filter(scope=scope)
+        size = rankings.count()
+        last = rankings.order_by("like_count", "created_at").first()
+        if (
+            size >= cls.LEADERBOARD_SIZE
+            and last is not None
+            and (like_count, post.created_at) <= (last.like_count, last.created_at)
+        ):
+            return
+
+        PostRanking.objects.bulk_create(
+            [
+                PostRanking(
+                    scope=scope,
+                    post_id=post.id,
+                    like_count=like_count,
+                    created_at=post.created_at,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        if size >= cls.LEADERBOARD_SIZE:
+            # 최하위 제거 (이전 버전에서 초과된 행이 남아 있어도 함께 정리)
+            rankings.filter(
+                id__in=rankings.order_by("-like_count", "-created_at").values("id")[
+                    cls.LEADERBOARD_SIZE :
+                ]
+            ).delete()
@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from posts.archive import SoftDeleteArchiver
+from posts.checks import purges_before_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "삭제된 지 일정 기간이 지난 게시글 / 댓글을 보관 테이블(posts_archive, comments_archive)로 "
+        "옮깁니다. (주기 실행용)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.SOFT_DELETE_ARCHIVE_DAYS,
+            help="삭제된 지 이 일수가 지난 행 보관",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="한 트랜잭션에서 옮길 행 수"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if purges_before_archive(settings.MEDIA_GC_DELETED_POST_DAYS, options["days"]):
+            raise CommandError(
+                f"--days 는 미디어 정리 기간({settings.MEDIA_GC_DELETED_POST_DAYS}일)보다 "
+                "작아야 합니다. (이미지 행이 먼저 삭제되어 보관 데이터에 경로가 남지 않음)"
+            )
+
+        archived = SoftDeleteArchiver.run(options["days"], options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"게시글 {archived['posts']}개, 댓글 {archived['comments']}개 보관 완료"
+            )
+        )
@@ -0,0 +1,155 @@
+import io
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, List
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import override_settings
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from posts.image_validation import ImageValidator
+from posts.models import Post
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "이미지 업로드 검증 시간(기존 DRF ImageField 순차 검증 / ImageValidator)과 "
+        "게시글 작성 요청 전체 지연 시간을 측정합니다. (임시 데이터 생성 후 삭제)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--images", type=int, default=ImageValidator.MAX_IMAGE_COUNT)
+        parser.add_argument(
+            "--size", type=int, default=ImageValidator.MAX_IMAGE_SIZE, help="이미지당 최대 바이트"
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 출력)")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with tempfile.TemporaryDirectory() as media_root:
+            # 5MB 업로드 파일은 실제 요청과 같이 디스크 임시 파일(TemporaryUploadedFile)로 받음
+            with override_settings(MEDIA_ROOT=media_root, FILE_UPLOAD_TEMP_DIR=media_root):
+                for image_format, content_type in [("JPEG", "image/jpeg"), ("PNG", "image/png")]:
+                    contents = [
+                        self.make_image(image_format, options["size"])
+                        for _ in range(options["images"])
+                    ]
+                    total_mib = sum(len(content) for content in contents) / 1024 / 1024
+                    self.stdout.write(
+                        f"\n{image_format} {len(contents)}개, 합계 {total_mib:.1f} MiB\n"
+                        f"{'stage':<24} {'median ms':>10} {'min ms':>8}"
+                    )
+                    self.bench_validation(contents, content_type, options["repeat"])
+                    self.bench_request(contents, content_type, options["repeat"])
+
+    def bench_validation(self, contents: List[bytes], content_type: str, repeat: int) -> None:
+        # 기존: 시리얼라이저의 ImageField 가 파일마다 순차로 Image.open().verify()
+        legacy_field = serializers.ListField(child=serializers.ImageField())
+        self.report(
+            "validate (DRF, 순차)",
+            legacy_field.run_validation,
+            lambda: self.uploads(contents, content_type),
+            repeat,
+        )
+        self.report(
+            "validate (헤더, 병렬)",
+            ImageValidator.validate,
+            lambda: self.uploads(contents, content_type),
+            repeat,
+        )
+
+    def bench_request(self, contents: List[bytes], content_type: str, repeat: int) -> None:
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        user = User.objects.create(
+            email=f"{prefix}@example.com",
+            name=prefix,
+            nickname=prefix,
+            phone="010-0000-0000",
+            role=User.Role.WORKSHOP,
+            workshop_name=prefix,
+        )
+        host = settings.ALLOWED_HOSTS[0].lstrip(".") if settings.ALLOWED_HOSTS else "localhost"
+        client = APIClient(SERVER_NAME=host)
+        client.force_authenticate(user)
+
+        def post(images: List[SimpleUploadedFile]) -> None:
+            response = client.post(
+                "/api/posts/create/",
+                {
+                    "title": prefix,
+                    "content": f"{prefix} 업로드 지연 시간 측정",
+                    "category": Post.Category.TOTAL,
+                    "images": images,
+                },
+                format="multipart",
+            )
+            if response.status_code != 201:
+                raise RuntimeError(f"게시글 작성 실패: {response.status_code} {response.content!r}")
+            # 저장 시 이동된 임시 업로드 파일 정리
+            for file in response.renderer_context["request"].FILES.getlist("images"):
+                file.close()
+
+        try:
+            # 변형본 생성은 측정에서 제외 (요청 지연과 무관한 백그라운드 작업)
+            with override_settings(POST_IMAGE_VARIANT_WORKERS=0):
+                self.report(
+                    "POST /api/posts/create/",
+                    post,
+                    lambda: [
+                        SimpleUploadedFile(
+                            f"{i}.{content_type.split('/')[1]}", content, content_type=content_type
+                        )
+                        for i, content in enumerate(contents)
+                    ],
+                    repeat,
+                )
+        finally:
+            # 임시 데이터 삭제 (게시글 / 이미지는 CASCADE)
+            User.objects.filter(email__startswith=prefix).delete()
+
+    def report(
+        self, name: str, func: Callable[[Any], Any], setup: Callable[[], Any], repeat: int
+    ) -> None:
+        # setup(업로드 파일 준비)은 측정에서 제외
+        timings = []
+        for _ in range(repeat):
+            files = setup()
+            started = time.perf_counter()
+            func(files)
+            timings.append((time.perf_counter() - started) * 1000)
+            for file in files:
+                file.close()
+        self.stdout.write(f"{name:<24} {statistics.median(timings):>10.1f} {min(timings):>8.1f}")
+
+    @staticmethod
+    def uploads(contents: List[bytes], content_type: str) -> List[TemporaryUploadedFile]:
+        extension = content_type.split("/")[1]
+        files = []
+        for i, content in enumerate(contents):
+            upload = TemporaryUploadedFile(f"{i}.{extension}", content_type, len(content), None)
+            upload.write(content)
+            upload.seek(0)
+            files.append(upload)
+        return files
+
+    @staticmethod
+    def make_image(image_format: str, max_size: int) -> bytes:
+        # 압축이 잘 되지 않는 노이즈 이미지로 max_size 에 가까운(이하) 이미지 생성
+        best = b""
+        side = 1024
+        for _ in range(6):
+            width, height = side, side * 3 // 4
+            image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+            buffer = io.BytesIO()
+            image.save(buffer, image_format, quality=85)
+            if len(best) < buffer.tell() <= max_size:
+                best = buffer.getvalue()
+            side = int(side * (max_size * 0.995 / buffer.tell()) ** 0.5)
+        return best
@@ -0,0 +1,86 @@
+import threading
+import time
+import uuid
+from typing import Any, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from posts.models import Post, PostLike
+from posts.services import PostService
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "한 게시글에 대한 동시 좋아요 토글 처리량을 측정합니다. (임시 데이터 생성 후 삭제)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--workers", type=int, default=100, help="동시 요청 수 (사용자 수)")
+        parser.add_argument("--rounds", type=int, default=20, help="사용자별 토글 횟수")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        workers = options["workers"]
+        rounds = options["rounds"]
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"{prefix}-{i}@example.com",
+                    name=prefix,
+                    nickname=f"{prefix}-{i}",
+                    phone="010-0000-0000",
+                    role=User.Role.WORKSHOP,
+                    workshop_name=prefix,
+                )
+                for i in range(workers)
+            ]
+        )
+        post = Post.objects.create(
+            user=users[0], title=prefix, content=prefix, category=Post.Category.TOTAL
+        )
+
+        try:
+            elapsed, errors = self.run_workers(post.id, users, rounds)
+            post.refresh_from_db()
+            actual = PostLike.objects.filter(post_id=post.id).count()
+
+            total = workers * rounds
+            self.stdout.write(f"workers={workers} rounds={rounds} toggles={total}")
+            self.stdout.write(f"elapsed={elapsed:.3f}s throughput={total / elapsed:.1f} toggles/s")
+            self.stdout.write(f"errors={len(errors)} like_count={post.like_count} likes={actual}")
+
+            if errors or post.like_count != actual:
+                self.stdout.write(self.style.ERROR("좋아요 수 불일치 또는 오류 발생"))
+            else:
+                self.stdout.write(self.style.SUCCESS("좋아요 수 일치"))
+        finally:
+            # 임시 데이터 삭제 (게시글 / 좋아요는 CASCADE)
+            User.objects.filter(email__startswith=prefix).delete()
+
+    def run_workers(self, post_id: int, users: List[User], rounds: int) -> tuple[float, list]:
+        barrier = threading.Barrier(len(users) + 1)
+        errors: list = []
+
+        def like(user_id: int) -> None:
+            try:
+                # 측정 전에 커넥션을 미리 연결
+                connection.ensure_connection()
+                barrier.wait()
+                for _ in range(rounds):
+                    PostService.toggle_like(post_id=post_id, user_id=user_id)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=like, args=(user.id,)) for user in users]
+        for thread in threads:
+            thread.start()
+
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+
+        return time.perf_counter() - started, errors
@@ -0,0 +1,187 @@
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.contrib.postgres.search import SearchRank
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.test.utils import CaptureQueriesContext
+
+from comments.models import Comment
+from posts import search
+from posts.leaderboard import PostLeaderboard
+from posts.models import Post, PostImage, PostRanking
+from posts.serializers import PostListSerializer
+from posts.services import PostService
+from users.models import User
+
+LIMIT = 10
+SEARCH_KEYWORD = "라탄"
+
+
+class Command(BaseCommand):
+    help = (
+        "목록 API 별로 한 페이지 조회 시 Postgres 에서 가져오는 바이트 수와 "
+        "Python 메모리 할당량을 기존 조회 방식과 비교합니다. (임시 데이터 생성 후 삭제)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--posts", type=int, default=100, help="임시 게시글 수")
+        parser.add_argument("--content-size", type=int, default=5000, help="게시글 본문 길이")
+        parser.add_argument("--images", type=int, default=5, help="게시글당 이미지 수")
+        parser.add_argument("--comments", type=int, default=20, help="게시글당 댓글 수")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        user = self.create_data(prefix, options)
+
+        try:
+            self.stdout.write(
+                f"{'endpoint':<12} {'variant':<8} {'queries':>7} {'db bytes':>10} "
+                f"{'peak KiB':>9} {'blocks':>8}"
+            )
+            for name, legacy, current in self.endpoints(user.id):
+                for variant, func in (("before", legacy), ("after", current)):
+                    queries, db_bytes, peak, blocks = self.measure(func)
+                    self.stdout.write(
+                        f"{name:<12} {variant:<8} {queries:>7} {db_bytes:>10} "
+                        f"{peak / 1024:>9.1f} {blocks:>8}"
+                    )
+        finally:
+            # 임시 데이터 삭제 (게시글 / 이미지 / 댓글은 CASCADE) 후 랭킹 재구성
+            User.objects.filter(email__startswith=prefix).delete()
+            for scope in [PostRanking.SCOPE_ALL, Post.Category.RATTAN]:
+                PostLeaderboard.rebuild(scope)
+
+    def create_data(self, prefix: str, options: Dict[str, Any]) -> User:
+        user = User.objects.create(
+            email=f"{prefix}@example.com",
+            name=prefix,
+            nickname=prefix,
+            phone="010-0000-0000",
+            role=User.Role.WORKSHOP,
+            workshop_name=prefix,
+        )
+        content = (f"{SEARCH_KEYWORD} 공예 " * options["content_size"])[: options["content_size"]]
+        posts = Post.objects.bulk_create(
+            [
+                Post(
+                    user=user,
+                    title=f"{SEARCH_KEYWORD} {prefix} {i}",
+                    content=content,
+                    category=Post.Category.RATTAN,
+                    like_count=i,
+                )
+                for i in range(options["posts"])
+            ]
+        )
+        PostImage.objects.bulk_create(
+            [
+                PostImage(post=post, image_url=f"posts/{prefix}-{post.id}-{i}.jpg")
+                for post in posts
+                for i in range(options["images"])
+            ]
+        )
+        Comment.objects.bulk_create(
+            [
+                Comment(post=post, user=user, content=content[:200])
+                for post in posts
+                for _ in range(options["comments"])
+            ]
+        )
+        for post in posts:
+            PostService.update_search_vector(post)
+        for scope in [PostRanking.SCOPE_ALL, Post.Category.RATTAN]:
+            PostLeaderboard.rebuild(scope)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE posts")
+        return user
+
+    def endpoints(self, user_id: int) -> List[Tuple[str, Callable[[], Any], Callable[[], Any]]]:
+        # (이름, 기존 조회 방식, 현재 조회 방식)
+        def legacy_queryset() -> Any:
+            return Post.objects.select_related("user").prefetch_related("images")
+
+        def legacy_top_liked() -> List[Post]:
+            post_ids = PostLeaderboard.get_top_post_ids(limit=10)
+            posts = legacy_queryset().filter(is_deleted=False).order_by().in_bulk(post_ids)
+            return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+        def legacy_search() -> List[Post]:
+            query = search.build_search_query(SEARCH_KEYWORD)
+            return list(
+                legacy_queryset()
+                .filter(is_deleted=False, search_vector=query)
+                .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+                .order_by("-rank", "-id")[: LIMIT + 1]
+            )
+
+        return [
+            (
+                "list",
+                lambda: list(
+                    legacy_queryset().filter(is_deleted=False).order_by("-id")[: LIMIT + 1]
+                ),
+                lambda: PostService.get_post_list(limit=LIMIT)[0],
+            ),
+            (
+                "category",
+                lambda: list(
+                    legacy_queryset()
+                    .filter(is_deleted=False, category=Post.Category.RATTAN)
+                    .order_by("-id")[: LIMIT + 1]
+                ),
+                lambda: PostService.get_post_list(category=Post.Category.RATTAN, limit=LIMIT)[0],
+            ),
+            (
+                "top_liked",
+                legacy_top_liked,
+                lambda: PostService.get_post_list(is_top_liked=True)[0],
+            ),
+            (
+                "user_posts",
+                lambda: list(
+                    Post.objects.select_related("user")
+                    .prefetch_related("images", "comments")
+                    .filter(user_id=user_id, is_deleted=False)
+                    .order_by("-id")[: LIMIT + 1]
+                ),
+                lambda: PostService.get_user_posts(user_id=user_id, limit=LIMIT)[0],
+            ),
+            (
+                "search",
+                legacy_search,
+                lambda: PostService.search_posts(search_keyword=SEARCH_KEYWORD, limit=LIMIT)[0],
+            ),
+        ]
+
+    def measure(self, func: Callable[[], Any]) -> Tuple[int, int, int, int]:
+        # 조회 + 목록 직렬화까지 한 페이지 처리 비용
+        # - db bytes: 실행된 SELECT 결과 행을 텍스트로 변환한 크기 합 (전송되는 값의 크기 근사)
+        # - peak / blocks: 처리 중 최대 메모리, 처리 후 남아 있는 할당 블록 수 (tracemalloc)
+        context = {"liked_post_ids": set(), "search_keyword": None}
+
+        with CaptureQueriesContext(connection) as captured:
+            tracemalloc.start()
+            try:
+                posts = func()
+                data = PostListSerializer(posts, many=True, context=context).data
+                _, peak = tracemalloc.get_traced_memory()
+                blocks = sum(
+                    stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+                )
+            finally:
+                tracemalloc.stop()
+
+        del posts, data
+        queries = [q["sql"] for q in captured.captured_queries if q["sql"].startswith("SELECT")]
+        return len(queries), sum(self.result_bytes(sql) for sql in queries), peak, blocks
+
+    @staticmethod
+    def result_bytes(sql: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(SUM(octet_length(t::text)), 0) FROM ({sql}) AS t")
+            return int(cursor.fetchone()[0])
@@ -0,0 +1,130 @@
+import time
+import uuid
+from typing import Any, Callable, List
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import RequestFactory
+
+from comments.fast_serializers import serialize_comments
+from comments.models import Comment
+from comments.serializers import CommentResponseSerializer
+from posts.fast_serializers import serialize_post_detail, serialize_post_list
+from posts.models import Post, PostImage
+from posts.serializers import PostDetailSerializer, PostListSerializer
+from posts.services import PostService
+from users.models import User
+
+PAGE_SIZES = (10, 50, 500)
+
+
+class Command(BaseCommand):
+    help = (
+        "게시글 목록 / 상세 / 댓글 직렬화 처리량(rows/s)을 DRF 시리얼라이저와 "
+        "빠른 직렬화로 비교합니다. (임시 데이터 생성 후 삭제)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--duration", type=float, default=0.5, help="측정 항목별 최소 실행 시간(초)"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        user = self.create_data(prefix, max(PAGE_SIZES))
+
+        # 이미지 URL 은 요청 호스트 기준 절대 경로로 직렬화
+        host = settings.ALLOWED_HOSTS[0].lstrip(".") if settings.ALLOWED_HOSTS else "localhost"
+        request = RequestFactory().get("/api/posts/", SERVER_NAME=host)
+        request.user = AnonymousUser()
+        context = {"request": request, "user_id": None, "liked_post_ids": set()}
+
+        try:
+            posts = list(PostService.get_list_queryset().filter(user=user).order_by("-id"))
+            details = [PostService.get_post_detail(post_id=post.id) for post in posts]
+            comments = list(
+                Comment.objects.select_related("user").filter(user=user).order_by("-id")
+            )
+
+            self.stdout.write(
+                f"{'serializer':<12} {'rows':>5} {'drf rows/s':>12} {'fast rows/s':>12} "
+                f"{'speedup':>8}"
+            )
+            for name, rows, drf, fast in [
+                (
+                    "post_list",
+                    posts,
+                    lambda page: PostListSerializer(page, many=True, context=context).data,
+                    lambda page: serialize_post_list(page, context),
+                ),
+                (
+                    "post_detail",
+                    details,
+                    lambda page: [PostDetailSerializer(p, context=context).data for p in page],
+                    lambda page: [serialize_post_detail(p, context) for p in page],
+                ),
+                (
+                    "comment",
+                    comments,
+                    lambda page: CommentResponseSerializer(page, many=True).data,
+                    serialize_comments,
+                ),
+            ]:
+                for size in PAGE_SIZES:
+                    page = rows[:size]
+                    drf_rate = self.rows_per_second(drf, page, options["duration"])
+                    fast_rate = self.rows_per_second(fast, page, options["duration"])
+                    self.stdout.write(
+                        f"{name:<12} {len(page):>5} {drf_rate:>12.0f} {fast_rate:>12.0f} "
+                        f"{fast_rate / drf_rate:>7.1f}x"
+                    )
+        finally:
+            # 임시 데이터 삭제 (게시글 / 이미지 / 댓글은 CASCADE)
+            User.objects.filter(email__startswith=prefix).delete()
+
+    def create_data(self, prefix: str, count: int) -> User:
+        user = User.objects.create(
+            email=f"{prefix}@example.com",
+            name=prefix,
+            nickname=prefix,
+            phone="010-0000-0000",
+            role=User.Role.WORKSHOP,
+            workshop_name=prefix,
+        )
+        posts = Post.objects.bulk_create(
+            [
+                Post(
+                    user=user,
+                    title=f"{prefix} {i}",
+                    content=f"{prefix} 본문 " * 50,
+                    category=Post.Category.TOTAL,
+                )
+                for i in range(count)
+            ]
+        )
+        PostImage.objects.bulk_create(
+            [PostImage(post=post, image_url=f"posts/{prefix}-{post.id}.jpg") for post in posts]
+        )
+        # 게시글마다 상세 첫 페이지 분량의 댓글
+        Comment.objects.bulk_create(
+            [
+                Comment(post=post, user=user, content=f"{prefix} 댓글 {i}")
+                for post in posts
+                for i in range(PostService.DETAIL_COMMENT_LIMIT)
+            ]
+        )
+        return user
+
+    @staticmethod
+    def rows_per_second(
+        serialize: Callable[[List[Any]], Any], page: List[Any], duration: float
+    ) -> float:
+        rows = 0
+        started = time.perf_counter()
+        while True:
+            serialize(page)
+            rows += len(page)
+            elapsed = time.perf_counter() - started
+            if elapsed >= duration:
+                return rows / elapsed
@@ -0,0 +1,67 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from posts.checks import purges_before_archive
+from posts.media_gc import MediaGarbageCollector
+
+
+class Command(BaseCommand):
+    help = (
+        "게시글 / 업로드 세션에서 참조하지 않는 미디어 파일과 만료된 이어 올리기 세션, "
+        "오래전에 삭제된 게시글의 이미지를 정리합니다. (주기 실행용)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--grace-period",
+            type=int,
+            default=settings.MEDIA_GC_GRACE_PERIOD,
+            help="수정된 지 이 시간(초)이 지나지 않은 파일은 유지",
+        )
+        parser.add_argument(
+            "--upload-expiry",
+            type=int,
+            default=settings.MEDIA_GC_UPLOAD_EXPIRY,
+            help="변경 없이 이 시간(초)이 지난 이어 올리기 세션 삭제",
+        )
+        parser.add_argument(
+            "--deleted-post-days",
+            type=int,
+            default=settings.MEDIA_GC_DELETED_POST_DAYS,
+            help="삭제된 지 이 일수가 지난 게시글의 이미지 삭제 (음수면 유지)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="참조 여부를 한 번에 조회할 파일 수"
+        )
+        parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 삭제 대상만 집계")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if purges_before_archive(options["deleted_post_days"], settings.SOFT_DELETE_ARCHIVE_DAYS):
+            raise CommandError(
+                f"--deleted-post-days 는 보관 기간({settings.SOFT_DELETE_ARCHIVE_DAYS}일)보다 "
+                "커야 합니다. (음수면 삭제된 게시글의 이미지 유지)"
+            )
+
+        stats = MediaGarbageCollector(
+            grace_period=options["grace_period"],
+            upload_expiry=options["upload_expiry"],
+            deleted_post_days=options["deleted_post_days"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        ).run()
+
+        prefix = "[dry-run] 삭제 대상 " if options["dry_run"] else "삭제 "
+        self.stdout.write(
+            f"파일 {stats.get('scanned', 0)}개 확인 "
+            f"(참조 {stats.get('referenced', 0)}개, 유예 기간 {stats.get('recent', 0)}개)"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}파일 {stats.get('deleted', 0)}개 "
+                f"({stats.get('deleted_bytes', 0) / 1024 / 1024:.1f} MiB), "
+                f"만료 업로드 세션 {stats.get('expired_uploads', 0)}개, "
+                f"삭제된 게시글 이미지 {stats.get('purged_images', 0)}개"
+            )
+        )
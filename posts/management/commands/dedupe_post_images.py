@@ -0,0 +1,164 @@
+import hashlib
+import os
+import shutil
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import F
+
+from posts.blobs import ImageBlobService
+from posts.image_processing import variant_suffix
+from posts.image_validation import ImageValidator
+from posts.models import Post, PostImage
+from posts.storage import HASHED_NAME_RE, ContentHashStorage, get_post_image_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "기존 경로(posts/%Y/%m/%d/...)의 게시글 이미지를 내용 해시 경로로 옮기고 "
+        "같은 내용의 파일을 하나로 합칩니다. (변형본 포함, 참조 수 재계산)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=200, help="한 번에 조회할 이미지 수")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="파일 / DB 를 변경하지 않고 결과만 출력"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.storage = get_post_image_storage()
+        self.dry_run = options["dry_run"]
+        # dry-run 은 파일을 옮기지 않으므로 이번 실행에서 본 해시로 중복 판별
+        self.seen: Set[str] = set()
+        self.totals = {"files": 0, "duplicates": 0, "missing": 0, "reclaimed": 0}
+
+        for batch in self.batches(options["batch_size"]):
+            groups: Dict[str, List[PostImage]] = {}
+            for image in batch:
+                groups.setdefault(image.image_url.name, []).append(image)
+            for name, images in groups.items():
+                self.migrate(name, images)
+
+        if not self.dry_run:
+            ImageBlobService.recount()
+
+        totals = self.totals
+        prefix = "[dry-run] " if self.dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}파일 {totals['files']}개 처리, 중복 {totals['duplicates']}개, "
+                f"누락 {totals['missing']}개, 확보 용량 {totals['reclaimed'] / 1024 / 1024:.1f} MiB"
+            )
+        )
+        if not self.dry_run:
+            stats = ImageBlobService.stats()
+            self.stdout.write(
+                f"저장 파일 {stats['blobs']}개 / 참조 {stats['references']}개, "
+                f"실제 {stats['physical_bytes'] / 1024 / 1024:.1f} MiB "
+                f"(중복 저장 시 {stats['logical_bytes'] / 1024 / 1024:.1f} MiB)"
+            )
+
+    def migrate(self, name: str, images: List[PostImage]) -> None:
+        path = self.storage.path(name)
+        if not os.path.exists(path):
+            self.totals["missing"] += 1
+            self.stderr.write(f"PostImage {images[0].id} ({name}): 파일 없음")
+            return
+
+        root, extension = os.path.splitext(name)
+        digest, extension = self.hash_file(path, extension.lower())
+        new_name = ContentHashStorage.hashed_name("posts", digest, extension)
+        new_root = os.path.splitext(new_name)[0]
+        duplicate = digest in self.seen or self.storage.exists(new_name)
+        self.seen.add(digest)
+        self.totals["files"] += 1
+        if duplicate:
+            self.totals["duplicates"] += 1
+
+        # 원본 + 변형본 (기존 이름 => 새 이름)
+        moves = {name: new_name}
+        for image in images:
+            for variant in image.variants:
+                suffix = variant_suffix(variant["width"])
+                moves[root + suffix] = new_root + suffix
+
+        reclaimed = sum(
+            os.path.getsize(self.storage.path(old))
+            for old, new in moves.items()
+            if self.storage.exists(old)
+            and (self.storage.exists(new) or (old == name and duplicate))
+        )
+        self.totals["reclaimed"] += reclaimed
+        if self.dry_run:
+            return
+
+        # 새 경로에 먼저 만든 뒤 DB 변경, 커밋 후 기존 파일 삭제
+        # (중간에 중단되어도 DB 가 가리키는 파일은 항상 존재, 남은 기존 파일은 정리 작업에서 삭제)
+        for old, new in moves.items():
+            if self.storage.exists(old) and not self.storage.exists(new):
+                self.link(self.storage.path(old), self.storage.path(new))
+
+        with transaction.atomic():
+            rows = list(PostImage.objects.select_for_update().filter(image_url=name))
+            for image in rows:
+                image.image_url.name = new_name
+                image.variants = [
+                    {**variant, "name": new_root + variant_suffix(variant["width"])}
+                    for variant in image.variants
+                ]
+            PostImage.objects.bulk_update(rows, ["image_url", "variants"])
+            # 상세 응답 캐시의 이미지 URL 갱신
+            Post.all_objects.filter(id__in={image.post_id for image in rows}).update(
+                version=F("version") + 1
+            )
+            transaction.on_commit(lambda: self.remove(list(moves)))
+
+    def remove(self, names: List[str]) -> None:
+        # 다른 게시글 이미지가 아직 기존 경로를 쓰고 있으면 남겨 둠
+        if PostImage.objects.filter(image_url=names[0]).exists():
+            return
+        for name in names:
+            self.storage.delete(name)
+
+    def batches(self, batch_size: int) -> Iterator[List[PostImage]]:
+        # 내용 해시 경로가 아닌 이미지만 id 순 키셋 페이지네이션
+        queryset = (
+            PostImage.objects.exclude(image_url__regex=HASHED_NAME_RE.pattern)
+            .only("id", "post_id", "image_url", "variants")
+            .order_by("id")
+        )
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+
+    @staticmethod
+    def hash_file(path: str, extension: str) -> Tuple[str, str]:
+        # (sha256, 확장자) - 새 업로드와 같은 이름이 되도록 확장자는 파일 시그니처 기준 (.jpeg => .jpg)
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            head = f.read(ImageValidator.SIGNATURE_SIZE)
+            digest.update(head)
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        matched = next((s for s in ImageValidator.SIGNATURES if head.startswith(s[0])), None)
+        return digest.hexdigest(), matched[3] if matched else extension
+
+    @staticmethod
+    def link(source: str, target: str) -> None:
+        # 같은 파일 시스템이면 하드 링크(복사 없음), 아니면 임시 파일로 복사 후 rename
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            temp_path = f"{target}.tmp"
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+        os.chmod(target, 0o644)
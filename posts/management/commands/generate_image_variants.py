@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from posts.image_processing import render_variants
+from posts.image_variants import ImageVariantPipeline, image_variant_pipeline
+from posts.models import PostImage
+
+
+class Command(BaseCommand):
+    help = (
+        "변형본(리사이즈 / WebP)이 없는 게시글 이미지의 변형본을 생성합니다. "
+        "(기존 이미지 백필 / 백그라운드 작업 누락분 재생성)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="변형본 생성 프로세스 수 (0 이면 현재 프로세스에서 처리)",
+        )
+        parser.add_argument("--batch-size", type=int, default=100, help="한 번에 조회할 이미지 수")
+        parser.add_argument(
+            "--all", action="store_true", help="변형본이 이미 있는 이미지도 다시 생성"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        widths = image_variant_pipeline.widths
+        quality = image_variant_pipeline.quality
+        generated = failed = 0
+
+        executor = None
+        if options["workers"] > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=options["workers"], mp_context=multiprocessing.get_context("spawn")
+            )
+
+        try:
+            for batch in self.batches(options["batch_size"], options["all"]):
+                jobs = [(image.image_url.path, widths, quality) for image in batch]
+                if executor is not None:
+                    futures = [executor.submit(render_variants, *job) for job in jobs]
+                    outcomes = [self.outcome(future.result) for future in futures]
+                else:
+                    outcomes = [self.outcome(lambda job=job: render_variants(*job)) for job in jobs]
+
+                for image, (result, error) in zip(batch, outcomes):
+                    if error is not None:
+                        failed += 1
+                        self.stderr.write(f"PostImage {image.id} ({image.image_url.name}): {error}")
+                        continue
+                    ImageVariantPipeline.save_result(
+                        image.id, image.post_id, image.image_url.name, result
+                    )
+                    generated += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"변형본 생성 {generated}개, 실패 {failed}개"))
+
+    @staticmethod
+    def batches(batch_size: int, regenerate: bool) -> Iterator[List[PostImage]]:
+        # id 순 키셋 페이지네이션 (전체 이미지를 한 번에 메모리에 올리지 않음)
+        queryset = PostImage.objects.only("id", "post_id", "image_url").order_by("id")
+        if not regenerate:
+            queryset = queryset.filter(variants=[])
+
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+
+    @staticmethod
+    def outcome(func: Any) -> Tuple[Dict[str, Any], Any]:
+        # (결과, 오류) - 파일 누락 / 손상 이미지는 건너뛰고 계속 진행
+        try:
+            return func(), None
+        except Exception as e:
+            return {}, e
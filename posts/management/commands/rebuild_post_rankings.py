@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from posts.leaderboard import PostLeaderboard
+from posts.models import Post, PostRanking
+
+
+class Command(BaseCommand):
+    help = "좋아요 TOP 게시글 랭킹(post_rankings)을 재구성합니다."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scope",
+            action="append",
+            help="재구성할 범위 (ALL 또는 카테고리). 지정하지 않으면 전체 범위",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        scopes = options["scope"] or [PostRanking.SCOPE_ALL] + [
+            category for category, _ in Post.Category.choices
+        ]
+
+        for scope in scopes:
+            PostLeaderboard.rebuild(scope)
+            self.stdout.write(f"{scope} 랭킹 재구성 완료")
+
+        self.stdout.write(self.style.SUCCESS("랭킹 재구성 완료"))
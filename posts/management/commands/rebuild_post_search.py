@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from posts import search
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 문서(search_vector)를 일괄 재생성합니다."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="배치 크기")
+        parser.add_argument(
+            "--only-missing", action="store_true", help="검색 문서가 없는 게시글만 처리"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+        queryset = Post.all_objects.order_by("id")
+        if options["only_missing"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        # id 기준 키셋 순회로 메모리 사용량을 배치 크기로 제한
+        last_id = 0
+        total = 0
+        while True:
+            rows = list(
+                queryset.filter(id__gt=last_id).values_list("id", "title", "content")[:batch_size]
+            )
+            if not rows:
+                break
+
+            with transaction.atomic():
+                for post_id, title, content in rows:
+                    Post.all_objects.filter(id=post_id).update(
+                        search_vector=search.build_search_vector(title, content)
+                    )
+
+            last_id = rows[-1][0]
+            total += len(rows)
+            self.stdout.write(f"{total}개 처리 (마지막 id: {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"검색 문서 재생성 완료: {total}개"))
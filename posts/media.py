@@ -0,0 +1,53 @@
+import re
+from typing import Any, List
+
+from django.http import HttpRequest
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from posts.models import PostImage
+
+# 변형본 이름의 접미사 (<원본 이름에서 확장자 제외>.<너비>w.webp)
+VARIANT_SUFFIX_RE = re.compile(r"\.\d+w\.webp$")
+# 변형본에서 원본 이름을 찾을 때 확인할 확장자
+ORIGINAL_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif")
+
+
+def get_media_user(request: HttpRequest) -> Any:
+    # 세션 로그인(관리자 페이지) 또는 Authorization 헤더의 JWT 사용자
+    if request.user.is_authenticated:
+        return request.user
+    try:
+        result = JWTAuthentication().authenticate(Request(request))
+    except Exception:
+        return request.user
+    return result[0] if result else request.user
+
+
+def get_original_names(name: str) -> List[str]:
+    root, count = VARIANT_SUFFIX_RE.subn("", name)
+    if not count:
+        return [name]
+    return [root + extension for extension in ORIGINAL_EXTENSIONS]
+
+
+def can_access_post_media(request: HttpRequest, name: str) -> bool:
+    # MEDIA_ACCESS_CHECK 용 접근 확인
+    # - 삭제된 게시글의 이미지(원본 / 변형본)는 작성자와 관리자만 조회
+    # - 같은 내용의 파일을 삭제되지 않은 게시글이 함께 쓰고 있으면 누구나 조회
+    # - 게시글에 연결되지 않은 파일(완료된 업로드 등)은 추측할 수 없는 해시 경로이므로 허용
+    if not name.startswith("posts/"):
+        return True
+
+    owners = list(
+        PostImage.objects.filter(image_url__in=get_original_names(name)).values_list(
+            "post__is_deleted", "post__user_id"
+        )
+    )
+    if not owners or any(not is_deleted for is_deleted, _ in owners):
+        return True
+
+    user = get_media_user(request)
+    if not user.is_authenticated:
+        return False
+    return user.is_staff or any(user_id == user.id for _, user_id in owners)
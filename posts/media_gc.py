@@ -0,0 +1,205 @@
+import datetime
+import os
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Set
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from posts.blobs import ImageBlobService
+from posts.media import get_original_names
+from posts.models import ImageBlob, PostImage, PostImageUpload
+from posts.uploads import ImageUploadService
+
+# 업로드 세션 파일 이름 (<세션 id>.part)
+PART_SUFFIX = ".part"
+
+
+class MediaFile(NamedTuple):
+    name: str  # MEDIA_ROOT 기준 경로 (/ 구분)
+    path: str
+    size: int
+    mtime: float
+
+
+class MediaGarbageCollector:
+    # 참조되지 않는 미디어 파일 정리
+    # 1. 변경 없이 UPLOAD_EXPIRY 가 지난 이어 올리기 세션 삭제 (완료 후 게시글에 연결되지 않은 세션 포함)
+    # 2. 삭제된 지 DELETED_POST_DAYS 가 지난 게시글의 이미지 행 삭제 (공유 파일 참조 수 감소)
+    # 3. MEDIA_ROOT/posts, MEDIA_ROOT/uploads 를 os.scandir 로 순회하면서 batch_size 개씩
+    #    post_images / post_image_uploads 에서 참조 여부를 조회하고 참조가 없는 파일 삭제
+    #    => 파일 / 행 목록 전체를 메모리에 올리지 않으므로 파일 수와 관계없이 메모리 일정
+    # - 수정된 지 GRACE_PERIOD 가 지나지 않은 파일은 유지
+    #   (저장 후 커밋 전인 파일, 같은 내용이 다시 업로드되어 수정 시각이 갱신된 파일)
+    # - 변형본(<원본>.<너비>w.webp)은 원본이 참조되는 동안 유지
+    # - dry_run 이면 삭제 없이 같은 기준으로 집계만 함
+
+    SCAN_DIRS = ("posts", ImageUploadService.UPLOAD_DIR)
+
+    def __init__(
+        self,
+        grace_period: int,
+        upload_expiry: int,
+        deleted_post_days: int = -1,
+        batch_size: int = 1000,
+        dry_run: bool = False,
+    ) -> None:
+        self.root = os.path.abspath(settings.MEDIA_ROOT)
+        self.file_cutoff = time.time() - grace_period
+        self.upload_cutoff = timezone.now() - datetime.timedelta(seconds=upload_expiry)
+        # 음수면 삭제된 게시글의 이미지 유지
+        self.deleted_post_cutoff = (
+            timezone.now() - datetime.timedelta(days=deleted_post_days)
+            if deleted_post_days >= 0
+            else None
+        )
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.stats: Counter[str] = Counter()
+
+    def run(self) -> Dict[str, int]:
+        self.expire_uploads()
+        self.purge_deleted_post_images()
+
+        batch: List[MediaFile] = []
+        for file in self.scan():
+            self.stats["scanned"] += 1
+            if file.mtime >= self.file_cutoff:
+                self.stats["recent"] += 1
+                continue
+            batch.append(file)
+            if len(batch) >= self.batch_size:
+                self.collect(batch)
+                batch = []
+        if batch:
+            self.collect(batch)
+        return dict(self.stats)
+
+    def live_uploads(self) -> QuerySet[PostImageUpload]:
+        return PostImageUpload.objects.filter(updated_at__gte=self.upload_cutoff)
+
+    def live_images(self) -> QuerySet[PostImage]:
+        if self.deleted_post_cutoff is None:
+            return PostImage.objects.all()
+        return PostImage.objects.exclude(
+            post__is_deleted=True, post__updated_at__lt=self.deleted_post_cutoff
+        )
+
+    def expire_uploads(self) -> None:
+        expired = PostImageUpload.objects.filter(updated_at__lt=self.upload_cutoff)
+        self.stats["expired_uploads"] += self.delete_in_batches(
+            expired, lambda ids: PostImageUpload.objects.filter(id__in=ids).delete()[0]
+        )
+
+    def purge_deleted_post_images(self) -> None:
+        if self.deleted_post_cutoff is None:
+            return
+        images = PostImage.objects.filter(
+            post__is_deleted=True, post__updated_at__lt=self.deleted_post_cutoff
+        )
+        self.stats["purged_images"] += self.delete_in_batches(
+            images,
+            lambda ids: ImageBlobService.release_images(PostImage.objects.filter(id__in=ids)),
+        )
+
+    def delete_in_batches(self, queryset: QuerySet, delete: Callable[[List[Any]], int]) -> int:
+        if self.dry_run:
+            return queryset.count()
+
+        deleted = 0
+        while True:
+            ids = list(queryset.values_list("id", flat=True)[: self.batch_size])
+            if not ids:
+                return deleted
+            deleted += delete(ids)
+
+    def scan(self) -> Iterator[MediaFile]:
+        # 디렉터리를 하나씩 읽으면서 파일을 바로 반환 (전체 목록을 만들지 않음)
+        stack = [os.path.join(self.root, directory) for directory in self.SCAN_DIRS]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        name = os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+                        yield MediaFile(name, entry.path, stat.st_size, stat.st_mtime)
+
+    def collect(self, batch: List[MediaFile]) -> None:
+        referenced = self.referenced_names(batch)
+        orphans = [file for file in batch if file.name not in referenced]
+        self.stats["referenced"] += len(batch) - len(orphans)
+
+        deleted = []
+        for file in orphans:
+            if not self.dry_run and not self.remove(file):
+                continue
+            deleted.append(file.name)
+            self.stats["deleted"] += 1
+            self.stats["deleted_bytes"] += file.size
+
+        if deleted and not self.dry_run:
+            ImageBlob.objects.filter(name__in=deleted).delete()
+
+    def referenced_names(self, batch: List[MediaFile]) -> Set[str]:
+        # 배치의 파일 중 참조되는 파일 이름 (테이블별 쿼리 1번씩)
+        candidates: Dict[str, List[str]] = {}
+        session_ids: Dict[str, str] = {}
+        for file in batch:
+            directory, _, basename = file.name.rpartition("/")
+            if basename.startswith("."):
+                # 저장 중 남은 임시 파일
+                continue
+            if directory == ImageUploadService.UPLOAD_DIR:
+                if basename.endswith(PART_SUFFIX):
+                    session_ids[basename[: -len(PART_SUFFIX)]] = file.name
+                continue
+            candidates[file.name] = get_original_names(file.name)
+
+        names = {name for originals in candidates.values() for name in originals}
+        used = set(
+            self.live_images().filter(image_url__in=names).values_list("image_url", flat=True)
+        )
+        used.update(
+            self.live_uploads().filter(image_name__in=names).values_list("image_name", flat=True)
+        )
+
+        referenced = {
+            name for name, originals in candidates.items() if any(o in used for o in originals)
+        }
+        if session_ids:
+            live_sessions = self.live_uploads().filter(
+                id__in=[i for i in session_ids if self.is_uuid(i)]
+            )
+            referenced.update(
+                session_ids[str(upload_id)]
+                for upload_id in live_sessions.values_list("id", flat=True)
+            )
+        return referenced
+
+    def remove(self, file: MediaFile) -> bool:
+        # 조회 이후 같은 내용이 다시 업로드되어 수정 시각이 갱신된 파일은 유지
+        try:
+            if os.stat(file.path).st_mtime >= self.file_cutoff:
+                self.stats["recent"] += 1
+                return False
+            os.remove(file.path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def is_uuid(value: str) -> bool:
+        try:
+            uuid.UUID(value)
+        except ValueError:
+            return False
+        return True
@@ -1,8 +1,17 @@
+import uuid
+
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from config.managers import SoftDeleteManager
+from posts.storage import get_post_image_storage
 from users.models import User
 
+# 공개 게시글 조건 (삭제 / 숨김 제외) - Post.objects 조건이자 부분 인덱스 조건
+LIVE_POST_CONDITION = models.Q(is_deleted=False, status="ACTIVE")
+
 
 class Post(models.Model):
     # 공방 사장만 작성 가능
@@ -59,6 +68,15 @@ class Post(models.Model):
     is_deleted = models.BooleanField(default=False, help_text="삭제 여부 (True인 경우 삭제)")
     created_at = models.DateTimeField(auto_now_add=True, help_text="작성일시")
     updated_at = models.DateTimeField(auto_now=True, help_text="수정일시")
+    # 상세 응답 캐시 버전. 게시글 수정/삭제, 좋아요, 댓글 작성/수정/삭제 시 증가
+    version = models.PositiveIntegerField(default=0, help_text="캐시 버전")
+    # 제목(A) / 본문(B) n-gram 검색 문서. PostService 에서 작성/수정 시 갱신
+    search_vector = SearchVectorField(null=True, editable=False, help_text="검색 문서")
+
+    # 삭제 / 숨김 게시글 포함 조회는 all_objects
+    LIVE_CONDITION = LIVE_POST_CONDITION
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
 
     class Meta:
         db_table = "posts"
@@ -68,8 +86,40 @@ class Post(models.Model):
             models.Index(fields=["category"], name="idx_post_category"),
             # 시간 순 정렬 최적화
             models.Index(fields=["created_at"], name="idx_post_created_at"),
-            # 삭제되지 않은 게시글 조회 최적화
-            models.Index(fields=["is_deleted"], name="idx_post_is_deleted"),
+            # 공개 게시글 목록 (최신순 커서 페이지네이션)
+            models.Index(fields=["-id"], name="idx_post_live_id", condition=LIVE_POST_CONDITION),
+            # 공개 게시글 카테고리별 목록
+            models.Index(
+                fields=["category", "-id"],
+                name="idx_post_live_category_id",
+                condition=LIVE_POST_CONDITION,
+            ),
+            # 공개 게시글 작성자별 목록 (마이페이지)
+            models.Index(
+                fields=["user", "-id"],
+                name="idx_post_live_user_id",
+                condition=LIVE_POST_CONDITION,
+            ),
+            # 공개 게시글 좋아요 TOP 조회
+            models.Index(
+                fields=["-like_count", "-created_at"],
+                name="idx_post_live_like_count",
+                condition=LIVE_POST_CONDITION,
+            ),
+            # 공개 게시글 카테고리별 좋아요 TOP 조회 (랭킹 재구성)
+            models.Index(
+                fields=["category", "-like_count", "-created_at"],
+                name="idx_post_live_category_like",
+                condition=LIVE_POST_CONDITION,
+            ),
+            # 제목 / 본문 전문 검색 최적화
+            GinIndex(fields=["search_vector"], name="idx_post_search_vector"),
+            # 보관 대상(삭제 후 일정 기간 지난 게시글) 조회
+            models.Index(
+                fields=["updated_at"],
+                name="idx_post_deleted_updated",
+                condition=models.Q(is_deleted=True),
+            ),
         ]
         # constraints = [
         #     # unique_together 대신 UniqueConstraint 사용
@@ -86,7 +136,8 @@ class Post(models.Model):
         self.is_deleted = True
         self.status = self.Status.DELETED  # status도 DELETED로 변경
 
-        self.save(using=using)
+        # 삭제 상태만 저장 (카운터 / 버전은 동시에 갱신될 수 있으므로 덮어쓰지 않음)
+        self.save(using=using, update_fields=["is_deleted", "status", "updated_at"])
 
         # 원래 delete 메서드의 반환 형식을 맞추기 위해
         # (삭제된 객체 수, {모델명: 삭제된 객체수})의 형태로 반환
@@ -100,17 +151,96 @@ class PostImage(models.Model):
     post = models.ForeignKey(
         Post, on_delete=models.CASCADE, related_name="images", help_text="연결된 게시글"
     )
+    # 내용 해시 경로(posts/<해시 앞 2자리>/<해시>.<확장자>)로 저장 (posts.storage.ContentHashStorage)
     image_url = models.ImageField(
-        upload_to="posts/%Y/%m/%d/",
+        upload_to="posts/",
+        storage=get_post_image_storage,
         null=False,
         blank=False,
         help_text="이미지 파일",
     )
+    # 원본 크기 / 변형본 목록은 업로드 후 백그라운드 작업(ImageVariantPipeline)에서 기록
+    width = models.PositiveIntegerField(null=True, blank=True, help_text="원본 너비(px)")
+    height = models.PositiveIntegerField(null=True, blank=True, help_text="원본 높이(px)")
+    variants = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="리사이즈 변형본 목록 [{name, width, height, format}] (너비 오름차순)",
+    )
     created_at = models.DateTimeField(auto_now_add=True, help_text="업로드 일시")
 
     class Meta:
         db_table = "post_images"
-        indexes = [models.Index(fields=["post"], name="idx_postimage_post")]
+        indexes = [
+            models.Index(fields=["post"], name="idx_postimage_post"),
+            # 파일 경로로 게시글 조회 (미디어 접근 확인)
+            models.Index(fields=["image_url"], name="idx_postimage_image_url"),
+        ]
+
+
+class ImageBlob(models.Model):
+    # 내용 해시 경로로 한 번만 저장되는 이미지 파일 (posts.storage.ContentHashStorage)
+    # - ref_count: 이 파일을 가리키는 PostImage 수 (ImageBlobService 에서 증감)
+    # - ref_count 가 0 이 된 파일은 바로 지우지 않고 정리 작업에서 유예 기간 후 삭제
+    #   (삭제 직전 post_images 를 다시 확인하므로 카운터가 어긋나도 참조 중인 파일은 지우지 않음)
+
+    name = models.CharField(max_length=255, unique=True, help_text="저장 경로 (MEDIA_ROOT 기준)")
+    sha256 = models.CharField(max_length=64, help_text="내용 해시")
+    size = models.PositiveBigIntegerField(default=0, help_text="파일 크기(바이트)")
+    ref_count = models.PositiveIntegerField(default=0, help_text="참조하는 게시글 이미지 수")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="최초 저장 일시")
+    updated_at = models.DateTimeField(auto_now=True, help_text="참조 수 변경 일시")
+
+    class Meta:
+        db_table = "image_blobs"
+        indexes = [
+            models.Index(fields=["sha256"], name="idx_imageblob_sha256"),
+            # 참조가 없는 파일 정리
+            models.Index(
+                fields=["updated_at"],
+                name="idx_imageblob_unreferenced",
+                condition=models.Q(ref_count=0),
+            ),
+        ]
+
+
+class PostImageUpload(models.Model):
+    # 이어 올리기 가능한 이미지 업로드 세션
+    # - 세션 생성 후 청크를 offset 순서대로 PUT, 모두 받으면 complete 로 검증 후 저장
+    # - 완료된 업로드는 게시글 작성 / 수정 시 upload id 로 참조하며, 참조되면 세션 삭제
+
+    class Status(models.TextChoices):
+        UPLOADING = "UPLOADING", "업로드 중"
+        COMPLETED = "COMPLETED", "업로드 완료"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="post_image_uploads",
+        help_text="업로드한 사용자",
+    )
+    filename = models.CharField(max_length=255, help_text="원본 파일 이름")
+    size = models.PositiveBigIntegerField(help_text="전체 파일 크기(바이트)")
+    offset = models.PositiveBigIntegerField(default=0, help_text="지금까지 받은 크기(바이트)")
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.UPLOADING, help_text="업로드 상태"
+    )
+    image_name = models.CharField(
+        max_length=255, blank=True, help_text="완료 후 저장된 이미지 경로 (MEDIA_ROOT 기준)"
+    )
+    width = models.PositiveIntegerField(null=True, blank=True, help_text="이미지 너비(px)")
+    height = models.PositiveIntegerField(null=True, blank=True, help_text="이미지 높이(px)")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="세션 생성 일시")
+    updated_at = models.DateTimeField(auto_now=True, help_text="마지막 청크 수신 일시")
+
+    class Meta:
+        db_table = "post_image_uploads"
+        indexes = [
+            models.Index(fields=["user"], name="idx_postimageupload_user"),
+            # 오래된 세션 정리
+            models.Index(fields=["updated_at"], name="idx_postimageupload_updated"),
+        ]
 
 
 class PostLike(models.Model):
@@ -142,3 +272,91 @@ class PostLike(models.Model):
             # 사용자별 좋아요 조회 최적화
             models.Index(fields=["user"], name="idx_postlike_user")
         ]
+
+
+class PostRanking(models.Model):
+    # 좋아요 TOP 게시글 랭킹 (전체 / 카테고리별 상위 N개만 유지)
+    # 좋아요 토글, 게시글 작성/삭제 시 PostLeaderboard 에서 갱신
+
+    # 전체 랭킹의 scope 값 (카테고리별 랭킹은 카테고리 값을 scope 로 사용)
+    SCOPE_ALL = "ALL"
+
+    scope = models.CharField(max_length=100, help_text="랭킹 범위 (ALL 또는 카테고리)")
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="rankings",
+        help_text="랭킹에 포함된 게시글",
+    )
+    like_count = models.PositiveIntegerField(default=0, help_text="좋아요 수")
+    created_at = models.DateTimeField(help_text="게시글 작성일시")
+
+    class Meta:
+        db_table = "post_rankings"
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "post"], name="unique_postranking_scope_post")
+        ]
+        indexes = [
+            # 범위별 좋아요 순 조회
+            models.Index(
+                fields=["scope", "-like_count", "-created_at"], name="idx_postranking_scope_rank"
+            )
+        ]
+
+
+class ArchivedPost(models.Model):
+    # 삭제 후 SOFT_DELETE_ARCHIVE_DAYS 가 지난 게시글 보관 (posts.archive.SoftDeleteArchiver)
+    # - posts 테이블 / 인덱스에서 빠지므로 공개 게시글 조회에 영향 없음
+    # - data: 원래 행 전체(검색 문서 제외) + 이미지 경로 목록(images)
+    #   이미지 파일은 보관 시 참조가 해제되어 미디어 정리 작업에서 삭제됨
+
+    id = models.BigIntegerField(primary_key=True, help_text="원래 게시글 id")
+    user_id = models.BigIntegerField(help_text="작성자 id")
+    category = models.CharField(max_length=100, help_text="게시글 카테고리")
+    title = models.CharField(max_length=255, help_text="게시글 제목")
+    data = models.JSONField(help_text="보관 시점의 게시글 행")
+    created_at = models.DateTimeField(help_text="작성일시")
+    deleted_at = models.DateTimeField(help_text="삭제일시")
+    archived_at = models.DateTimeField(auto_now_add=True, help_text="보관일시")
+
+    class Meta:
+        db_table = "posts_archive"
+        indexes = [
+            models.Index(fields=["user_id"], name="idx_archivedpost_user"),
+        ]
+
+
+class ModerationLog(models.Model):
+    # 관리자 일괄 조치(숨김 / 삭제) 기록 (posts.moderation.ModerationService)
+    # - criteria: 요청한 대상 조건, object_ids: 실제로 상태가 바뀐 행 id
+    # - 조치는 배치 단위 트랜잭션으로 나누어 처리하며 배치마다 object_ids / affected_count 누적
+
+    class Target(models.TextChoices):
+        POST = "POST", "게시글"
+        COMMENT = "COMMENT", "댓글"
+
+    class Action(models.TextChoices):
+        HIDE = "HIDE", "숨김"
+        DELETE = "DELETE", "삭제"
+
+    moderator = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="moderation_logs",
+        help_text="조치한 관리자",
+    )
+    target = models.CharField(max_length=20, choices=Target.choices, help_text="조치 대상")
+    action = models.CharField(max_length=20, choices=Action.choices, help_text="조치 내용")
+    criteria = models.JSONField(default=dict, help_text="대상 조건 (ids / user_id / 작성 기간)")
+    object_ids = models.JSONField(default=list, help_text="상태가 바뀐 행 id")
+    affected_count = models.PositiveIntegerField(default=0, help_text="상태가 바뀐 행 수")
+    reason = models.TextField(blank=True, default="", help_text="조치 사유")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="조치 일시")
+
+    class Meta:
+        db_table = "moderation_logs"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["target", "-created_at"], name="idx_moderationlog_target"),
+        ]
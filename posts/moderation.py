@@ -0,0 +1,167 @@
+import datetime
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
+
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from comments.models import Comment
+from posts.leaderboard import PostLeaderboard
+from posts.models import ModerationLog, Post
+from posts.services import PostService
+
+# 댓글 조치로 줄어든 게시글별 댓글 수를 한 번의 UPDATE 로 반영 (+ 상세 캐시 버전 증가)
+DECREASE_COMMENT_COUNTS_SQL = """
+UPDATE posts
+SET comment_count = GREATEST(posts.comment_count - v.n, 0), version = posts.version + 1
+FROM (VALUES {values}) AS v(id, n)
+WHERE posts.id = v.id
+RETURNING posts.category
+"""
+
+# 배치마다 조치 기록에 변경된 id 누적
+APPEND_LOG_SQL = """
+UPDATE moderation_logs
+SET object_ids = object_ids || %(ids)s::jsonb, affected_count = affected_count + %(count)s
+WHERE id = %(log_id)s
+"""
+
+
+class ModerationService:
+    # 관리자 일괄 조치 (게시글 / 댓글 숨김, 소프트 삭제)
+    # - 대상: id 목록 / 작성자 / 작성 기간 조건 (하나 이상 필수, 여러 개면 AND)
+    # - BATCH_SIZE 개씩 id 순으로 잠근 뒤 한 번의 UPDATE 로 상태 변경 (행마다 save() 하지 않음)
+    #   배치마다 트랜잭션을 나누어 잠금 시간을 짧게 유지하고 조치 기록(ModerationLog)에 누적
+    # - 게시글: 캐시 버전 증가(같은 UPDATE), 랭킹에서 제거, 목록 캐시 무효화
+    # - 댓글: 공개 댓글이 줄어든 만큼 게시글별 comment_count 를 한 번에 감소, 목록 캐시 무효화
+    # - 숨김은 공개 행만, 삭제는 숨김 행을 포함한 삭제되지 않은 행이 대상
+
+    BATCH_SIZE: int = 1000
+
+    @staticmethod
+    def moderate(
+        moderator_id: Optional[int],
+        target: str,
+        action: str,
+        ids: Optional[List[int]] = None,
+        user_id: Optional[int] = None,
+        created_from: Optional[datetime.datetime] = None,
+        created_to: Optional[datetime.datetime] = None,
+        reason: str = "",
+    ) -> ModerationLog:
+        criteria: Dict[str, Any] = {
+            "ids": sorted(set(ids)) if ids else None,
+            "user_id": user_id,
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+        }
+        criteria = {key: value for key, value in criteria.items() if value is not None}
+        if not criteria:
+            raise ValidationError(
+                "조치 대상 조건(ids, user_id, 작성 기간)을 하나 이상 지정해야 합니다."
+            )
+
+        model = Post if target == ModerationLog.Target.POST else Comment
+        if action == ModerationLog.Action.HIDE:
+            queryset = model.objects.all()
+        else:
+            queryset = model.all_objects.filter(is_deleted=False)
+        if ids:
+            queryset = queryset.filter(id__in=criteria["ids"])
+        if user_id is not None:
+            queryset = queryset.filter(user_id=user_id)
+        if created_from is not None:
+            queryset = queryset.filter(created_at__gte=created_from)
+        if created_to is not None:
+            queryset = queryset.filter(created_at__lt=created_to)
+
+        log = ModerationLog.objects.create(
+            moderator_id=moderator_id,
+            target=target,
+            action=action,
+            criteria=criteria,
+            reason=reason,
+        )
+        moderate_batch = (
+            ModerationService._moderate_posts
+            if target == ModerationLog.Target.POST
+            else ModerationService._moderate_comments
+        )
+
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                batch = queryset.filter(id__gt=last_id).order_by("id")[
+                    : ModerationService.BATCH_SIZE
+                ]
+                changed_ids = moderate_batch(batch, action)
+                if changed_ids:
+                    ModerationService._append_log(log.id, changed_ids)
+            if len(changed_ids) < ModerationService.BATCH_SIZE:
+                break
+            last_id = changed_ids[-1]
+
+        log.refresh_from_db()
+        return log
+
+    @staticmethod
+    def _state(action: str, model: Any) -> Dict[str, Any]:
+        if action == ModerationLog.Action.HIDE:
+            return {"status": model.Status.HIDDEN}
+        return {"status": model.Status.DELETED, "is_deleted": True}
+
+    @staticmethod
+    def _moderate_posts(batch: QuerySet[Post], action: str) -> List[int]:
+        rows = list(batch.select_for_update().values_list("id", "category"))
+        if not rows:
+            return []
+
+        post_ids = [post_id for post_id, _ in rows]
+        Post.all_objects.filter(id__in=post_ids).update(
+            **ModerationService._state(action, Post),
+            updated_at=timezone.now(),
+            version=F("version") + 1,
+        )
+        PostLeaderboard.remove_many(post_ids)
+        PostService.invalidate_post_lists(*{category for _, category in rows})
+        return post_ids
+
+    @staticmethod
+    def _moderate_comments(batch: QuerySet[Comment], action: str) -> List[int]:
+        rows = list(batch.select_for_update().values_list("id", "post_id", "status"))
+        if not rows:
+            return []
+
+        comment_ids = [comment_id for comment_id, _, _ in rows]
+        Comment.all_objects.filter(id__in=comment_ids).update(
+            **ModerationService._state(action, Comment), updated_at=timezone.now()
+        )
+
+        # 공개 상태였던 댓글 수만큼 감소 (이미 숨긴 댓글을 삭제하는 경우 0, 캐시 버전만 증가)
+        decreases = Counter({post_id: 0 for _, post_id, _ in rows})
+        decreases.update(post_id for _, post_id, status in rows if status == Comment.Status.ACTIVE)
+        categories = ModerationService._decrease_comment_counts(decreases)
+        PostService.invalidate_post_lists(*categories)
+        return comment_ids
+
+    @staticmethod
+    def _decrease_comment_counts(decreases: Counter) -> Set[str]:
+        items = sorted(decreases.items())
+        values = ", ".join(["(%s::bigint, %s::integer)"] * len(items))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                DECREASE_COMMENT_COUNTS_SQL.format(values=values),
+                [value for item in items for value in item],
+            )
+            return {category for (category,) in cursor.fetchall()}
+
+    @staticmethod
+    def _append_log(log_id: int, object_ids: List[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                APPEND_LOG_SQL,
+                {"ids": json.dumps(object_ids), "count": len(object_ids), "log_id": log_id},
+            )
@@ -0,0 +1,155 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.postgres.search import CombinedSearchVector, SearchQuery, SearchVector
+from django.db.models import Case, F, TextField, Value, When
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+    Least,
+    Length,
+    Lower,
+    NullIf,
+    StrIndex,
+    Substr,
+)
+from django.db.models.lookups import LessThanOrEqual
+from django.utils.html import escape
+from rest_framework.exceptions import ValidationError
+
+# 게시글 검색 문서 / 검색어 처리
+# - 한국어는 띄어쓰기 단위 형태소 분석이 어려우므로 2글자 단위(bigram)로 색인
+#   ex) "라탄바구니" -> 라탄 탄바 바구 구니 니 => "라탄" 검색 시 부분 일치
+#   단어의 마지막 글자를 1글자 토큰으로 추가 (1글자 검색어가 단어 끝 글자와도 일치하도록)
+# - 검색어 단어는 bigram 을 <-> (연속 위치)로, 단어끼리는 & 로 결합
+#   ex) "가방끈" -> '가방' <-> '방끈' => "가방 ... 방끈" 처럼 떨어진 문서는 제외
+# - 사전 처리 없이 "simple" 설정을 사용해 토큰을 그대로 lexeme 으로 저장
+# - 제목(A) 가중치를 본문(B)보다 높게 부여
+
+SEARCH_CONFIG = "simple"
+NGRAM_SIZE = 2
+SNIPPET_LENGTH = 100
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    # 단어 단위로 분리 후 소문자로 정규화
+    return [word.lower() for word in WORD_PATTERN.findall(text or "")]
+
+
+def ngrams(word: str, size: int = NGRAM_SIZE) -> List[str]:
+    # 단어를 size 글자 단위로 분할 (단어가 더 짧으면 그대로 사용)
+    if len(word) <= size:
+        return [word]
+    return [word[i : i + size] for i in range(len(word) - size + 1)]
+
+
+def document_terms(word: str) -> List[str]:
+    # 단어의 n-gram + 마지막 글자 (1글자 단어는 그대로)
+    grams = ngrams(word)
+    return grams + [word[-1]] if len(word) > 1 else grams
+
+
+def build_search_document(text: str) -> str:
+    # 검색 문서: 모든 단어의 색인 토큰을 공백으로 이어 붙인 문자열
+    # (to_tsvector 가 순서대로 위치를 부여하므로 한 단어의 n-gram 은 연속 위치)
+    return " ".join(term for word in tokenize(text) for term in document_terms(word))
+
+
+def build_search_vector(title: str, content: str) -> CombinedSearchVector:
+    # posts.search_vector 에 저장할 tsvector 표현식 (제목 A / 본문 B)
+    return SearchVector(
+        Value(build_search_document(title)), config=SEARCH_CONFIG, weight="A"
+    ) + SearchVector(Value(build_search_document(content)), config=SEARCH_CONFIG, weight="B")
+
+
+def build_search_query(keyword: str) -> Optional[SearchQuery]:
+    text = build_query_text(keyword)
+    if not text:
+        return None
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="raw")
+
+
+def build_query_text(keyword: str) -> str:
+    # 단어 안의 n-gram 은 연속 위치(<->), 단어끼리는 AND 로 결합
+    # 1글자 단어는 접두어 검색(꽃:*)으로 "꽃다발" 등의 bigram, "들꽃" 의 끝 글자 토큰과 일치시킴
+    terms = []
+    for word in tokenize(keyword):
+        if len(word) < NGRAM_SIZE:
+            terms.append(f"'{word}':*")
+        else:
+            phrase = " <-> ".join(f"'{gram}'" for gram in ngrams(word))
+            terms.append(f"({phrase})" if len(word) > NGRAM_SIZE else phrase)
+
+    return " & ".join(terms)
+
+
+def encode_cursor(rank: float, post_id: int) -> str:
+    # 검색 결과는 (관련도, id) 순으로 정렬되므로 두 값을 함께 커서로 사용
+    return f"{rank!r}_{post_id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    if not cursor:
+        return None
+    try:
+        rank, post_id = cursor.split("_")
+        return float(rank), int(post_id)
+    except ValueError:
+        raise ValidationError(f"Invalid cursor: {cursor}")
+
+
+def highlight(text: str, keyword: str, max_length: Optional[int] = None) -> str:
+    # 검색어와 일치하는 부분을 <mark> 태그로 감싼 문자열 반환
+    # max_length 지정 시 첫 일치 위치 주변만 잘라서 반환 (본문 스니펫)
+    text = text or ""
+    words = sorted(set(tokenize(keyword)), key=len, reverse=True)
+    if not words:
+        return escape(text[:max_length] if max_length else text)
+
+    pattern = re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+
+    if max_length and len(text) > max_length:
+        match = pattern.search(text)
+        start = max(0, match.start() - max_length // 4) if match else 0
+        text = text[start : start + max_length]
+
+    result = []
+    last = 0
+    for match in pattern.finditer(text):
+        result.append(escape(text[last : match.start()]))
+        result.append(f"{HIGHLIGHT_START}{escape(match.group())}{HIGHLIGHT_END}")
+        last = match.end()
+    result.append(escape(text[last:]))
+    return "".join(result)
+
+
+def snippet_expression(keyword: str) -> Case:
+    # highlight(content, keyword, SNIPPET_LENGTH) 가 자르는 범위를 DB 에서 잘라서 조회
+    # (검색 결과마다 본문 전체를 읽지 않도록) - 첫 일치 위치(1부터) 앞 SNIPPET_LENGTH // 4 글자부터
+    positions = [
+        NullIf(StrIndex(Lower("content"), Value(word)), Value(0)) for word in set(tokenize(keyword))
+    ]
+    if not positions:
+        first = Value(1)
+    elif len(positions) == 1:
+        first = Coalesce(positions[0], Value(1))
+    else:
+        first = Coalesce(Least(*positions), Value(1))
+    start = Greatest(first - SNIPPET_LENGTH // 4, Value(1))
+    return Case(
+        When(LessThanOrEqual(Length("content"), SNIPPET_LENGTH), then=F("content")),
+        default=Substr("content", start, SNIPPET_LENGTH),
+        output_field=TextField(),
+    )
+
+
+def build_highlight(title: str, snippet: str, keyword: str) -> Dict[str, str]:
+    # snippet: snippet_expression 으로 잘라낸 본문 (SNIPPET_LENGTH 이하이므로 다시 자르지 않음)
+    return {
+        "title": highlight(title, keyword),
+        "content": highlight(snippet, keyword, max_length=SNIPPET_LENGTH),
+    }
@@ -1,13 +1,15 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from comments.serializers import CommentResponseSerializer
+from posts import search
+from posts.image_variants import build_srcset, build_variants
 
 # from rest_framework.exceptions import ValidationError
-from posts.models import Post, PostImage, PostLike
+from posts.models import ModerationLog, Post, PostImage, PostLike
 
 User = get_user_model()
 
@@ -28,14 +30,87 @@ class PostImageSerializer(BaseSerializer):
 
     id = serializers.IntegerField(read_only=True)
     image_url = serializers.ImageField()
+    width = serializers.IntegerField(read_only=True)
+    height = serializers.IntegerField(read_only=True)
+    # 리사이즈 / WebP 변형본 (백그라운드 생성 전에는 빈 목록 / None)
+    variants = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     created_at = serializers.DateTimeField(read_only=True)
 
+    def get_variants(self, obj: PostImage) -> List[Dict[str, Any]]:
+        return build_variants(obj, self.context.get("request"))
+
+    def get_srcset(self, obj: PostImage) -> Optional[str]:
+        return build_srcset(self.get_variants(obj))
+
     def create(self, validated_data: Dict[str, Any]) -> PostImage:
         # 데이터 검증 또는 추가 처리
         instance = super().create(validated_data)
         return PostImage.objects.get(id=instance.id)
 
 
+class PostImageUploadCreateSerializer(BaseSerializer):
+    # 이어 올리기 세션 생성 (파일 이름, 전체 크기)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+
+
+class PostImageUploadSerializer(BaseSerializer):
+    # 이어 올리기 세션 상태 (offset 부터 이어서 전송)
+    id = serializers.UUIDField(read_only=True)
+    filename = serializers.CharField(read_only=True)
+    size = serializers.IntegerField(read_only=True)
+    offset = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    width = serializers.IntegerField(read_only=True)
+    height = serializers.IntegerField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
+class ModerationSerializer(BaseSerializer):
+    # 관리자 일괄 조치 요청 (ids / user_id / 작성 기간 중 하나 이상, 여러 개면 모두 만족하는 행)
+    MAX_IDS = 10000
+
+    target = serializers.ChoiceField(choices=ModerationLog.Target.choices)
+    action = serializers.ChoiceField(choices=ModerationLog.Action.choices)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+    user_id = serializers.IntegerField(required=False)
+    created_from = serializers.DateTimeField(required=False)
+    created_to = serializers.DateTimeField(required=False)
+    reason = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        if not any(key in attrs for key in ("ids", "user_id", "created_from", "created_to")):
+            raise ValidationError(
+                "조치 대상 조건(ids, user_id, 작성 기간)을 하나 이상 지정해야 합니다."
+            )
+        if (
+            "created_from" in attrs
+            and "created_to" in attrs
+            and attrs["created_from"] >= attrs["created_to"]
+        ):
+            raise ValidationError("created_from 은 created_to 보다 이전이어야 합니다.")
+        return attrs
+
+
+class ModerationLogSerializer(BaseSerializer):
+    # 일괄 조치 기록
+    id = serializers.IntegerField(read_only=True)
+    moderator_id = serializers.IntegerField(read_only=True)
+    target = serializers.CharField(read_only=True)
+    action = serializers.CharField(read_only=True)
+    criteria = serializers.JSONField(read_only=True)
+    affected_count = serializers.IntegerField(read_only=True)
+    object_ids = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    reason = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
 class PostCreateSerializer(BaseSerializer):
     # 공방 사장만 게시글 작성 가능
     # 제목, 내용, 카테고리 필수 입력
@@ -58,7 +133,12 @@ class PostCreateSerializer(BaseSerializer):
         },
     )
     category = serializers.ChoiceField(choices=Post.Category.choices)
-    images = serializers.ListField(child=serializers.ImageField(), required=False, write_only=True)
+    # 이미지 형식 / 크기 검증은 ImageValidator 에서 (헤더만 읽어 병렬 검사)
+    images = serializers.ListField(child=serializers.FileField(), required=False, write_only=True)
+    # 이어 올리기(/api/posts/uploads/)로 완료한 업로드 id
+    upload_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, write_only=True
+    )
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         if "request" not in self.context:
@@ -92,6 +172,8 @@ class PostListSerializer(BaseSerializer):
     author = serializers.SerializerMethodField()
     created_at = serializers.DateTimeField(read_only=True)
     is_deleted = serializers.BooleanField(read_only=True)
+    is_liked = serializers.SerializerMethodField()
+    highlight = serializers.SerializerMethodField()
 
     def get_author(self, obj: Post) -> Dict[str, Any]:
         # 작성자 정보를 딕셔너리로 반환
@@ -105,6 +187,17 @@ class PostListSerializer(BaseSerializer):
             "workshop_name": getattr(obj.user, "workshop_name", ""),
         }
 
+    def get_is_liked(self, obj: Post) -> bool:
+        # view 에서 페이지 단위로 조회한 좋아요 게시글 id 목록으로 확인
+        return obj.id in self.context.get("liked_post_ids", ())
+
+    def get_highlight(self, obj: Post) -> Optional[Dict[str, str]]:
+        # 검색 결과인 경우에만 제목 / 본문 스니펫에 검색어 강조 표시
+        keyword = self.context.get("search_keyword")
+        if not keyword:
+            return None
+        return search.build_highlight(obj.title, obj.snippet, keyword)
+
 
 class PostDetailSerializer(BaseSerializer):
     id = serializers.IntegerField(read_only=True)
@@ -117,7 +210,10 @@ class PostDetailSerializer(BaseSerializer):
     author = serializers.SerializerMethodField()
     images = PostImageSerializer(many=True, read_only=True)
     is_liked = serializers.SerializerMethodField()
-    comments = CommentResponseSerializer(many=True, read_only=True)
+    # 댓글 첫 페이지 (PostService.get_post_detail 에서 조회)
+    comments = CommentResponseSerializer(many=True, read_only=True, source="comment_page")
+    comments_has_next = serializers.BooleanField(read_only=True)
+    comments_next_cursor = serializers.CharField(read_only=True, allow_null=True)
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
 
@@ -138,16 +234,21 @@ class PostDetailSerializer(BaseSerializer):
         # 성능 최적화를 위한 prefetch_related
         # view에서 다음과 같이 쿼리 최적화 필요:
         # Post.objects.prefetch_related('likes').get(id=pk)
+        # context 에 user_id 가 None 으로 주어지면 (캐시용 공용 응답) 조회하지 않음
+        # context 에 liked_post_ids 가 있으면 (view 에서 미리 조회) 그 값으로 확인
+        if "liked_post_ids" in self.context:
+            return obj.id in self.context["liked_post_ids"]
         user = self.context["request"].user
-        if not user.is_authenticated:
+        user_id = self.context.get("user_id", user.id if user.is_authenticated else None)
+        if not user_id:
             return False
 
         # likes가 prefetch되어 있다면 메모리에서 확인
-        if hasattr(obj, "likes"):
-            return any(like.user_id == user.id for like in obj.likes.all())
+        if "likes" in getattr(obj, "_prefetched_objects_cache", {}):
+            return any(like.user_id == user_id for like in obj.likes.all())
 
         # 아니라면 DB쿼리
-        return PostLike.objects.filter(post=obj, user=user).exists()
+        return PostLike.objects.filter(post=obj, user_id=user_id).exists()
 
 
 class PostUpdateSerializer(BaseSerializer):
@@ -159,7 +260,10 @@ class PostUpdateSerializer(BaseSerializer):
     category = serializers.ChoiceField(choices=Post.Category.choices, required=False)
     # 이미지 관련 필드는 유지하되, 실제 처리는 service layer에서
     add_images = serializers.ListField(
-        child=serializers.ImageField(), required=False, write_only=True
+        child=serializers.FileField(), required=False, write_only=True
+    )
+    add_upload_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, write_only=True
     )
     remove_image_ids = serializers.CharField(
         required=False,
@@ -189,7 +293,7 @@ class PostUpdateSerializer(BaseSerializer):
         instance.title = validated_data.get("title", instance.title)
         instance.content = validated_data.get("content", instance.content)
         instance.category = validated_data.get("category", instance.category)
-        instance.save()
+        instance.save(update_fields=["title", "content", "category", "updated_at"])
 
         # 수정된 게시글 인스턴스
         return instance
@@ -199,6 +303,18 @@ class PostLikeResponseSerializer(serializers.Serializer[Any]):
     is_liked = serializers.BooleanField()
 
 
+# 여러 게시글 좋아요 여부 일괄 조회 결과 ({게시글 id: 좋아요 여부})
+class PostLikeStatusResponseSerializer(serializers.Serializer[Any]):
+    data = serializers.DictField(child=serializers.BooleanField())
+
+
+# 좋아요 토글 결과 (좋아요 여부 + 변경된 좋아요 수)
+class PostLikeToggleResponseSerializer(serializers.Serializer[Any]):
+    is_liked = serializers.BooleanField()
+    like_count = serializers.IntegerField()
+    message = serializers.CharField()
+
+
 # User 모델 role 필드 확인
 # WORKSHOP 값이 유효한지 확인
 # User 모델에 nickname 필드 확인
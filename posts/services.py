@@ -1,18 +1,105 @@
-from typing import Any, Dict, List, Optional, Tuple
-
-from django.db import transaction
-from django.db.models import F, Prefetch, Q, QuerySet
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from django.contrib.postgres.search import SearchRank
+from django.db import connection, transaction
+from django.db.models import Exists, F, FloatField, OuterRef, Prefetch, Q, QuerySet
+from django.db.models.functions import Cast
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
-from posts.models import Post, PostImage, PostLike
+from comments.models import Comment
+from comments.services import CommentService
+from posts import search
+from posts.blobs import ImageBlobService
+from posts.cache import PostListCache
+from posts.image_validation import ImageValidator
+from posts.image_variants import image_variant_pipeline
+from posts.leaderboard import PostLeaderboard
+from posts.models import Post, PostImage, PostImageUpload, PostLike, PostRanking
+from posts.uploads import ImageUploadService
+from posts.view_counts import view_count_buffer
+
+# 좋아요 토글 (한 번의 왕복으로 처리)
+# - removed: 이미 좋아요한 경우 삭제
+# - added: 삭제된 좋아요가 없으면 추가 (동시 요청으로 이미 존재하면 ON CONFLICT 로 무시)
+# - updated: 추가/삭제된 경우에만 좋아요 수를 증감 (음수 방지), 캐시 버전 증가
+# 데이터 변경 CTE 는 같은 스냅샷을 보므로 removed 결과로 added 실행 여부를 결정
+TOGGLE_LIKE_SQL = """
+WITH target AS (
+    SELECT id, like_count, category, status, created_at
+    FROM posts
+    WHERE id = %(post_id)s AND NOT is_deleted AND status = 'ACTIVE'
+),
+removed AS (
+    DELETE FROM post_likes
+    WHERE post_id IN (SELECT id FROM target) AND user_id = %(user_id)s
+    RETURNING post_id
+),
+added AS (
+    INSERT INTO post_likes (post_id, user_id, created_at)
+    SELECT id, %(user_id)s, NOW() FROM target
+    WHERE NOT EXISTS (SELECT 1 FROM removed)
+    ON CONFLICT (post_id, user_id) DO NOTHING
+    RETURNING post_id
+),
+updated AS (
+    UPDATE posts
+    SET like_count = GREATEST(
+        posts.like_count
+        + (SELECT COUNT(*) FROM added)
+        - (SELECT COUNT(*) FROM removed),
+        0
+    ),
+    version = posts.version + 1
+    WHERE posts.id IN (SELECT post_id FROM added UNION ALL SELECT post_id FROM removed)
+    RETURNING like_count
+)
+SELECT
+    EXISTS (SELECT 1 FROM target),
+    NOT EXISTS (SELECT 1 FROM removed),
+    EXISTS (SELECT 1 FROM updated),
+    COALESCE((SELECT like_count FROM updated), target.like_count),
+    target.category,
+    target.status,
+    target.created_at
+FROM (SELECT 1) AS one
+LEFT JOIN target ON TRUE
+"""
+
+# 목록 응답(PostListSerializer)에 필요한 컬럼만 조회
+# - 본문(content), 검색 문서(search_vector) 등 큰 컬럼과 사용하지 않는 이미지 / 댓글 prefetch 제외
+# - 작성자 정보는 JOIN 으로 필요한 컬럼만 조회
+# - version 은 목록 ETag 생성에 사용
+POST_LIST_FIELDS = (
+    "id",
+    "title",
+    "category",
+    "view_count",
+    "like_count",
+    "comment_count",
+    "created_at",
+    "is_deleted",
+    "version",
+    "user__id",
+    "user__nickname",
+    "user__workshop_name",
+)
 
 
 class PostService:
+    # 게시글 상세에 포함하는 댓글 수 (이후 댓글은 댓글 목록 API 의 cursor 로 조회)
+    DETAIL_COMMENT_LIMIT: int = 10
+
+    @staticmethod
+    def get_list_queryset(*extra_fields: str) -> QuerySet[Post]:
+        # 목록용 쿼리셋: 필요한 컬럼만 조회 (그 외 필드 접근 시 행마다 추가 쿼리 발생 주의)
+        return Post.objects.select_related("user").only(*POST_LIST_FIELDS, *extra_fields)
+
     @staticmethod
     def get_post_list(
         category: Optional[str] = None,
-        search_keyword: Optional[str] = None,
         cursor: Optional[int] = None,
         limit: int = 10,
         is_top_liked: bool = False,
@@ -21,27 +108,19 @@ class PostService:
         category = PostService.validate_category(category)
 
         # 기본 쿼리셋 구성
-        queryset = (
-            Post.objects.select_related("user").prefetch_related("images").filter(is_deleted=False)
-        )
+        queryset = PostService.get_list_queryset()
         # 카테고리 limit 설정
         if limit not in [5, 10]:
             limit = 10
 
-        # 좋아요 TOP 10 조회
+        # 좋아요 TOP 10 조회 (카테고리 지정 시 카테고리별 TOP 10)
         if is_top_liked:
-            posts = list(queryset.order_by("-like_count", "-created_at")[:10])
-            return posts, False, None
+            return PostService.get_top_liked_posts(category=category), False, None
 
         # 기존 로직
         if category:
             queryset = queryset.filter(category=category)
 
-        if search_keyword:
-            queryset = queryset.filter(
-                Q(title__icontains=search_keyword) | Q(content__icontains=search_keyword)
-            )
-
         # 커서 기반 페이지네이션
         if cursor:
             queryset = queryset.filter(id__lt=cursor)
@@ -60,15 +139,66 @@ class PostService:
 
         return posts_list, has_next, next_cursor
 
+    @staticmethod
+    def get_top_liked_posts(category: Optional[str] = None, limit: int = 10) -> List[Post]:
+        # 랭킹 테이블에서 순서대로 id 조회 후 해당 게시글만 로드
+        post_ids = PostLeaderboard.get_top_post_ids(category=category, limit=limit)
+        posts = PostService.get_list_queryset().order_by().in_bulk(post_ids)
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+    @staticmethod
+    def search_posts(
+        search_keyword: str,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+    ) -> Tuple[List[Post], bool, Optional[str]]:
+        # 제목 / 본문 전문 검색 (GIN 인덱스 + 관련도 순 정렬)
+        # 커서는 (관련도, id) 조합 문자열
+        category = PostService.validate_category(category)
+
+        if limit not in [5, 10]:
+            limit = 10
+
+        query = search.build_search_query(search_keyword)
+        if query is None:
+            return [], False, None
+
+        # 본문은 전체 대신 검색어 강조 스니펫 범위만 조회
+        queryset = (
+            PostService.get_list_queryset()
+            .filter(search_vector=query)
+            .annotate(
+                snippet=search.snippet_expression(search_keyword),
+                # float4 그대로 커서에 담으면 반올림 오차로 비교가 어긋나므로 double 로 변환
+                rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+            )
+        )
+
+        if category:
+            queryset = queryset.filter(category=category)
+
+        decoded_cursor = search.decode_cursor(cursor)
+        if decoded_cursor:
+            rank, post_id = decoded_cursor
+            queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=post_id))
+
+        posts_list = list(queryset.order_by("-rank", "-id")[: limit + 1])
+
+        has_next = len(posts_list) > limit
+        if has_next:
+            posts_list = posts_list[:-1]
+            next_cursor = search.encode_cursor(posts_list[-1].rank, posts_list[-1].id)
+        else:
+            next_cursor = None
+
+        return posts_list, has_next, next_cursor
+
     @staticmethod
     def get_user_posts(
         user_id: int, cursor: Optional[int] = None, limit: int = 10
     ) -> Tuple[List[Post], bool, Optional[int]]:
-        queryset = (
-            Post.objects.select_related("user")
-            .prefetch_related("images", "comments")
-            .filter(user_id=user_id, is_deleted=False)
-        )
+        queryset = PostService.get_list_queryset().filter(user_id=user_id)
 
         if cursor:
             queryset = queryset.filter(id__lt=cursor)
@@ -87,35 +217,132 @@ class PostService:
 
     @staticmethod
     def get_post_detail(post_id: int, user_id: Optional[int] = None) -> Post:
-        queryset = Post.objects.select_related("user").prefetch_related(
-            "images",
-            "comments__user",  # 댓글과 댓글 작성자 정보도 함께 조회
+        # 삭제되지 않은 최신 댓글 첫 페이지만 조회 (댓글 작성자 정보 포함)
+        # 슬라이스한 Prefetch 는 게시글별 ROW_NUMBER() 윈도우로 제한되어
+        # 댓글 수와 관계없이 limit + 1 개만 로드
+        limit = PostService.DETAIL_COMMENT_LIMIT
+        comments_prefetch = Prefetch(
+            "comments",
+            queryset=Comment.objects.select_related("user").order_by("-created_at", "-id")[
+                : limit + 1
+            ],
+            to_attr="comment_page",
         )
+        queryset = Post.objects.select_related("user").prefetch_related("images", comments_prefetch)
 
         if user_id:
             likes_prefetch = Prefetch("likes", queryset=PostLike.objects.filter(user_id=user_id))
             queryset = queryset.prefetch_related(likes_prefetch)
 
-        post = get_object_or_404(queryset, id=post_id, is_deleted=False)
+        post = get_object_or_404(queryset, id=post_id)
+
+        # 다음 댓글 페이지 커서 (댓글 목록 API 의 cursor 형식과 동일)
+        post.comments_has_next = len(post.comment_page) > limit
+        if post.comments_has_next:
+            post.comment_page = post.comment_page[:limit]
+            post.comments_next_cursor = CommentService.encode_cursor(post.comment_page[-1])
+        else:
+            post.comments_next_cursor = None
         return post
 
+    @staticmethod
+    def get_post_state(post_id: int, user_id: Optional[int] = None) -> Dict[str, Any]:
+        # 상세 캐시 조회 전 가벼운 확인용 조회 (존재 여부, 캐시 버전, 실시간 조회수, 좋아요 여부)
+        queryset = Post.objects.values("id", "version", "view_count")
+        if user_id:
+            queryset = queryset.annotate(
+                is_liked=Exists(PostLike.objects.filter(post_id=OuterRef("id"), user_id=user_id))
+            )
+        return get_object_or_404(queryset, id=post_id)
+
+    @staticmethod
+    def get_post_list_versions(
+        category: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 10,
+        is_top_liked: bool = False,
+    ) -> Optional[Tuple[List[Tuple[int, int, int]], bool]]:
+        # 목록 ETag 용 가벼운 조회: get_post_list 와 같은 페이지의 (id, 캐시 버전, 조회수)
+        # 랭킹이 아직 구성되지 않아 판단할 수 없으면 None
+        category = PostService.validate_category(category)
+        if limit not in [5, 10]:
+            limit = 10
+
+        if is_top_liked:
+            rows = list(
+                PostRanking.objects.filter(scope=category or PostRanking.SCOPE_ALL)
+                .order_by("-like_count", "-created_at")
+                .values_list(
+                    "post_id",
+                    "post__version",
+                    "post__view_count",
+                    "post__is_deleted",
+                    "post__status",
+                )[:10]
+            )
+            if not rows:
+                return None
+            # 랭킹 반영 전에 삭제 / 숨김된 게시글 제외 (get_top_liked_posts 와 같은 기준)
+            return [row[:3] for row in rows if not row[3] and row[4] == Post.Status.ACTIVE], False
+
+        queryset = Post.objects.all()
+        if category:
+            queryset = queryset.filter(category=category)
+        if cursor:
+            queryset = queryset.filter(id__lt=cursor)
+
+        rows = list(
+            queryset.order_by("-id").values_list("id", "version", "view_count")[: limit + 1]
+        )
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def bump_version(post_id: int) -> None:
+        # 상세 응답 캐시 무효화 (버전 증가, 삭제 / 숨김 게시글 포함)
+        Post.all_objects.filter(id=post_id).update(version=F("version") + 1)
+
+    @staticmethod
+    def invalidate_post_lists(*categories: str) -> None:
+        # 비로그인 목록 캐시 무효화 (해당 카테고리 + 전체 목록)
+        # 커밋 전에 무효화하면 다른 요청이 이전 데이터로 캐시를 다시 채울 수 있으므로 커밋 후 실행
+        transaction.on_commit(lambda: PostListCache.invalidate(*categories))
+
     @staticmethod
     def increase_view_count(post_id: int) -> None:
-        Post.objects.filter(id=post_id).update(view_count=F("view_count") + 1)
+        # 조회마다 UPDATE 하지 않고 버퍼에 누적 후 주기적으로 일괄 반영
+        view_count_buffer.add(post_id)
+
+    @staticmethod
+    def get_pending_view_count(post_id: int) -> int:
+        return view_count_buffer.pending(post_id)
 
     @staticmethod
     @transaction.atomic
-    def create_post(user_id: int, data: Dict[str, Any], images: Optional[List[Any]] = None) -> Post:
+    def create_post(
+        user_id: int,
+        data: Dict[str, Any],
+        images: Optional[List[Any]] = None,
+        upload_ids: Optional[List[UUID]] = None,
+    ) -> Post:
+        if len(images or []) + len(upload_ids or []) > ImageValidator.MAX_IMAGE_COUNT:
+            raise ValidationError(
+                f"이미지는 최대 {ImageValidator.MAX_IMAGE_COUNT}개까지 업로드 가능합니다"
+            )
+
         post = Post.objects.create(
             user_id=user_id,
             title=data["title"],
             content=data["content"],
             category=data["category"],
         )
+        PostService.update_search_vector(post)
+        PostLeaderboard.update(post)
 
-        if images:
-            PostService._handle_images(post, images)
+        if images or upload_ids:
+            uploads = ImageUploadService.claim_uploads(user_id, upload_ids or [])
+            PostService._handle_images(post, images or [], uploads)
 
+        PostService.invalidate_post_lists(post.category)
         return post
 
     @staticmethod
@@ -126,8 +353,9 @@ class PostService:
         data: Dict[str, Any],
         add_image: Optional[List[Any]] = None,
         remove_image_ids: Optional[str] = None,
+        add_upload_ids: Optional[List[UUID]] = None,
     ) -> Post:
-        post = get_object_or_404(Post, id=post_id, is_deleted=False)
+        post = get_object_or_404(Post, id=post_id)
 
         if post.user_id != user_id:
             raise PermissionDenied("자신의 게시글만 수정할 수 있습니다.")
@@ -136,29 +364,58 @@ class PostService:
         if remove_image_ids:
             # 콤마로 구분된 ID들을 리스트로 변환
             ids_to_remove = remove_image_ids.split(",")
-            PostImage.objects.filter(
-                post_id=post_id,
-                id__in=ids_to_remove,  # __in 쿼리 사용
-            ).delete()
+            # 삭제 후 공유 파일 참조 수 감소 (파일 삭제는 정리 작업에서 처리)
+            ImageBlobService.release_images(
+                PostImage.objects.filter(
+                    post_id=post_id,
+                    id__in=ids_to_remove,  # __in 쿼리 사용
+                )
+            )
 
+        previous_category = post.category
+        changed_fields = []
         for key, value in data.items():
-            if key != "remove_image_ids":
+            if key not in ("remove_image_ids", "add_images", "add_upload_ids"):
                 setattr(post, key, value)
-        post.save()
+                changed_fields.append(key)
+        # 변경한 컬럼만 저장 (좋아요 / 댓글 / 조회 수, 버전은 다른 요청이 잠금 없이 갱신하므로
+        # 조회 시점의 값으로 덮어쓰면 버전이 되돌아가 이전 캐시 / ETag 가 다시 유효해짐)
+        post.save(update_fields=[*changed_fields, "updated_at"])
 
-        if add_image:
-            PostService._handle_images(post, add_image)
+        # 카테고리 변경 시 이전 카테고리 랭킹에서 제거 후 새 카테고리 랭킹에 반영
+        if post.category != previous_category:
+            PostLeaderboard.remove(post, scopes=[previous_category])
+            PostLeaderboard.update(post)
 
+        if "title" in data or "content" in data:
+            PostService.update_search_vector(post)
+
+        if add_image or add_upload_ids:
+            uploads = ImageUploadService.claim_uploads(user_id, add_upload_ids or [])
+            PostService._handle_images(post, add_image or [], uploads)
+
+        PostService.bump_version(post.id)
+        PostService.invalidate_post_lists(previous_category, post.category)
         return post
 
     @staticmethod
     def delete_post(post_id: int, user_id: int) -> None:
-        post = get_object_or_404(Post, id=post_id, is_deleted=False)
+        post = get_object_or_404(Post, id=post_id)
 
         if post.user_id != user_id:
             raise ValidationError("자신의 게시글만 삭제할 수 있습니다.")
 
         post.delete()
+        PostService.bump_version(post.id)
+        PostLeaderboard.remove(post)
+        PostService.invalidate_post_lists(post.category)
+
+    @staticmethod
+    def update_search_vector(post: Post) -> None:
+        # 검색 문서 갱신 (제목 / 본문 변경 시 호출)
+        Post.objects.filter(id=post.id).update(
+            search_vector=search.build_search_vector(post.title, post.content)
+        )
 
     @staticmethod
     def validate_category(category: Optional[str]) -> Optional[str]:
@@ -167,37 +424,66 @@ class PostService:
         return category
 
     @staticmethod
-    def _handle_images(post: Post, images: List[Any]) -> None:
+    def _handle_images(
+        post: Post, images: List[Any], uploads: Optional[List[PostImageUpload]] = None
+    ) -> None:
         image_instances = []
         for image in images:
             image_instance = PostImage(
                 post=post, image_url=image  # ImageField는 자동으로 파일을 저장하고 경로를 저장
             )
             image_instances.append(image_instance)
+        # 이어 올리기로 완료된 업로드는 이미 저장된 파일 경로를 그대로 사용
+        for upload in uploads or []:
+            image_instances.append(
+                PostImage(
+                    post=post, image_url=upload.image_name, width=upload.width, height=upload.height
+                )
+            )
         PostImage.objects.bulk_create(image_instances)
+        # 같은 내용의 파일은 하나만 저장되므로 파일별 참조 수 증가
+        ImageBlobService.acquire(image.image_url.name for image in image_instances)
+        # 리사이즈 / WebP 변환은 커밋 후 백그라운드에서 처리
+        image_variant_pipeline.enqueue(image_instances)
 
     @staticmethod
-    @transaction.atomic
-    def toggle_like(post_id: int, user_id: int) -> bool:
-        post = get_object_or_404(Post.objects.select_for_update(), id=post_id, is_deleted=False)
-
-        like, created = PostLike.objects.get_or_create(
-            post_id=post_id,
-            user_id=user_id,
-        )
-
-        if not created:
-            like.delete()
-            post.like_count = F("like_count") - 1
-            post.save()
-            post.refresh_from_db()
-            return False
+    def toggle_like(post_id: int, user_id: int) -> Tuple[bool, int]:
+        # 좋아요 토글을 단일 SQL 문으로 처리 (select_for_update / refresh_from_db 없음)
+        # (좋아요 여부, 변경된 좋아요 수) 반환
+        with connection.cursor() as cursor:
+            cursor.execute(TOGGLE_LIKE_SQL, {"post_id": post_id, "user_id": user_id})
+            row = cursor.fetchone()
+
+        found, is_liked, changed, like_count, category, status, created_at = row
+        if not found:
+            raise Http404("No Post matches the given query.")
+
+        if changed:
+            PostLeaderboard.update(
+                Post(
+                    id=post_id,
+                    category=category,
+                    status=status,
+                    like_count=like_count,
+                    created_at=created_at,
+                    is_deleted=False,
+                ),
+                decreased=not is_liked,
+            )
 
-        post.like_count = F("like_count") + 1
-        post.save()
-        post.refresh_from_db()
-        return True
+        return is_liked, like_count
 
     @staticmethod
     def is_liked(post_id: int, user_id: int) -> bool:
         return PostLike.objects.filter(post_id=post_id, user_id=user_id).exists()
+
+    @staticmethod
+    def get_liked_post_ids(user_id: int, post_ids: List[int]) -> Set[int]:
+        # 여러 게시글의 좋아요 여부를 한 번의 쿼리로 조회 (post, user 유니크 인덱스 사용)
+        if not post_ids:
+            return set()
+        return set(
+            PostLike.objects.filter(user_id=user_id, post_id__in=post_ids).values_list(
+                "post_id", flat=True
+            )
+        )
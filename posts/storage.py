@@ -0,0 +1,68 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Any, Optional
+
+from django.core.files.storage import FileSystemStorage, Storage, storages
+
+# 내용 해시 파일 이름: <64자리 sha256>[.<너비>w].<확장자> (변형본 포함)
+HASHED_NAME_RE = re.compile(r"(?:^|/)[0-9a-f]{64}(?:\.\d+w)?\.[A-Za-z0-9]+$")
+
+
+def is_hashed_name(name: str) -> bool:
+    return bool(HASHED_NAME_RE.search(name))
+
+
+class ContentHashStorage(FileSystemStorage):
+    # 내용 해시(sha256) 경로로 저장하는 파일 저장소
+    # - 저장 이름: <upload_to>/<해시 앞 2자리>/<해시>.<확장자> (업로드 파일 이름 / 날짜와 무관)
+    #   => 같은 URL 은 항상 같은 내용이므로 만료 없는 캐시(Cache-Control: immutable) 가능
+    # - 업로드 파일을 임시 파일로 나누어 쓰면서 해시를 계산한 뒤 최종 경로로 rename (메모리 일정)
+    # - 같은 내용의 파일이 이미 있으면 새로 쓰지 않고 기존 파일 이름 반환
+    #   => 여러 PostImage 가 한 파일을 공유할 수 있으므로 파일 삭제 시 다른 참조 확인 필요
+
+    def get_available_name(self, name: str, max_length: Optional[int] = None) -> str:
+        # 최종 이름은 _save 에서 내용 해시로 결정
+        return name
+
+    def _save(self, name: str, content: Any) -> str:
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        full_directory = self.path(directory)
+        os.makedirs(full_directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=full_directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            hashed_name = self.hashed_name(directory, digest.hexdigest(), extension)
+            target = self.path(hashed_name)
+            if os.path.exists(target):
+                os.remove(temp_path)
+                # 수정 시각 갱신 => 참조가 없던 파일이라도 정리 작업의 유예 기간 동안 삭제되지 않음
+                os.utime(target)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temp_path, target)
+                # mkstemp 는 0600 으로 만들므로 웹 서버(nginx)가 읽을 수 있도록 권한 지정
+                os.chmod(target, self.file_permissions_mode or 0o644)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return hashed_name
+
+    @staticmethod
+    def hashed_name(directory: str, digest: str, extension: str) -> str:
+        return "/".join(part for part in [directory, digest[:2], digest + extension] if part)
+
+
+def get_post_image_storage() -> Storage:
+    # 게시글 이미지 저장소 (settings.STORAGES["post_images"])
+    return storages["post_images"]
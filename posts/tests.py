@@ -0,0 +1,2141 @@
+import datetime
+import decimal
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from drf_spectacular.generators import SchemaGenerator
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from comments.models import ArchivedComment, Comment
+from comments.services import CommentService
+from config.renderers import STREAM_CHUNK_SIZE, FastJSONRenderer, StreamingJSONResponse
+from config.testing import TempMediaRootMixin, create_user, user_fields
+from posts import search
+from posts.blobs import ImageBlobService
+from posts.cache import PostDetailCache, PostListCache
+from posts.checks import check_media_gc_retention
+from posts.fast_serializers import serialize_post_detail, serialize_post_list
+from posts.image_processing import render_variants
+from posts.image_validation import ImageValidator
+from posts.image_variants import image_variant_pipeline
+from posts.leaderboard import PostLeaderboard
+from posts.models import (
+    ArchivedPost,
+    ImageBlob,
+    ModerationLog,
+    Post,
+    PostImage,
+    PostImageUpload,
+    PostLike,
+    PostRanking,
+)
+from posts.moderation import ModerationService
+from posts.serializers import PostDetailSerializer, PostListSerializer
+from posts.services import PostService
+from posts.uploads import ImageUploadService
+from posts.view_counts import ViewCountBuffer, view_count_buffer
+from users.models import User
+
+
+class PostQueryPlanTest(TestCase):
+    # 목록 조회 쿼리가 부분 인덱스를 사용하는지 EXPLAIN 으로 검증
+    # - 조회 대상 테이블에 Seq Scan 이 없어야 함
+    # - 인덱스 순서로 정렬되어 별도의 Sort 노드가 없어야 함
+
+    USER_COUNT = 20
+    POST_COUNT = 5000
+    COMMENT_COUNT = 2000
+    HOT_POST_COMMENT_COUNT = 5000
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        users = [User(**user_fields(f"user{i}")) for i in range(cls.USER_COUNT)]
+        User.objects.bulk_create(users)
+
+        categories = [choice for choice, _ in Post.Category.choices]
+        posts = [
+            Post(
+                user=users[i % cls.USER_COUNT],
+                title=f"title {i}",
+                content=f"content {i}",
+                category=categories[i % len(categories)],
+                like_count=i % 97,
+                # 10% 는 삭제된 게시글
+                is_deleted=i % 10 == 0,
+            )
+            for i in range(cls.POST_COUNT)
+        ]
+        Post.objects.bulk_create(posts)
+
+        cls.post = posts[1]
+        cls.user = users[1]
+        Comment.objects.bulk_create(
+            [
+                Comment(
+                    post=posts[i % 50 + 1],
+                    user=users[i % cls.USER_COUNT],
+                    content=f"comment {i}",
+                    is_deleted=i % 10 == 0,
+                )
+                for i in range(cls.COMMENT_COUNT)
+            ]
+        )
+
+        # 댓글이 많은 게시글 (상세 댓글 첫 페이지 조회 검증용)
+        cls.hot_post = posts[2]
+        Comment.objects.bulk_create(
+            [
+                Comment(post=cls.hot_post, user=users[i % cls.USER_COUNT], content=f"hot {i}")
+                for i in range(cls.HOT_POST_COMMENT_COUNT)
+            ]
+        )
+
+        for scope in [PostRanking.SCOPE_ALL, *categories]:
+            PostLeaderboard.rebuild(scope)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE posts")
+            cursor.execute("ANALYZE comments")
+            cursor.execute("ANALYZE post_rankings")
+
+    def capture_sql(self, table: str, func: Any, *args: Any, **kwargs: Any) -> List[str]:
+        # 서비스 메서드가 실제로 실행한 대상 테이블 SELECT 쿼리 수집
+        with CaptureQueriesContext(connection) as context:
+            func(*args, **kwargs)
+
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+        ]
+
+    def explain(self, sql: str) -> Dict[str, Any]:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    def walk(self, node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        yield node
+        for child in node.get("Plans", []):
+            yield from self.walk(child)
+
+    def assert_index_only_plan(self, table: str, func: Any, *args: Any, **kwargs: Any) -> None:
+        queries = self.capture_sql(table, func, *args, **kwargs)
+        self.assertTrue(queries, "검증할 쿼리가 실행되지 않았습니다.")
+
+        for sql in queries:
+            plan = self.explain(sql)
+            for node in self.walk(plan):
+                node_type = node["Node Type"]
+                self.assertFalse(
+                    node_type == "Seq Scan" and node.get("Relation Name") == table,
+                    f"Seq Scan on {node.get('Relation Name')}:\n{sql}\n{json.dumps(plan, indent=2)}",
+                )
+                self.assertNotIn(
+                    node_type,
+                    ("Sort", "Incremental Sort"),
+                    f"{node_type} 발생:\n{sql}\n{json.dumps(plan, indent=2)}",
+                )
+
+    def test_post_list_uses_index(self) -> None:
+        self.assert_index_only_plan("posts", PostService.get_post_list)
+
+    def test_post_list_with_cursor_uses_index(self) -> None:
+        self.assert_index_only_plan("posts", PostService.get_post_list, cursor=self.POST_COUNT // 2)
+
+    def test_post_list_by_category_uses_index(self) -> None:
+        self.assert_index_only_plan(
+            "posts", PostService.get_post_list, category=Post.Category.RATTAN
+        )
+
+    def test_post_list_by_category_with_cursor_uses_index(self) -> None:
+        self.assert_index_only_plan(
+            "posts",
+            PostService.get_post_list,
+            category=Post.Category.RATTAN,
+            cursor=self.POST_COUNT // 2,
+        )
+
+    def test_top_liked_post_list_uses_index(self) -> None:
+        self.assert_index_only_plan("posts", PostService.get_post_list, is_top_liked=True)
+
+    def test_top_liked_ranking_uses_index(self) -> None:
+        self.assert_index_only_plan("post_rankings", PostService.get_post_list, is_top_liked=True)
+
+    def test_user_posts_uses_index(self) -> None:
+        self.assert_index_only_plan("posts", PostService.get_user_posts, user_id=self.user.id)
+
+    def test_post_comments_by_cursor_uses_index(self) -> None:
+        comments, _, next_cursor, _ = CommentService.get_post_comments_by_cursor(
+            post_id=self.post.id
+        )
+        self.assert_index_only_plan(
+            "comments",
+            CommentService.get_post_comments_by_cursor,
+            post_id=self.post.id,
+            cursor=next_cursor,
+        )
+
+    def test_post_comments_uses_index(self) -> None:
+        self.assert_index_only_plan(
+            "comments", CommentService.get_post_comments, post_id=self.post.id
+        )
+
+    def test_post_detail_comment_page_uses_index(self) -> None:
+        self.assert_index_only_plan(
+            "comments", PostService.get_post_detail, post_id=self.hot_post.id
+        )
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("search")
+        cls.posts = {
+            title: PostService.create_post(
+                user_id=cls.user.id,
+                data={"title": title, "content": content, "category": Post.Category.RATTAN},
+            )
+            for title, content in [
+                ("가방끈 교체", "라탄 가방"),
+                ("가방 만들기", "방끈 매듭"),
+                ("들꽃 리스", "말린 꽃다발"),
+                ("라탄바구니", "손잡이"),
+            ]
+        }
+
+    def search(self, keyword: str) -> List[str]:
+        posts, _, _ = PostService.search_posts(search_keyword=keyword)
+        return sorted(post.title for post in posts)
+
+    def test_build_search_query(self) -> None:
+        self.assertIsNone(search.build_search_query("  !? "))
+        self.assertEqual(
+            search.build_query_text("가방끈 꽃 라탄"), "('가방' <-> '방끈') & '꽃':* & '라탄'"
+        )
+
+    def test_word_matches_consecutive_bigrams_only(self) -> None:
+        self.assertEqual(self.search("가방끈"), ["가방끈 교체"])
+        self.assertEqual(self.search("가방"), ["가방 만들기", "가방끈 교체"])
+        self.assertEqual(self.search("탄바구"), ["라탄바구니"])
+        self.assertEqual(self.search("라탄 교체"), ["가방끈 교체"])
+
+    def test_single_character_matches_any_position(self) -> None:
+        # 첫 글자(꽃다발), 마지막 글자(들꽃), 1글자 단어 모두 일치
+        self.assertEqual(self.search("꽃"), ["들꽃 리스"])
+        self.assertEqual(self.search("니"), ["라탄바구니"])
+        self.assertEqual(self.search("끈"), ["가방 만들기", "가방끈 교체"])
+
+    def test_snippet_is_cut_in_database(self) -> None:
+        content = "앞부분 " * 100 + "등나무 의자 " + "뒷부분 " * 100
+        PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "긴 글", "content": content, "category": Post.Category.RATTAN},
+        )
+
+        posts, _, _ = PostService.search_posts(search_keyword="의자 등나무")
+        self.assertEqual(len(posts), 1)
+        # 본문 전체는 조회하지 않고, 스니펫은 본문에서 자른 결과와 동일
+        self.assertIn("content", posts[0].get_deferred_fields())
+        self.assertEqual(len(posts[0].snippet), search.SNIPPET_LENGTH)
+        self.assertEqual(
+            search.highlight(posts[0].snippet, "의자 등나무", search.SNIPPET_LENGTH),
+            search.highlight(content, "의자 등나무", search.SNIPPET_LENGTH),
+        )
+
+        posts, _, _ = PostService.search_posts(search_keyword="가방끈")
+        self.assertEqual(posts[0].snippet, "라탄 가방")
+
+
+class PostLeaderboardTest(TestCase):
+    # 좋아요 TOP 랭킹 증분 갱신 검증 (전체 정렬 결과와 동일해야 함)
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.users = [create_user(f"liker{i}") for i in range(5)]
+        cls.posts = [
+            PostService.create_post(
+                user_id=cls.users[0].id,
+                data={
+                    "title": f"title {i}",
+                    "content": f"content {i}",
+                    "category": Post.Category.RATTAN if i % 2 else Post.Category.FLOWER,
+                },
+            )
+            for i in range(8)
+        ]
+
+    def expected_ids(self, category: Any = None, limit: int = 10) -> List[int]:
+        queryset = Post.objects.filter(is_deleted=False)
+        if category:
+            queryset = queryset.filter(category=category)
+        return list(
+            queryset.order_by("-like_count", "-created_at").values_list("id", flat=True)[:limit]
+        )
+
+    def assert_leaderboard_matches(self) -> None:
+        self.assertEqual(PostLeaderboard.get_top_post_ids(), self.expected_ids())
+        for category in (Post.Category.RATTAN, Post.Category.FLOWER):
+            self.assertEqual(
+                PostLeaderboard.get_top_post_ids(category=category), self.expected_ids(category)
+            )
+
+    def test_like_toggle_updates_ranking(self) -> None:
+        for user in self.users:
+            PostService.toggle_like(post_id=self.posts[3].id, user_id=user.id)
+        PostService.toggle_like(post_id=self.posts[5].id, user_id=self.users[0].id)
+        self.assert_leaderboard_matches()
+
+        # 좋아요 취소로 순위 하락
+        for user in self.users[:4]:
+            PostService.toggle_like(post_id=self.posts[3].id, user_id=user.id)
+        self.assert_leaderboard_matches()
+
+    def test_out_of_order_like_counts_keep_live_value(self) -> None:
+        # 동시 좋아요의 RETURNING 값이 늦게 기록되어도 랭킹에는 현재 좋아요 수 반영
+        post = self.posts[3]
+        PostService.toggle_like(post_id=post.id, user_id=self.users[0].id)
+        PostService.toggle_like(post_id=post.id, user_id=self.users[1].id)
+
+        stale = Post.objects.get(id=post.id)
+        stale.like_count = 1
+        PostLeaderboard.update(stale, decreased=True)
+
+        self.assertEqual(
+            set(PostRanking.objects.filter(post_id=post.id).values_list("like_count", flat=True)),
+            {2},
+        )
+        self.assert_leaderboard_matches()
+
+    @mock.patch.object(PostLeaderboard, "LEADERBOARD_SIZE", 3)
+    def test_ranking_size_is_bounded(self) -> None:
+        PostLeaderboard.rebuild(PostRanking.SCOPE_ALL)
+        for index, post in enumerate(self.posts):
+            for user in self.users[: index % len(self.users)]:
+                PostService.toggle_like(post_id=post.id, user_id=user.id)
+        PostService.toggle_like(post_id=self.posts[0].id, user_id=self.users[4].id)
+
+        self.assertLessEqual(PostRanking.objects.filter(scope=PostRanking.SCOPE_ALL).count(), 3)
+        self.assertEqual(PostLeaderboard.get_top_post_ids(limit=3), self.expected_ids(limit=3))
+
+    def test_empty_scope_read_does_not_write(self) -> None:
+        # 구성되지 않은 범위는 게시글 테이블에서 직접 조회 (랭킹 테이블에 쓰지 않음)
+        PostRanking.objects.filter(scope=Post.Category.RATTAN).delete()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(
+                PostLeaderboard.get_top_post_ids(category=Post.Category.RATTAN),
+                self.expected_ids(Post.Category.RATTAN),
+            )
+            self.assertEqual(PostLeaderboard.get_top_post_ids(category=Post.Category.WOOD), [])
+        self.assertTrue(
+            all(query["sql"].startswith("SELECT") for query in context.captured_queries)
+        )
+
+        self.assertFalse(PostRanking.objects.filter(scope=Post.Category.RATTAN).exists())
+
+        call_command("rebuild_post_rankings", scope=[Post.Category.RATTAN], stdout=io.StringIO())
+        self.assertEqual(
+            PostLeaderboard.get_top_post_ids(category=Post.Category.RATTAN),
+            self.expected_ids(Post.Category.RATTAN),
+        )
+
+    @mock.patch.object(PostLeaderboard, "LEADERBOARD_SIZE", 3)
+    def test_insert_trims_overflowed_scope(self) -> None:
+        # 동시 추가 등으로 LEADERBOARD_SIZE 를 넘은 범위도 다음 추가 때 정리
+        self.assertEqual(PostRanking.objects.filter(scope=PostRanking.SCOPE_ALL).count(), 8)
+        PostService.toggle_like(post_id=self.posts[0].id, user_id=self.users[0].id)
+        PostRanking.objects.filter(scope=PostRanking.SCOPE_ALL, post=self.posts[0]).delete()
+        PostService.toggle_like(post_id=self.posts[0].id, user_id=self.users[1].id)
+
+        self.assertEqual(PostRanking.objects.filter(scope=PostRanking.SCOPE_ALL).count(), 3)
+        self.assertEqual(PostLeaderboard.get_top_post_ids(limit=3), self.expected_ids(limit=3))
+
+    def test_deleted_post_is_removed_and_slot_refilled(self) -> None:
+        PostService.toggle_like(post_id=self.posts[2].id, user_id=self.users[1].id)
+        self.assertEqual(PostLeaderboard.get_top_post_ids()[0], self.posts[2].id)
+
+        PostService.delete_post(post_id=self.posts[2].id, user_id=self.users[0].id)
+        self.assertNotIn(self.posts[2].id, PostLeaderboard.get_top_post_ids())
+        self.assert_leaderboard_matches()
+
+    def test_category_change_moves_ranking(self) -> None:
+        post = self.posts[1]
+        PostService.update_post(
+            post_id=post.id, user_id=self.users[0].id, data={"category": Post.Category.WOOD}
+        )
+        self.assertIn(post.id, PostLeaderboard.get_top_post_ids(category=Post.Category.WOOD))
+        self.assert_leaderboard_matches()
+
+
+class ViewCountBufferTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        user = create_user("viewer")
+        cls.posts = [
+            Post.objects.create(
+                user=user, title=f"title {i}", content="content", category=Post.Category.GIFT
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self) -> None:
+        self.buffer = ViewCountBuffer()
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=60, VIEW_COUNT_MAX_PENDING=1000)
+    def test_increments_are_batched_into_one_update(self) -> None:
+        with mock.patch.object(self.buffer, "_ensure_flusher"):
+            for _ in range(5):
+                self.buffer.add(self.posts[0].id)
+            self.buffer.add(self.posts[1].id)
+
+        self.assertEqual(self.buffer.pending(self.posts[0].id), 5)
+        self.assertEqual(Post.objects.get(id=self.posts[0].id).view_count, 0)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(len(context.captured_queries), 1)
+
+        self.assertEqual(self.buffer.pending(self.posts[0].id), 0)
+        self.assertEqual(Post.objects.get(id=self.posts[0].id).view_count, 5)
+        self.assertEqual(Post.objects.get(id=self.posts[1].id).view_count, 1)
+        self.assertEqual(Post.objects.get(id=self.posts[2].id).view_count, 0)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=60, VIEW_COUNT_MAX_PENDING=3)
+    def test_pending_limit_wakes_flusher(self) -> None:
+        # 요청 스레드에서는 반영하지 않고 백그라운드 스레드를 깨움
+        flushed = threading.Event()
+        with mock.patch.object(self.buffer, "flush", side_effect=flushed.set):
+            with self.assertNumQueries(0):
+                for _ in range(3):
+                    self.buffer.add(self.posts[0].id)
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(self.buffer.pending(self.posts[0].id), 3)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=60, VIEW_COUNT_MAX_PENDING=3)
+    def test_rolled_back_request_keeps_buffered_increments(self) -> None:
+        with mock.patch.object(self.buffer, "_ensure_flusher"):
+            self.buffer.add(self.posts[1].id)
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    for _ in range(2):
+                        self.buffer.add(self.posts[0].id)
+                    raise RuntimeError
+
+        self.assertEqual(self.buffer.pending(self.posts[0].id), 2)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(Post.objects.get(id=self.posts[0].id).view_count, 2)
+        self.assertEqual(Post.objects.get(id=self.posts[1].id).view_count, 1)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=60)
+    def test_failed_flush_keeps_increments(self) -> None:
+        with mock.patch.object(self.buffer, "_ensure_flusher"):
+            self.buffer.add(self.posts[0].id)
+
+        with mock.patch.object(ViewCountBuffer, "_apply", side_effect=RuntimeError):
+            with self.assertLogs("posts.view_counts", level="ERROR"):
+                self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.pending(self.posts[0].id), 1)
+
+        self.buffer.flush()
+        self.assertEqual(Post.objects.get(id=self.posts[0].id).view_count, 1)
+
+
+class PostLikeToggleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("like")
+        cls.post = Post.objects.create(
+            user=cls.user, title="title", content="content", category=Post.Category.WOOD
+        )
+
+    def test_toggle_returns_state_and_count(self) -> None:
+        self.assertEqual(
+            PostService.toggle_like(post_id=self.post.id, user_id=self.user.id), (True, 1)
+        )
+        self.assertTrue(PostLike.objects.filter(post=self.post, user=self.user).exists())
+
+        self.assertEqual(
+            PostService.toggle_like(post_id=self.post.id, user_id=self.user.id), (False, 0)
+        )
+        self.assertFalse(PostLike.objects.filter(post=self.post, user=self.user).exists())
+        self.assertEqual(Post.objects.get(id=self.post.id).like_count, 0)
+
+    def test_toggle_is_a_single_statement(self) -> None:
+        with mock.patch.object(PostLeaderboard, "update"):
+            with CaptureQueriesContext(connection) as context:
+                PostService.toggle_like(post_id=self.post.id, user_id=self.user.id)
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_toggle_on_deleted_post_raises_not_found(self) -> None:
+        self.post.delete()
+        with self.assertRaises(Http404):
+            PostService.toggle_like(post_id=self.post.id, user_id=self.user.id)
+        self.assertFalse(PostLike.objects.exists())
+
+    def test_like_view_response(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(f"/api/posts/{self.post.id}/like/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["is_liked"], True)
+        self.assertEqual(response.json()["like_count"], 1)
+
+
+class PostLikeStatusTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("status")
+        cls.posts = [
+            Post.objects.create(
+                user=cls.user, title=f"title {i}", content="content", category=Post.Category.GIFT
+            )
+            for i in range(10)
+        ]
+        for post in cls.posts[::3]:
+            PostLike.objects.create(post=post, user=cls.user)
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.liked_ids = {post.id for post in self.posts[::3]}
+
+    def test_batch_status(self) -> None:
+        post_ids = [post.id for post in self.posts]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                "/api/posts/liked/", {"post_ids": ",".join(map(str, post_ids))}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["data"],
+            {str(post_id): post_id in self.liked_ids for post_id in post_ids},
+        )
+        like_queries = [q for q in context.captured_queries if 'FROM "post_likes"' in q["sql"]]
+        self.assertEqual(len(like_queries), 1)
+
+    def test_batch_status_rejects_invalid_ids(self) -> None:
+        response = self.client.get("/api/posts/liked/", {"post_ids": "1,a"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_schema_operation_ids_do_not_collide(self) -> None:
+        paths = SchemaGenerator().get_schema(request=None, public=True)["paths"]
+        self.assertEqual(
+            paths["/api/posts/liked/"]["get"]["operationId"], "posts_like_status_retrieve"
+        )
+        self.assertEqual(
+            paths["/api/posts/{post_id}/liked/"]["get"]["operationId"], "posts_liked_retrieve"
+        )
+
+    def test_post_list_fills_is_liked_with_one_query(self) -> None:
+        for limit in (5, 10):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get("/api/posts/", {"limit": limit})
+            data = response.json()["data"]
+            self.assertEqual(len(data), limit)
+            for post in data:
+                self.assertEqual(post["is_liked"], post["id"] in self.liked_ids)
+            like_queries = [q for q in context.captured_queries if 'FROM "post_likes"' in q["sql"]]
+            self.assertEqual(len(like_queries), 1)
+
+    def test_anonymous_post_list_is_not_liked(self) -> None:
+        response = APIClient().get("/api/posts/")
+        self.assertFalse(any(post["is_liked"] for post in response.json()["data"]))
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class PostDetailCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = create_user("author")
+        cls.reader = create_user("reader", User.Role.COMPANY)
+        cls.post = PostService.create_post(
+            user_id=cls.author.id,
+            data={"title": "title", "content": "content", "category": Post.Category.GIFT},
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.url = f"/api/posts/{self.post.id}/"
+
+    def get_detail(self) -> Any:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        self.assertEqual(self.get_detail()["X-Cache"], "MISS")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_detail()
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertFalse(any('FROM "comments"' in q["sql"] for q in context.captured_queries))
+
+    def test_stats_are_kept_in_shared_cache(self) -> None:
+        self.get_detail()
+        self.get_detail()
+        self.assertEqual(cache.get(PostDetailCache.stats_key("hits")), 1)
+        self.assertEqual(cache.get(PostDetailCache.stats_key("misses")), 1)
+
+        # 다른 워커가 기록한 횟수도 함께 조회
+        cache.incr(PostDetailCache.stats_key("hits"), 2)
+        self.client.force_authenticate(create_user("cache-admin", is_staff=True))
+        response = self.client.get("/api/posts/cache/stats/")
+        self.assertEqual(response.json(), {"hits": 3, "misses": 1, "hit_ratio": 0.75})
+
+    def test_view_count_is_live_on_cache_hit(self) -> None:
+        first = self.get_detail().json()["view_count"]
+        second = self.get_detail().json()["view_count"]
+        self.assertEqual(second, first + 1)
+
+    def test_like_invalidates_and_is_liked_is_per_user(self) -> None:
+        self.get_detail()
+        self.client.post(f"/api/posts/{self.post.id}/like/")
+
+        response = self.get_detail()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["like_count"], 1)
+        self.assertTrue(response.json()["is_liked"])
+
+        anonymous = APIClient().get(self.url)
+        self.assertEqual(anonymous["X-Cache"], "HIT")
+        self.assertFalse(anonymous.json()["is_liked"])
+
+    def test_comment_and_post_writes_invalidate(self) -> None:
+        self.get_detail()
+        comment = CommentService.create_comment(
+            post_id=self.post.id, user_id=self.reader.id, data={"content": "hello"}
+        )
+        response = self.get_detail()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+        CommentService.update_comment(
+            comment_id=comment.id, user_id=self.reader.id, data={"content": "edited"}
+        )
+        response = self.get_detail()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["comments"][0]["content"], "edited")
+
+        PostService.update_post(
+            post_id=self.post.id, user_id=self.author.id, data={"title": "new title"}
+        )
+        response = self.get_detail()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["title"], "new title")
+
+        PostService.delete_post(post_id=self.post.id, user_id=self.author.id)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_writes_from_stale_copy_keep_concurrent_counters(self) -> None:
+        # 조회 후 저장 전에 좋아요 / 조회 수 / 버전이 갱신되어도 되돌리지 않음
+        def concurrent_update() -> None:
+            Post.objects.filter(id=self.post.id).update(
+                like_count=F("like_count") + 7, view_count=F("view_count") + 9
+            )
+            PostService.bump_version(self.post.id)
+
+        for write in [
+            lambda: PostService.update_post(
+                post_id=self.post.id, user_id=self.author.id, data={"title": "new title"}
+            ),
+            lambda: PostService.delete_post(post_id=self.post.id, user_id=self.author.id),
+        ]:
+            stale = Post.all_objects.get(id=self.post.id)
+            concurrent_update()
+            expected = Post.all_objects.values("like_count", "view_count", "version").get(
+                id=self.post.id
+            )
+            with mock.patch("posts.services.get_object_or_404", return_value=stale):
+                write()
+
+            saved = Post.all_objects.get(id=self.post.id)
+            self.assertEqual(saved.like_count, expected["like_count"])
+            self.assertEqual(saved.view_count, expected["view_count"])
+            # 쓰기마다 버전은 동시 갱신 이후 값에서 1 증가
+            self.assertEqual(saved.version, expected["version"] + 1)
+
+        self.assertEqual((saved.title, saved.is_deleted), ("new title", True))
+
+
+class PostListCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = create_user("author")
+        for category in [Post.Category.GIFT, Post.Category.FLOWER]:
+            PostService.create_post(
+                user_id=cls.author.id,
+                data={"title": "title", "content": "content", "category": category},
+            )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+
+    def get_list(self, **params: Any) -> Any:
+        response = self.client.get("/api/posts/", params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_anonymous_list_is_cached(self) -> None:
+        self.assertEqual(self.get_list(limit=5)["X-Cache"], "MISS")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_list(limit=5)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertFalse(any('FROM "posts"' in q["sql"] for q in context.captured_queries))
+        self.assertEqual(len(response.json()["data"]), 2)
+
+        # cursor / limit 별로 별도 캐시
+        self.assertEqual(self.get_list(limit=10)["X-Cache"], "MISS")
+
+    def test_authenticated_list_is_not_cached(self) -> None:
+        self.client.force_authenticate(self.author)
+        self.assertNotIn("X-Cache", self.get_list())
+        self.assertNotIn("X-Cache", self.get_list())
+
+    def test_write_invalidates_only_its_category(self) -> None:
+        for category in [None, Post.Category.GIFT, Post.Category.FLOWER]:
+            params = {"category": category} if category else {}
+            self.get_list(**params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PostService.create_post(
+                user_id=self.author.id,
+                data={"title": "new", "content": "new", "category": Post.Category.GIFT},
+            )
+
+        response = self.get_list(category=Post.Category.GIFT)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()["data"]), 2)
+        self.assertEqual(self.get_list()["X-Cache"], "MISS")
+        self.assertEqual(self.get_list(category=Post.Category.FLOWER)["X-Cache"], "HIT")
+
+    def test_concurrent_misses_build_once(self) -> None:
+        request = RequestFactory().get("/api/posts/")
+        calls: List[int] = []
+
+        def build() -> Dict[str, Any]:
+            calls.append(1)
+            time.sleep(0.1)
+            return {"data": []}
+
+        results: List[bool] = []
+        barrier = threading.Barrier(8)
+
+        def worker() -> None:
+            barrier.wait()
+            results.append(PostListCache.get_or_build(None, None, 10, request, build)[1])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [False] + [True] * 7)
+
+    def test_stale_entry_is_served_while_rebuilding(self) -> None:
+        request = RequestFactory().get("/api/posts/")
+        key = PostListCache.key(None, None, 10, request)
+        cache.set(key, {"body": {"data": ["stale"]}, "expires_at": time.time() - 1}, 60)
+        cache.add(f"{key}:lock", 1, 60)
+
+        body, hit = PostListCache.get_or_build(
+            None, None, 10, request, lambda: self.fail("다른 요청이 재생성 중")
+        )
+        self.assertTrue(hit)
+        self.assertEqual(body, {"data": ["stale"]})
+
+    def test_empty_cache_waits_briefly_then_builds(self) -> None:
+        # 재생성 중인 요청이 끝나지 않아도 WAIT_TIMEOUT 후 직접 조회
+        request = RequestFactory().get("/api/posts/")
+        key = PostListCache.key(None, None, 10, request)
+        cache.add(f"{key}:lock", 1, 60)
+
+        started = time.monotonic()
+        body, hit = PostListCache.get_or_build(None, None, 10, request, lambda: {"data": []})
+        elapsed = time.monotonic() - started
+
+        self.assertFalse(hit)
+        self.assertEqual(body, {"data": []})
+        self.assertGreaterEqual(elapsed, PostListCache.WAIT_TIMEOUT)
+        self.assertLess(elapsed, PostListCache.WAIT_TIMEOUT + 0.5)
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=60)
+class PostConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = create_user("author")
+        cls.reader = create_user("reader", User.Role.COMPANY)
+        cls.posts = [
+            PostService.create_post(
+                user_id=cls.author.id,
+                data={"title": f"title {i}", "content": "content", "category": Post.Category.WOOD},
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def tearDown(self) -> None:
+        # 버퍼에 남은 조회수를 다른 테스트로 넘기지 않음
+        with mock.patch.object(ViewCountBuffer, "_apply"):
+            view_count_buffer.flush()
+
+    def assert_not_modified(self, url: str, etag: str, max_queries: int, **params: Any) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        # ATOMIC_REQUESTS 의 SAVEPOINT 문은 제외
+        queries = [q for q in context.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertLessEqual(len(queries), max_queries)
+
+    def test_detail_returns_304_until_like(self) -> None:
+        url = f"/api/posts/{self.posts[0].id}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assert_not_modified(url, etag, max_queries=1)
+
+        self.client.post(f"/api/posts/{self.posts[0].id}/like/")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_liked"])
+
+        # 다른 사용자의 ETag 는 일치하지 않음
+        anonymous = APIClient().get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(anonymous.status_code, 200)
+        self.assertFalse(anonymous.json()["is_liked"])
+
+    def test_authenticated_list_returns_304_until_change(self) -> None:
+        for params in [{}, {"category": Post.Category.WOOD}, {"top_liked": "true"}]:
+            etag = self.client.get("/api/posts/", params)["ETag"]
+            self.assert_not_modified("/api/posts/", etag, max_queries=1, **params)
+
+        etag = self.client.get("/api/posts/")["ETag"]
+        self.client.post(f"/api/posts/{self.posts[1].id}/like/")
+        self.assertEqual(self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_anonymous_cached_list_returns_304_without_queries(self) -> None:
+        self.client = APIClient()
+        etag = self.client.get("/api/posts/")["ETag"]
+        self.assert_not_modified("/api/posts/", etag, max_queries=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PostService.update_post(
+                post_id=self.posts[2].id, user_id=self.author.id, data={"title": "edited"}
+            )
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"][0]["title"], "edited")
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class PostDetailCommentPageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("writer")
+        cls.post = PostService.create_post(
+            user_id=cls.user.id,
+            data={"title": "title", "content": "content", "category": Post.Category.RESIN},
+        )
+        comments = [
+            CommentService.create_comment(
+                post_id=cls.post.id, user_id=cls.user.id, data={"content": f"comment {i}"}
+            )
+            for i in range(25)
+        ]
+        CommentService.delete_comment(comment_id=comments[-1].id, user_id=cls.user.id)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_detail_embeds_first_page_of_live_comments(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            body = self.client.get(f"/api/posts/{self.post.id}/").json()
+
+        limit = PostService.DETAIL_COMMENT_LIMIT
+        self.assertEqual(len(body["comments"]), limit)
+        self.assertFalse(any(comment["is_deleted"] for comment in body["comments"]))
+        self.assertTrue(body["comments_has_next"])
+
+        # 댓글은 게시글별 윈도우로 limit + 1 개만 조회
+        comment_queries = [q for q in context.captured_queries if 'FROM "comments"' in q["sql"]]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertIn("ROW_NUMBER", comment_queries[0]["sql"])
+
+        # 댓글 목록 API 의 cursor 로 이어서 조회
+        seen = [comment["id"] for comment in body["comments"]]
+        cursor = body["comments_next_cursor"]
+        while cursor:
+            page = self.client.get(
+                f"/api/comment/{self.post.id}/comments/", {"cursor": cursor, "limit": limit}
+            ).json()
+            seen.extend(comment["id"] for comment in page["data"])
+            cursor = page["next_cursor"]
+
+        expected = list(
+            Comment.objects.filter(post=self.post, is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_post_without_more_comments_has_no_cursor(self) -> None:
+        post = PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "title", "content": "content", "category": Post.Category.RESIN},
+        )
+        body = self.client.get(f"/api/posts/{post.id}/").json()
+        self.assertEqual(body["comments"], [])
+        self.assertFalse(body["comments_has_next"])
+        self.assertIsNone(body["comments_next_cursor"])
+
+
+class PostListProjectionTest(TestCase):
+    # 목록 조회는 목록 응답에 필요한 컬럼만 조회하고 행마다 추가 쿼리가 발생하지 않아야 함
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("writer")
+        cls.posts = [
+            PostService.create_post(
+                user_id=cls.user.id,
+                data={
+                    "title": f"라탄 {i}",
+                    "content": "x" * 1000,
+                    "category": Post.Category.RATTAN,
+                },
+            )
+            for i in range(12)
+        ]
+        for post in cls.posts:
+            CommentService.create_comment(
+                post_id=post.id, user_id=cls.user.id, data={"content": "comment"}
+            )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_projected(self, url: str, params: Dict[str, Any], snippet: bool = False) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"])
+
+        sqls = [q["sql"] for q in context.captured_queries if "SAVEPOINT" not in q["sql"]]
+        post_queries = [sql for sql in sqls if sql.startswith("SELECT") and 'FROM "posts"' in sql]
+        self.assertTrue(post_queries)
+        for sql in post_queries:
+            # 검색 결과는 본문 전체 대신 스니펫 범위만 잘라서 조회
+            self.assertEqual('"posts"."content"' in sql, snippet, sql)
+            self.assertEqual('SUBSTRING("posts"."content"' in sql, snippet, sql)
+            self.assertNotIn(', "posts"."search_vector"', sql.split(" FROM ")[0])
+        self.assertFalse(any('FROM "post_images"' in sql for sql in sqls))
+        self.assertFalse(any('FROM "comments"' in sql for sql in sqls))
+        # ETag 확인 / 랭킹 / 게시글 / 좋아요 여부 조회 외에 행마다 발생하는 쿼리 없음
+        self.assertLessEqual(len(sqls), 4)
+
+    def test_post_list(self) -> None:
+        self.assert_projected("/api/posts/", {})
+        self.assert_projected("/api/posts/", {"category": Post.Category.RATTAN, "limit": 5})
+        self.assert_projected("/api/posts/", {"top_liked": "true"})
+
+    def test_search_loads_snippet_for_highlight(self) -> None:
+        self.assert_projected("/api/posts/", {"search": "라탄"}, snippet=True)
+
+    def test_user_posts(self) -> None:
+        # UserPostListView 는 URL 에 연결되어 있지 않으므로 서비스 + 시리얼라이저로 확인
+        with CaptureQueriesContext(connection) as context:
+            posts, _, _ = PostService.get_user_posts(user_id=self.user.id)
+            PostListSerializer(posts, many=True, context={"liked_post_ids": set()}).data
+
+        sqls = [q["sql"] for q in context.captured_queries]
+        self.assertEqual(len(sqls), 1)
+        self.assertNotIn('"posts"."content"', sqls[0])
+
+
+class FastSerializerParityTest(TestCase):
+    # 빠른 직렬화 결과가 DRF 시리얼라이저와 바이트 단위로 같은지 확인
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.workshop = create_user("workshop", nickname='<공방> & "따옴표"', workshop_name="<공방>")
+        cls.company = create_user("company", User.Role.COMPANY)
+        cls.posts = []
+        for i, category in enumerate([Post.Category.RATTAN, Post.Category.FLOWER] * 4):
+            post = PostService.create_post(
+                user_id=[cls.workshop, cls.company][i % 2].id,
+                data={
+                    "title": f"라탄 <b>바구니</b> {i}",
+                    "content": "설명 " * i + "라탄 & 마크라메 \U0001F33F\n" * 30,
+                    "category": category,
+                },
+            )
+            cls.posts.append(post)
+            PostImage.objects.create(post=post, image_url=f"posts/{post.id}.jpg")
+        PostImage.objects.create(
+            post=cls.posts[0],
+            image_url=f"posts/{cls.posts[0].id}-2.jpg",
+            width=1000,
+            height=500,
+            variants=[
+                {
+                    "name": f"posts/{cls.posts[0].id}-2.{w}w.webp",
+                    "width": w,
+                    "height": h,
+                    "format": "webp",
+                }
+                for w, h in [(320, 160), (720, 360)]
+            ],
+        )
+
+        cls.post = cls.posts[0]
+        for i in range(PostService.DETAIL_COMMENT_LIMIT + 3):
+            CommentService.create_comment(
+                post_id=cls.post.id,
+                user_id=[cls.workshop, cls.company][i % 2].id,
+                data={"content": f"댓글 {i} 😀"},
+            )
+        PostService.toggle_like(post_id=cls.post.id, user_id=cls.workshop.id)
+
+    def request(self, user: Optional[User] = None) -> Request:
+        request = Request(RequestFactory().get("/api/posts/"))
+        request.user = user or AnonymousUser()
+        return request
+
+    def assert_same_bytes(self, expected: Any, actual: Any) -> None:
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(expected), renderer.render(actual))
+
+    def assert_list_parity(self, posts: List[Post], context: Dict[str, Any]) -> None:
+        self.assertTrue(posts)
+        expected = PostListSerializer(posts, many=True, context=context).data
+        self.assert_same_bytes(expected, serialize_post_list(posts, context))
+
+    def test_post_list(self) -> None:
+        liked = {self.post.id}
+        for posts in [
+            PostService.get_post_list(limit=10)[0],
+            PostService.get_post_list(category=Post.Category.RATTAN, limit=5)[0],
+            PostService.get_post_list(is_top_liked=True)[0],
+            PostService.get_user_posts(user_id=self.workshop.id)[0],
+        ]:
+            self.assert_list_parity(posts, {"liked_post_ids": liked})
+            self.assert_list_parity(posts, {})
+
+    def test_search_highlight(self) -> None:
+        posts, _, _ = PostService.search_posts(search_keyword="라탄 바구니")
+        self.assert_list_parity(posts, {"liked_post_ids": set(), "search_keyword": "라탄 바구니"})
+
+    @override_settings(TIME_ZONE="Asia/Seoul")
+    def test_datetime_follows_time_zone(self) -> None:
+        self.assert_list_parity(PostService.get_post_list()[0], {})
+        post = PostService.get_post_detail(post_id=self.post.id)
+        context = {"request": self.request(), "user_id": None}
+        self.assert_same_bytes(
+            PostDetailSerializer(post, context=context).data, serialize_post_detail(post, context)
+        )
+
+    def test_post_detail(self) -> None:
+        post = PostService.get_post_detail(post_id=self.post.id)
+        # 삭제된 댓글 표시 문구 확인 (첫 페이지는 삭제되지 않은 댓글만 조회하므로 직접 표시)
+        post.comment_page[0].is_deleted = True
+
+        contexts = [
+            {"request": self.request(), "user_id": None},
+            {"request": self.request(self.workshop)},
+            {"request": self.request(self.company)},
+            {"request": self.request(self.workshop), "user_id": self.company.id},
+        ]
+        for context in contexts:
+            expected = PostDetailSerializer(post, context=context).data
+            self.assert_same_bytes(expected, serialize_post_detail(post, context))
+
+        # 좋아요를 prefetch 한 경우
+        post = PostService.get_post_detail(post_id=self.post.id, user_id=self.workshop.id)
+        context = {"request": self.request(self.workshop)}
+        expected = PostDetailSerializer(post, context=context).data
+        self.assertTrue(expected["is_liked"])
+        self.assert_same_bytes(expected, serialize_post_detail(post, context))
+
+    def test_views_match_drf_serializers(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.company)
+        response = client.get(f"/api/posts/{self.post.id}/")
+        post = PostService.get_post_detail(post_id=self.post.id)
+        context = {"request": response.wsgi_request, "user_id": None}
+        expected = dict(PostDetailSerializer(post, context=context).data)
+        expected["view_count"] = response.json()["view_count"]
+        self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected)))
+
+
+class FastJSONRendererTest(TestCase):
+    # orjson 렌더러 출력이 DRF 기본 JSONRenderer 와 같은지 확인
+
+    def payload(self) -> Dict[str, Any]:
+        seoul = datetime.timezone(datetime.timedelta(hours=9))
+        return {
+            "utc": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            "seoul": datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=seoul),
+            "naive": datetime.datetime(2025, 1, 2, 3, 4, 5),
+            "date": datetime.date(2025, 1, 2),
+            "time": datetime.time(3, 4, 5, 6),
+            "delta": datetime.timedelta(minutes=90),
+            "decimal": decimal.Decimal("12.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": gettext_lazy("Active"),
+            "text": "한글 <mark>&</mark> \u2028 \u2029 😀",
+            "int_keys": {1: True, 2: False},
+            "nested": [{"a": None, "b": 1.5, "c": (1, 2)}, {3}],
+            "big": 2**40,
+        }
+
+    def test_output_matches_drf_renderer(self) -> None:
+        payload = self.payload()
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_indent_matches_drf_renderer(self) -> None:
+        payload = {"a": [1, {"b": "한글"}]}
+        media_type = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(payload, media_type),
+            JSONRenderer().render(payload, media_type),
+        )
+
+    def test_image_field_is_rendered_as_url(self) -> None:
+        image = PostImage(image_url="posts/image.jpg")
+        request = Request(RequestFactory().get("/api/posts/", SERVER_NAME="hands.n-e.kr"))
+
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render({"image": image.image_url})),
+            {"image": "/media/posts/image.jpg"},
+        )
+        rendered = FastJSONRenderer().render(
+            {"image": image.image_url, "empty": PostImage().image_url},
+            renderer_context={"request": request},
+        )
+        self.assertEqual(
+            json.loads(rendered),
+            {"image": "http://hands.n-e.kr/media/posts/image.jpg", "empty": None},
+        )
+
+    def test_streaming_response_yields_chunks(self) -> None:
+        consumed: List[int] = []
+
+        def items() -> Iterator[Dict[str, Any]]:
+            for i in range(5000):
+                consumed.append(i)
+                yield {"id": i, "created_at": self.payload()["utc"], "text": "x" * 50}
+
+        response = StreamingJSONResponse(items(), extra={"total_count": 5000})
+        chunks = iter(response.streaming_content)
+
+        first = next(chunks)
+        # 첫 청크를 보낼 때 전체 목록을 인코딩하지 않음
+        self.assertLess(len(consumed), 5000)
+        self.assertLessEqual(len(first), STREAM_CHUNK_SIZE + 200)
+
+        body = json.loads(first + b"".join(chunks))
+        self.assertEqual(body["total_count"], 5000)
+        self.assertEqual([item["id"] for item in body["data"]], list(range(5000)))
+        self.assertEqual(body["data"][0]["created_at"], "2025-01-02T03:04:05.678901Z")
+
+    def test_empty_streaming_response(self) -> None:
+        response = StreamingJSONResponse(iter([]))
+        self.assertEqual(b"".join(response.streaming_content), b'{"data":[]}')
+
+
+class RecordingExecutor:
+    # 작업을 바로 실행하지 않고 기록 (run 호출 시 현재 스레드에서 실행 후 완료 콜백 호출)
+
+    def __init__(self) -> None:
+        self.jobs: List[Any] = []
+
+    def submit(self, fn: Any, *args: Any) -> Future:
+        future: Future = Future()
+        self.jobs.append((future, fn, args))
+        return future
+
+    def run(self) -> None:
+        for future, fn, args in self.jobs:
+            future.set_result(fn(*args))
+
+
+class ImageVariantPipelineTest(TempMediaRootMixin, TestCase):
+    media_settings = {"POST_IMAGE_VARIANT_WIDTHS": [320, 720, 1280]}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("variant")
+
+    @staticmethod
+    def image_bytes(width: int, height: int) -> bytes:
+        buffer = io.BytesIO()
+        Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, "JPEG")
+        return buffer.getvalue()
+
+    def save_image(self, post: Post, width: int, height: int) -> PostImage:
+        name = default_storage.save("posts/test.jpg", ContentFile(self.image_bytes(width, height)))
+        return PostImage.objects.create(post=post, image_url=name)
+
+    def test_render_variants(self) -> None:
+        path = os.path.join(settings.MEDIA_ROOT, "large.jpg")
+        with open(path, "wb") as f:
+            f.write(self.image_bytes(1600, 1200))
+
+        result = render_variants(path, [1280, 320, 720, 2000], 80)
+        self.assertEqual((result["width"], result["height"]), (1600, 1200))
+        self.assertEqual(
+            [(v["width"], v["height"]) for v in result["variants"]],
+            [(320, 240), (720, 540), (1280, 960), (1600, 1200)],
+        )
+        with Image.open(os.path.join(settings.MEDIA_ROOT, "large.720w.webp")) as variant:
+            self.assertEqual((variant.format, variant.size), ("WEBP", (720, 540)))
+
+        # 원본보다 큰 너비는 확대하지 않음
+        path = os.path.join(settings.MEDIA_ROOT, "small.jpg")
+        with open(path, "wb") as f:
+            f.write(self.image_bytes(200, 100))
+        result = render_variants(path, [320, 720], 80)
+        self.assertEqual([(v["width"], v["height"]) for v in result["variants"]], [(200, 100)])
+
+    @override_settings(POST_IMAGE_VARIANT_WORKERS=2, VIEW_COUNT_FLUSH_INTERVAL=60)
+    def test_upload_generates_variants_in_background(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        executor = RecordingExecutor()
+
+        with mock.patch.object(image_variant_pipeline, "_get_executor", return_value=executor):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(
+                    "/api/posts/create/",
+                    {
+                        "title": "이미지",
+                        "content": "이미지 변형본 테스트 본문",
+                        "category": Post.Category.RATTAN,
+                        "images": SimpleUploadedFile(
+                            "photo.jpg", self.image_bytes(1000, 500), content_type="image/jpeg"
+                        ),
+                    },
+                    format="multipart",
+                )
+
+        # 요청은 작업 등록만 하고 응답 (변형본 없음)
+        self.assertEqual(response.status_code, 201)
+        image = response.json()["images"][0]
+        self.assertEqual((image["variants"], image["srcset"]), ([], None))
+        self.assertEqual([fn for _, fn, _ in executor.jobs], [render_variants])
+
+        post_id = response.json()["id"]
+        version = Post.objects.get(id=post_id).version
+        executor.run()
+
+        image = PostImage.objects.get(post_id=post_id)
+        self.assertEqual((image.width, image.height), (1000, 500))
+        self.assertEqual([v["width"] for v in image.variants], [320, 720, 1000])
+        for variant in image.variants:
+            self.assertTrue(default_storage.exists(variant["name"]))
+        # 상세 캐시 무효화
+        self.assertEqual(Post.objects.get(id=post_id).version, version + 1)
+
+        data = client.get(f"/api/posts/{post_id}/").json()["images"][0]
+        self.assertEqual((data["width"], data["height"]), (1000, 500))
+        self.assertEqual(
+            [(v["width"], v["height"], v["format"]) for v in data["variants"]],
+            [(320, 160, "webp"), (720, 360, "webp"), (1000, 500, "webp")],
+        )
+        self.assertTrue(data["variants"][0]["url"].startswith("http://testserver/media/posts/"))
+        self.assertEqual(
+            data["srcset"], ", ".join(f"{v['url']} {v['width']}w" for v in data["variants"])
+        )
+
+    def test_backfill_command(self) -> None:
+        post = PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "백필", "content": "본문", "category": Post.Category.RATTAN},
+        )
+        images = [self.save_image(post, 800, 600), self.save_image(post, 400, 300)]
+        missing = PostImage.objects.create(post=post, image_url="posts/missing.jpg")
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("generate_image_variants", workers=1, stdout=stdout, stderr=stderr)
+        self.assertIn("변형본 생성 2개, 실패 1개", stdout.getvalue())
+        self.assertIn(f"PostImage {missing.id}", stderr.getvalue())
+
+        for image, widths in zip(images, [[320, 720, 800], [320, 400]]):
+            image.refresh_from_db()
+            self.assertEqual([v["width"] for v in image.variants], widths)
+
+        # 이미 생성된 이미지는 건너뜀
+        call_command("generate_image_variants", workers=0, stdout=stdout, stderr=stderr)
+        self.assertIn("변형본 생성 0개, 실패 1개", stdout.getvalue())
+
+
+class ImageValidatorTest(TempMediaRootMixin, TestCase):
+    media_settings = {"POST_IMAGE_VARIANT_WORKERS": 0}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("validator")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @staticmethod
+    def upload(
+        name: str, size: Any = (40, 30), image_format: str = "PNG", content_type: str = "image/png"
+    ) -> SimpleUploadedFile:
+        buffer = io.BytesIO()
+        Image.new("RGB", size, (10, 20, 30)).save(buffer, image_format)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+    def test_format_is_sniffed_from_magic_bytes(self) -> None:
+        # 클라이언트가 보낸 content_type 대신 실제 형식 사용
+        image = self.upload("a.html", image_format="PNG", content_type="image/jpeg")
+        ImageValidator.validate([image])
+        self.assertEqual((image.name, image.content_type), ("a.png", "image/png"))
+        self.assertEqual(ImageValidator.validate_image(image), ("PNG", "image/png", ".png", 40, 30))
+        self.assertEqual(image.tell(), 0)
+
+        fake = SimpleUploadedFile("a.png", b"<html>" * 100, content_type="image/png")
+        with self.assertRaisesMessage(ValidationError, "허용된 이미지 형식"):
+            ImageValidator.validate([fake])
+
+        # 매직 바이트만 맞고 헤더가 손상된 파일
+        truncated = SimpleUploadedFile("b.png", b"\x89PNG\r\n\x1a\n" + b"\0" * 10)
+        with self.assertRaisesMessage(ValidationError, "손상된 이미지 파일입니다"):
+            ImageValidator.validate([truncated])
+
+    @override_settings(POST_IMAGE_MAX_PIXELS=1_000_000)
+    def test_pixel_limit(self) -> None:
+        ImageValidator.validate([self.upload("ok.png", size=(1000, 1000))])
+        with self.assertRaisesMessage(ValidationError, "1백만 화소를 초과할 수 없습니다"):
+            ImageValidator.validate([self.upload("bomb.png", size=(1001, 1000))])
+
+    def test_parallel_validation_reports_first_error_in_order(self) -> None:
+        files = [self.upload(f"{i}.png") for i in range(4)]
+        files[1] = SimpleUploadedFile("1.png", b"not an image", content_type="image/png")
+        files[3] = self.upload("3.png", size=(1, 1))
+        files[3].size = ImageValidator.MAX_IMAGE_SIZE + 1
+
+        with self.assertRaisesMessage(ValidationError, "허용된 이미지 형식"):
+            ImageValidator.validate(files)
+        with self.assertRaisesMessage(ValidationError, "최대 10개"):
+            ImageValidator.validate([self.upload(f"{i}.png") for i in range(11)])
+
+    def test_create_and_update_use_validator(self) -> None:
+        fake = SimpleUploadedFile("fake.png", b"not an image", content_type="image/png")
+        response = self.client.post(
+            "/api/posts/create/",
+            {
+                "title": "이미지",
+                "content": "이미지 검증 테스트 본문",
+                "category": Post.Category.RATTAN,
+                "images": [self.upload("a.png"), fake],
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.filter(user=self.user).exists())
+
+        response = self.client.post(
+            "/api/posts/create/",
+            {
+                "title": "이미지",
+                "content": "이미지 검증 테스트 본문",
+                "category": Post.Category.RATTAN,
+                "images": [self.upload("a.png"), self.upload("b.gif", image_format="GIF")],
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 201)
+        post_id = response.json()["id"]
+
+        fake.seek(0)
+        response = self.client.patch(
+            f"/api/posts/{post_id}/update/", {"add_images": [fake]}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(PostImage.objects.filter(post_id=post_id).count(), 2)
+
+        response = self.client.patch(
+            f"/api/posts/{post_id}/update/",
+            {"add_images": [self.upload("c.jpg", image_format="JPEG")]},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["images"]), 3)
+
+
+class ZeroStream:
+    # 요청 본문 대신 사용하는 지연 생성 스트림 (전체 크기만큼 메모리를 쓰지 않음)
+
+    def __init__(self, size: int) -> None:
+        self.remaining = size
+
+    def read(self, size: int) -> bytes:
+        size = min(size, self.remaining)
+        self.remaining -= size
+        return bytes(size)
+
+
+class PostImageUploadTest(TempMediaRootMixin, TestCase):
+    media_settings = {"POST_IMAGE_VARIANT_WORKERS": 0}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("upload")
+        cls.other = create_user("upload-other")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (120, 80), os.urandom(120 * 80 * 3)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+
+    def create_upload(self, size: Optional[int] = None) -> str:
+        response = self.client.post(
+            "/api/posts/uploads/",
+            {"filename": "photo.jpeg", "size": size or len(self.content)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["id"]
+
+    def put_chunk(self, upload_id: str, start: int, end: int) -> Any:
+        return self.client.put(
+            f"/api/posts/uploads/{upload_id}/",
+            self.content[start:end],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end - 1}/{len(self.content)}",
+        )
+
+    def test_resumable_upload_and_post_reference(self) -> None:
+        upload_id = self.create_upload()
+        middle = len(self.content) // 2
+
+        response = self.put_chunk(upload_id, 0, middle)
+        self.assertEqual((response.status_code, response.json()["offset"]), (200, middle))
+
+        # 이미 받은 위치와 다른 청크는 거부하고 이어서 보낼 위치 반환
+        response = self.put_chunk(upload_id, middle + 10, len(self.content))
+        self.assertEqual((response.status_code, response.json()["offset"]), (409, middle))
+
+        # 완료 전 complete 거부
+        response = self.client.post(f"/api/posts/uploads/{upload_id}/complete/")
+        self.assertEqual(response.status_code, 400)
+
+        # 다른 사용자의 업로드는 조회 / 전송 불가
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.get(f"/api/posts/uploads/{upload_id}/").status_code, 404)
+
+        self.assertEqual(
+            self.client.get(f"/api/posts/uploads/{upload_id}/").json()["offset"], middle
+        )
+        response = self.put_chunk(upload_id, middle, len(self.content))
+        self.assertEqual(response.json()["offset"], len(self.content))
+
+        response = self.client.post(f"/api/posts/uploads/{upload_id}/complete/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.json()["status"], response.json()["width"], response.json()["height"]),
+            (PostImageUpload.Status.COMPLETED, 120, 80),
+        )
+        upload = PostImageUpload.objects.get(id=upload_id)
+        # 판별한 형식의 확장자로 게시글 이미지 경로에 저장
+        self.assertRegex(upload.image_name, r"^posts/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        with default_storage.open(upload.image_name) as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(os.path.exists(ImageUploadService.part_path(upload)))
+
+        response = self.client.post(
+            "/api/posts/create/",
+            {
+                "title": "이어 올리기",
+                "content": "이어 올리기 이미지 게시글 본문",
+                "category": Post.Category.RATTAN,
+                "upload_ids": [upload_id],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        image = response.json()["images"][0]
+        self.assertTrue(image["image_url"].endswith(upload.image_name))
+        self.assertEqual((image["width"], image["height"]), (120, 80))
+        self.assertFalse(PostImageUpload.objects.filter(id=upload_id).exists())
+
+        # 이미 사용한 업로드는 다시 참조할 수 없음
+        response = self.client.patch(
+            f"/api/posts/{response.json()['id']}/update/",
+            {"add_upload_ids": [upload_id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_complete_rejects_invalid_image(self) -> None:
+        self.content = b"not an image" * 10
+        upload_id = self.create_upload()
+        self.put_chunk(upload_id, 0, len(self.content))
+
+        response = self.client.post(f"/api/posts/uploads/{upload_id}/complete/")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            PostImageUpload.objects.get(id=upload_id).status, PostImageUpload.Status.UPLOADING
+        )
+
+    def test_chunk_memory_is_constant(self) -> None:
+        # 청크 크기와 관계없이 요청 본문을 COPY_BUFFER_SIZE 단위로 읽어 기록
+        peaks = []
+        for size in [256 * 1024, ImageValidator.MAX_IMAGE_SIZE]:
+            upload = ImageUploadService.create_upload(self.user.id, "big.png", size)
+            tracemalloc.start()
+            try:
+                upload = ImageUploadService.write_chunk(
+                    upload.id, self.user.id, 0, size, size, ZeroStream(size)
+                )
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            self.assertEqual(upload.offset, size)
+            self.assertEqual(os.path.getsize(ImageUploadService.part_path(upload)), size)
+            peaks.append(peak)
+
+        for peak in peaks:
+            self.assertLess(peak, 4 * ImageUploadService.COPY_BUFFER_SIZE)
+
+
+class MediaServingTest(TempMediaRootMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("media")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.storage = PostImage._meta.get_field("image_url").storage
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (30, 20), (1, 2, 3)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+        self.post = PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "미디어", "content": "본문", "category": Post.Category.RATTAN},
+        )
+        self.image = PostImage.objects.create(
+            post=self.post, image_url=SimpleUploadedFile("photo.png", self.content)
+        )
+
+    def nginx(self, response: Any) -> bytes:
+        # nginx 대역: internal location(MEDIA_ACCEL_PREFIX => MEDIA_ROOT)으로 내부 리다이렉트
+        location = response["X-Accel-Redirect"]
+        self.assertTrue(location.startswith(settings.MEDIA_ACCEL_PREFIX))
+        path = os.path.join(self.media_root, location[len(settings.MEDIA_ACCEL_PREFIX) :])
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_content_hash_storage(self) -> None:
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(self.image.image_url.name, f"posts/{digest[:2]}/{digest}.png")
+
+        # 같은 내용은 파일 이름과 관계없이 같은 파일 사용
+        other = PostImage.objects.create(
+            post=self.post, image_url=SimpleUploadedFile("again.PNG", self.content)
+        )
+        self.assertEqual(other.image_url.name, self.image.image_url.name)
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, "posts", digest[:2])), [f"{digest}.png"]
+        )
+        self.assertEqual(os.stat(self.image.image_url.path).st_mode & 0o777, 0o644)
+
+    @override_settings(MEDIA_SERVE_MODE="accel")
+    def test_accel_redirect(self) -> None:
+        response = self.client.get(self.image.image_url.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(
+            response["Cache-Control"],
+            f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable",
+        )
+        self.assertEqual(self.nginx(response), self.content)
+
+        # 해시 경로가 아닌 기존 파일은 짧게 캐시
+        name = default_storage.save("posts/2024/01/01/legacy.png", ContentFile(self.content))
+        response = self.client.get(f"/media/{name}")
+        self.assertEqual(response["Cache-Control"], f"public, max-age={settings.MEDIA_MAX_AGE}")
+        self.assertEqual(self.nginx(response), self.content)
+
+    @override_settings(MEDIA_SERVE_MODE="django")
+    def test_django_mode_and_private_paths(self) -> None:
+        response = self.client.get(self.image.image_url.url)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertNotIn("X-Accel-Redirect", response)
+
+        upload = ImageUploadService.create_upload(self.user.id, "a.png", 10)
+        for path in [
+            f"/media/uploads/{upload.id}.part",
+            "/media/../manage.py",
+            "/media/posts/../../manage.py",
+            f"/media/posts/{self.image.image_url.name.split('/')[1]}/.hidden",
+        ]:
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+
+    @override_settings(
+        MEDIA_SERVE_MODE="accel", MEDIA_ACCESS_CHECK="posts.media.can_access_post_media"
+    )
+    def test_access_check_hides_deleted_post_images(self) -> None:
+        variant = os.path.splitext(self.image.image_url.name)[0] + ".320w.webp"
+        urls = [self.image.image_url.url, f"/media/{variant}"]
+        for url in urls:
+            self.assertIn("X-Accel-Redirect", self.client.get(url))
+
+        PostService.delete_post(post_id=self.post.id, user_id=self.user.id)
+        for url in urls:
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+        # 작성자(JWT)는 조회 가능
+        token = AccessToken.for_user(self.user)
+        response = self.client.get(urls[0], HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertIn("X-Accel-Redirect", response)
+
+
+class ImageBlobTest(TempMediaRootMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("blob")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.storage = PostImage._meta.get_field("image_url").storage
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (30, 20), (4, 5, 6)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+        self.digest = hashlib.sha256(self.content).hexdigest()
+        self.hashed_name = f"posts/{self.digest[:2]}/{self.digest}.png"
+
+    def create_post(self, images: Optional[List[Any]] = None) -> Post:
+        return PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "공유", "content": "같은 사진", "category": Post.Category.RATTAN},
+            images=images,
+        )
+
+    def test_reference_count(self) -> None:
+        first = self.create_post([SimpleUploadedFile("a.png", self.content)])
+        second = self.create_post([SimpleUploadedFile("b.png", self.content)])
+
+        blob = ImageBlob.objects.get()
+        self.assertEqual(
+            (blob.name, blob.sha256, blob.size, blob.ref_count),
+            (self.hashed_name, self.digest, len(self.content), 2),
+        )
+
+        image_id = first.images.get().id
+        PostService.update_post(
+            post_id=first.id, user_id=self.user.id, data={}, remove_image_ids=str(image_id)
+        )
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        # 다른 게시글이 쓰고 있으므로 파일 유지
+        self.assertTrue(self.storage.exists(self.hashed_name))
+        self.assertEqual(second.images.get().image_url.name, self.hashed_name)
+
+        # 어긋난 카운터는 post_images 기준으로 재계산
+        ImageBlob.objects.update(ref_count=5)
+        self.assertEqual(ImageBlobService.recount(), 1)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(
+            ImageBlobService.stats(),
+            {
+                "blobs": 1,
+                "references": 1,
+                "physical_bytes": len(self.content),
+                "logical_bytes": len(self.content),
+            },
+        )
+
+    def test_release_locks_rows_in_name_order(self) -> None:
+        names = [f"posts/{c * 2}/{c * 64}.png" for c in "ba"]
+        ImageBlob.objects.bulk_create(
+            ImageBlob(name=name, sha256=ImageBlobService.digest(name), size=1, ref_count=2)
+            for name in names
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            ImageBlobService.release(names + names[:1])
+
+        # 갱신 전에 이름 순으로 잠금
+        self.assertIn("FOR UPDATE", queries[0]["sql"])
+        self.assertIn("ORDER BY name", queries[0]["sql"])
+        self.assertLess(queries[0]["sql"].index(names[1]), queries[0]["sql"].index(names[0]))
+        self.assertTrue(queries[1]["sql"].lstrip().startswith("UPDATE image_blobs"))
+        self.assertEqual(
+            dict(ImageBlob.objects.values_list("name", "ref_count")), {names[0]: 0, names[1]: 1}
+        )
+
+    def test_dedupe_command(self) -> None:
+        posts = [self.create_post(), self.create_post()]
+        legacy = []
+        for i, post in enumerate(posts):
+            name = default_storage.save(
+                f"posts/2024/0{i + 1}/01/photo.jpeg", ContentFile(self.content)
+            )
+            default_storage.save(name.replace(".jpeg", ".320w.webp"), ContentFile(b"variant"))
+            variants = [{"name": name.replace(".jpeg", ".320w.webp"), "width": 320, "height": 213}]
+            legacy.append(PostImage.objects.create(post=post, image_url=name, variants=variants))
+        versions = [post.version for post in Post.objects.order_by("id")]
+
+        out = io.StringIO()
+        call_command("dedupe_post_images", "--dry-run", stdout=out)
+        self.assertIn("파일 2개 처리, 중복 1개", out.getvalue())
+        for image in legacy:
+            self.assertTrue(default_storage.exists(image.image_url.name))
+        self.assertFalse(ImageBlob.objects.exists())
+
+        out = io.StringIO()
+        # 기존 파일은 커밋 후 삭제
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("dedupe_post_images", "--batch-size", "1", stdout=out)
+        self.assertIn("파일 2개 처리, 중복 1개", out.getvalue())
+
+        # 확장자는 시그니처 기준(PNG), 변형본도 같은 해시 경로로 이동
+        variant_name = f"posts/{self.digest[:2]}/{self.digest}.320w.webp"
+        for image in legacy:
+            old_name = image.image_url.name
+            image.refresh_from_db()
+            self.assertEqual(image.image_url.name, self.hashed_name)
+            self.assertEqual(image.variants[0]["name"], variant_name)
+            self.assertFalse(default_storage.exists(old_name))
+        self.assertEqual(self.storage.open(self.hashed_name).read(), self.content)
+        self.assertEqual(self.storage.open(variant_name).read(), b"variant")
+        self.assertEqual(ImageBlob.objects.get(name=self.hashed_name).ref_count, 2)
+        self.assertEqual(
+            [post.version for post in Post.objects.order_by("id")],
+            [version + 1 for version in versions],
+        )
+
+
+class MediaGarbageCollectorTest(TempMediaRootMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("gc")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.storage = PostImage._meta.get_field("image_url").storage
+        self.colors = iter(range(1, 255))
+
+    def image(self) -> SimpleUploadedFile:
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), (next(self.colors), 0, 0)).save(buffer, "PNG")
+        return SimpleUploadedFile("photo.png", buffer.getvalue())
+
+    def create_post(self, deleted_days_ago: Optional[int] = None) -> Post:
+        post = PostService.create_post(
+            user_id=self.user.id,
+            data={"title": "정리", "content": "미디어 정리", "category": Post.Category.RATTAN},
+            images=[self.image()],
+        )
+        if deleted_days_ago is not None:
+            Post.objects.filter(id=post.id).update(
+                is_deleted=True,
+                updated_at=timezone.now() - datetime.timedelta(days=deleted_days_ago),
+            )
+        return post
+
+    def age(self, name: str, seconds: int = 2 * 24 * 60 * 60) -> str:
+        # 파일 수정 시각을 과거로 변경
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(b"x" * 10)
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+        return name
+
+    def variant(self, name: str) -> str:
+        return os.path.splitext(name)[0] + ".320w.webp"
+
+    def test_collect(self) -> None:
+        live = self.create_post().images.get().image_url.name
+        # 보관 작업이 건너뛴 게시글 (잠금 등)
+        old_deleted = (
+            self.create_post(deleted_days_ago=settings.MEDIA_GC_DELETED_POST_DAYS + 1)
+            .images.get()
+            .image_url.name
+        )
+        new_deleted = self.create_post(deleted_days_ago=1).images.get().image_url.name
+        orphan = self.storage.save("posts/orphan.png", self.image())
+        ImageBlobService.register([orphan])
+        reuploaded = self.storage.save("posts/again.png", self.image())
+        recent = self.storage.save("posts/recent.png", self.image())
+
+        expired = ImageUploadService.create_upload(self.user.id, "a.png", 10)
+        PostImageUpload.objects.filter(id=expired.id).update(
+            updated_at=timezone.now() - datetime.timedelta(days=2)
+        )
+        active = ImageUploadService.create_upload(self.user.id, "b.png", 10)
+
+        kept = [
+            live,
+            self.variant(live),
+            new_deleted,
+            recent,
+            reuploaded,
+            f"uploads/{active.id}.part",
+        ]
+        removed = [
+            old_deleted,
+            orphan,
+            self.variant(orphan),
+            "posts/2024/01/01/legacy.png",
+            f"posts/{live.split('/')[1]}/.abc.tmp",
+            f"uploads/{expired.id}.part",
+        ]
+        for name in kept + removed:
+            if name != recent:
+                self.age(name)
+
+        out = io.StringIO()
+        call_command("collect_orphaned_media", "--dry-run", "--batch-size", "3", stdout=out)
+        self.assertIn(
+            "삭제 대상 파일 7개 (0.0 MiB), 만료 업로드 세션 1개, 삭제된 게시글 이미지 1개",
+            out.getvalue(),
+        )
+        for name in kept + removed:
+            self.assertTrue(os.path.exists(os.path.join(self.media_root, name)), name)
+
+        # 같은 내용이 다시 업로드되면 수정 시각이 갱신되어 유예 기간 동안 유지
+        with self.storage.open(reuploaded) as f:
+            self.assertEqual(self.storage.save("posts/x.png", f), reuploaded)
+
+        out = io.StringIO()
+        call_command("collect_orphaned_media", "--batch-size", "3", stdout=out)
+        self.assertIn("삭제 파일 6개", out.getvalue())
+        for name in kept:
+            self.assertTrue(os.path.exists(os.path.join(self.media_root, name)), name)
+        for name in removed:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, name)), name)
+
+        self.assertFalse(PostImageUpload.objects.filter(id=expired.id).exists())
+        self.assertTrue(PostImageUpload.objects.filter(id=active.id).exists())
+        self.assertEqual(
+            sorted(PostImage.objects.values_list("image_url", flat=True)),
+            sorted([live, new_deleted]),
+        )
+        self.assertEqual(
+            dict(ImageBlob.objects.values_list("name", "ref_count")),
+            {live: 1, new_deleted: 1},
+        )
+
+
+class SoftDeleteArchiveTest(TempMediaRootMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user("archive")
+
+    def create_post(self, title: str, images: Optional[List[Any]] = None) -> Post:
+        return PostService.create_post(
+            user_id=self.user.id,
+            data={"title": title, "content": "보관 테스트", "category": Post.Category.RATTAN},
+            images=images,
+        )
+
+    def age(self, model: Any, *ids: int, days: int = 100) -> None:
+        model.all_objects.filter(id__in=ids).update(
+            updated_at=timezone.now() - datetime.timedelta(days=days)
+        )
+
+    def test_default_manager_excludes_deleted_and_hidden(self) -> None:
+        live, hidden, deleted = (self.create_post(title) for title in ["공개", "숨김", "삭제"])
+        Post.objects.filter(id=hidden.id).update(status=Post.Status.HIDDEN)
+        PostService.delete_post(post_id=deleted.id, user_id=self.user.id)
+
+        self.assertEqual(list(Post.objects.values_list("id", flat=True)), [live.id])
+        self.assertEqual(Post.all_objects.count(), 3)
+        # 삭제 후에도 상세 캐시 버전은 증가
+        self.assertEqual(Post.all_objects.get(id=deleted.id).version, 1)
+
+        posts, _, _ = PostService.get_post_list()
+        self.assertEqual([post.id for post in posts], [live.id])
+        for post in [hidden, deleted]:
+            with self.assertRaises(Http404):
+                PostService.get_post_detail(post.id)
+
+        comment = CommentService.create_comment(live.id, self.user.id, {"content": "댓글"})
+        Comment.objects.filter(id=comment.id).update(status=Comment.Status.HIDDEN)
+        self.assertFalse(live.comments.exists())
+        self.assertTrue(Comment.all_objects.filter(id=comment.id).exists())
+
+    def test_archive_deleted_rows(self) -> None:
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), (7, 8, 9)).save(buffer, "PNG")
+        old = self.create_post("오래전 삭제", [SimpleUploadedFile("a.png", buffer.getvalue())])
+        recent = self.create_post("최근 삭제")
+        live = self.create_post("공개")
+
+        kept_comment = CommentService.create_comment(live.id, self.user.id, {"content": "유지"})
+        old_comment = CommentService.create_comment(live.id, self.user.id, {"content": "삭제"})
+        post_comment = CommentService.create_comment(old.id, self.user.id, {"content": "함께"})
+        CommentService.delete_comment(old_comment.id, self.user.id)
+        PostService.toggle_like(post_id=old.id, user_id=self.user.id)
+
+        for post in [old, recent]:
+            PostService.delete_post(post_id=post.id, user_id=self.user.id)
+        self.age(Post, old.id)
+        self.age(Comment, old_comment.id)
+        image_name = PostImage.objects.get(post=old).image_url.name
+
+        out = io.StringIO()
+        call_command("archive_deleted_rows", "--days", "90", "--batch-size", "1", stdout=out)
+        self.assertIn("게시글 1개, 댓글 1개 보관 완료", out.getvalue())
+
+        self.assertEqual(
+            sorted(Post.all_objects.values_list("id", flat=True)), sorted([recent.id, live.id])
+        )
+        self.assertEqual(list(Comment.all_objects.values_list("id", flat=True)), [kept_comment.id])
+        self.assertFalse(PostLike.objects.filter(post_id=old.id).exists())
+        self.assertFalse(PostImage.objects.filter(post_id=old.id).exists())
+        self.assertEqual(ImageBlob.objects.get(name=image_name).ref_count, 0)
+
+        archived = ArchivedPost.objects.get()
+        self.assertEqual((archived.id, archived.title), (old.id, "오래전 삭제"))
+        self.assertEqual(archived.data["images"], [image_name])
+        self.assertEqual(archived.data["like_count"], 1)
+        self.assertNotIn("search_vector", archived.data)
+        self.assertEqual(
+            dict(ArchivedComment.objects.values_list("id", "post_id")),
+            {old_comment.id: live.id, post_comment.id: old.id},
+        )
+        self.assertEqual(ArchivedComment.objects.get(id=old_comment.id).data["content"], "삭제")
+
+    def test_media_gc_leaves_images_for_archiver(self) -> None:
+        # 기본 설정으로 미디어 정리 후 보관해도 보관 데이터에 이미지 경로가 남아야 함
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), (1, 2, 3)).save(buffer, "PNG")
+        post = self.create_post("삭제", [SimpleUploadedFile("a.png", buffer.getvalue())])
+        PostService.delete_post(post_id=post.id, user_id=self.user.id)
+        self.age(Post, post.id, days=settings.SOFT_DELETE_ARCHIVE_DAYS + 1)
+        image_name = PostImage.objects.get(post=post).image_url.name
+
+        call_command("collect_orphaned_media", stdout=io.StringIO())
+        self.assertTrue(PostImage.objects.filter(post=post).exists())
+        call_command("archive_deleted_rows", stdout=io.StringIO())
+        self.assertEqual(ArchivedPost.objects.get(id=post.id).data["images"], [image_name])
+
+    def test_media_gc_retention_must_exceed_archive_window(self) -> None:
+        self.assertEqual(check_media_gc_retention(), [])
+        with override_settings(MEDIA_GC_DELETED_POST_DAYS=30, SOFT_DELETE_ARCHIVE_DAYS=90):
+            self.assertEqual([error.id for error in check_media_gc_retention()], ["posts.E001"])
+            with self.assertRaises(CommandError):
+                call_command("archive_deleted_rows", stdout=io.StringIO())
+        with override_settings(MEDIA_GC_DELETED_POST_DAYS=-1):
+            self.assertEqual(check_media_gc_retention(), [])
+        with self.assertRaises(CommandError):
+            call_command(
+                "collect_orphaned_media", "--deleted-post-days", "30", stdout=io.StringIO()
+            )
+
+
+class ModerationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = create_user("moderator", is_staff=True, is_superuser=True)
+        cls.spammer = create_user("spammer")
+        cls.author = create_user("author")
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_post(self, user: User, title: str) -> Post:
+        return PostService.create_post(
+            user_id=user.id,
+            data={"title": title, "content": "조치 테스트", "category": Post.Category.RATTAN},
+        )
+
+    def test_requires_staff(self) -> None:
+        self.client.force_authenticate(self.author)
+        response = self.client.post(
+            "/api/posts/moderation/",
+            {"target": "POST", "action": "HIDE", "user_id": self.spammer.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_criteria_required(self) -> None:
+        response = self.client.post(
+            "/api/posts/moderation/", {"target": "POST", "action": "HIDE"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_hide_posts_by_author(self) -> None:
+        spam = [self.create_post(self.spammer, f"스팸 {i}") for i in range(3)]
+        kept = self.create_post(self.author, "정상")
+        for post in spam[:2] + [kept]:
+            PostService.toggle_like(post_id=post.id, user_id=self.author.id)
+        PostLeaderboard.rebuild(PostRanking.SCOPE_ALL)
+        versions = dict(Post.all_objects.values_list("id", "version"))
+
+        with mock.patch.object(ModerationService, "BATCH_SIZE", 2):
+            response = self.client.post(
+                "/api/posts/moderation/",
+                {"target": "POST", "action": "HIDE", "user_id": self.spammer.id, "reason": "광고"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["affected_count"], 3)
+        self.assertEqual(response.data["object_ids"], [post.id for post in spam])
+        self.assertEqual(response.data["criteria"], {"user_id": self.spammer.id})
+
+        self.assertEqual(list(Post.objects.values_list("id", flat=True)), [kept.id])
+        for post in Post.all_objects.filter(id__in=[post.id for post in spam]):
+            self.assertEqual(
+                (post.status, post.is_deleted, post.version),
+                ("HIDDEN", False, versions[post.id] + 1),
+            )
+        self.assertEqual(Post.all_objects.get(id=kept.id).version, versions[kept.id])
+        self.assertEqual(PostLeaderboard.get_top_post_ids(), [kept.id])
+
+        log = ModerationLog.objects.get()
+        self.assertEqual((log.moderator_id, log.reason), (self.admin.id, "광고"))
+
+    def test_delete_comments_updates_counts_once(self) -> None:
+        post = self.create_post(self.author, "댓글")
+        other = self.create_post(self.author, "다른 글")
+        comments = [
+            CommentService.create_comment(target.id, self.spammer.id, {"content": "스팸"})
+            for target in [post, post, post, other]
+        ]
+        kept = CommentService.create_comment(post.id, self.author.id, {"content": "정상"})
+        # 이미 숨긴 댓글은 댓글 수에서 빠져 있음 => 삭제해도 다시 감소하지 않음
+        ModerationService.moderate(self.admin.id, "COMMENT", "HIDE", ids=[comments[0].id])
+        self.assertEqual(Post.all_objects.get(id=post.id).comment_count, 3)
+
+        with mock.patch.object(ModerationService, "BATCH_SIZE", 10):
+            with CaptureQueriesContext(connection) as queries:
+                log = ModerationService.moderate(
+                    self.admin.id, "COMMENT", "DELETE", user_id=self.spammer.id
+                )
+        self.assertEqual(log.affected_count, 4)
+        # 배치 하나에 댓글 UPDATE 1번 + 게시글 댓글 수 UPDATE 1번
+        sqls = [query["sql"].strip() for query in queries.captured_queries]
+        updates = [sql for sql in sqls if sql.startswith("UPDATE")]
+        self.assertEqual(len([sql for sql in updates if sql.startswith('UPDATE "comments"')]), 1)
+        self.assertEqual(len([sql for sql in updates if "comment_count" in sql]), 1)
+
+        self.assertEqual(Post.all_objects.get(id=post.id).comment_count, 1)
+        self.assertEqual(Post.all_objects.get(id=other.id).comment_count, 0)
+        self.assertEqual(list(Comment.objects.values_list("id", flat=True)), [kept.id])
+        self.assertEqual(Comment.all_objects.filter(is_deleted=True, status="DELETED").count(), 4)
+
+    def test_admin_actions(self) -> None:
+        posts = [self.create_post(self.spammer, f"스팸 {i}") for i in range(2)]
+        client = self.client_class()
+        client.force_login(self.admin)
+
+        response = client.get("/admin/posts/post/")
+        self.assertEqual(response.status_code, 200)
+        choices = dict(response.context["action_form"].fields["action"].choices)
+        self.assertIn("soft_delete_selected", choices)
+        self.assertNotIn("delete_selected", choices)
+
+        response = client.post(
+            "/admin/posts/post/",
+            {"action": "soft_delete_selected", "_selected_action": [post.id for post in posts]},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Post.all_objects.filter(is_deleted=True).count(), 2)
+        log = ModerationLog.objects.get()
+        self.assertEqual((log.target, log.action, log.reason), ("POST", "DELETE", "관리자 페이지"))
+
+    def test_admin_change_page(self) -> None:
+        post = self.create_post(self.author, "원래 제목")
+        PostService.toggle_like(post_id=post.id, user_id=self.spammer.id)
+        version = Post.objects.get(id=post.id).version
+        client = self.client_class()
+        client.force_login(self.admin)
+        url = f"/admin/posts/post/{post.id}/change/"
+
+        # 카운터 / 버전은 읽기 전용, 수정은 변경한 컬럼만 저장하고 캐시 버전 증가
+        form = client.get(url).context["adminform"].form
+        for field in ("view_count", "like_count", "comment_count", "version"):
+            self.assertNotIn(field, form.fields)
+        response = client.post(
+            url,
+            {
+                "user": post.user_id,
+                "title": "수정한 제목",
+                "content": post.content,
+                "category": Post.Category.FLOWER,
+                "status": post.status,
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        post.refresh_from_db()
+        self.assertEqual((post.title, post.like_count), ("수정한 제목", 1))
+        self.assertEqual(post.version, version + 1)
+        self.assertEqual(PostLeaderboard.get_top_post_ids(category=Post.Category.FLOWER), [post.id])
+
+        # 변경 페이지의 삭제는 소프트 삭제 조치로 처리 (랭킹 제거 + 조치 기록)
+        response = client.post(f"/admin/posts/post/{post.id}/delete/", {"post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        post = Post.all_objects.get(id=post.id)
+        self.assertEqual((post.is_deleted, post.version), (True, version + 2))
+        self.assertFalse(PostRanking.objects.filter(post_id=post.id).exists())
+        log = ModerationLog.objects.get()
+        self.assertEqual((log.action, log.criteria), ("DELETE", {"ids": [post.id]}))
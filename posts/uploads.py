@@ -0,0 +1,175 @@
+import os
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from posts.image_validation import ImageValidator
+from posts.models import PostImage, PostImageUpload
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadOffsetConflict(APIException):
+    # 요청한 청크 시작 위치가 서버가 받은 위치와 다름 (응답의 offset 부터 다시 전송)
+    status_code = status.HTTP_409_CONFLICT
+    default_code = "upload_offset_conflict"
+    default_detail = "업로드 위치가 일치하지 않습니다."
+
+    def __init__(self, offset: int) -> None:
+        super().__init__()
+        # offset 은 문자열로 변환하지 않고 숫자로 응답
+        self.detail = {"detail": self.detail, "offset": offset}
+
+
+def parse_content_range(header: Optional[str], content_length: int) -> Tuple[int, int, int]:
+    # "bytes <시작>-<끝>/<전체>" => (시작, 길이, 전체)
+    match = CONTENT_RANGE_RE.match(header or "")
+    if not match:
+        raise ValidationError("Content-Range 헤더 형식은 'bytes <시작>-<끝>/<전체 크기>' 입니다.")
+
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end - start + 1 != content_length:
+        raise ValidationError("Content-Range 와 Content-Length 가 일치하지 않습니다.")
+    return start, content_length, total
+
+
+class ImageUploadService:
+    # 이어 올리기 가능한 이미지 업로드
+    # - 청크는 요청 본문을 COPY_BUFFER_SIZE 단위로 읽어 MEDIA_ROOT/uploads/<id>.part 에 바로 기록
+    #   => 파일 / 청크 크기와 관계없이 메모리 사용량 일정 (Django 업로드 핸들러 / request.body 미사용)
+    # - 같은 세션에 동시에 들어온 청크는 세션 행 잠금으로 순서대로 처리
+    # - 완료 시 헤더 검증(ImageValidator) 후 게시글 이미지 경로로 저장
+    # - 완료되지 않은 세션 / 게시글에 연결되지 않은 파일은 정리 작업에서 삭제
+
+    UPLOAD_DIR = "uploads"
+    COPY_BUFFER_SIZE = 64 * 1024
+
+    @staticmethod
+    def part_path(upload: PostImageUpload) -> str:
+        return os.path.join(settings.MEDIA_ROOT, ImageUploadService.UPLOAD_DIR, f"{upload.id}.part")
+
+    @staticmethod
+    def create_upload(user_id: int, filename: str, size: int) -> PostImageUpload:
+        if size > ImageValidator.MAX_IMAGE_SIZE:
+            raise ValidationError(
+                f"이미지 크기는 {ImageValidator.MAX_IMAGE_SIZE // 1024 // 1024}MB를 초과할 수 없습니다"
+            )
+
+        upload = PostImageUpload.objects.create(
+            user_id=user_id, filename=os.path.basename(filename), size=size
+        )
+        path = ImageUploadService.part_path(upload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+        return upload
+
+    @staticmethod
+    def get_upload(upload_id: UUID, user_id: int) -> PostImageUpload:
+        return get_object_or_404(PostImageUpload, id=upload_id, user_id=user_id)
+
+    @staticmethod
+    @transaction.atomic
+    def write_chunk(
+        upload_id: UUID, user_id: int, start: int, length: int, total: int, stream: Any
+    ) -> PostImageUpload:
+        upload = get_object_or_404(
+            PostImageUpload.objects.select_for_update(), id=upload_id, user_id=user_id
+        )
+        if upload.status != PostImageUpload.Status.UPLOADING:
+            raise ValidationError("이미 완료된 업로드입니다.")
+        if total != upload.size or start + length > upload.size:
+            raise ValidationError("업로드 범위가 파일 크기를 벗어났습니다.")
+        if start != upload.offset:
+            raise UploadOffsetConflict(upload.offset)
+
+        # 연결이 끊겨 일부만 받은 경우 받은 만큼 반영 (다음 요청은 응답의 offset 부터)
+        written = 0
+        with open(ImageUploadService.part_path(upload), "r+b") as f:
+            f.seek(start)
+            while written < length:
+                chunk = stream.read(min(ImageUploadService.COPY_BUFFER_SIZE, length - written))
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+
+        upload.offset = start + written
+        upload.save(update_fields=["offset", "updated_at"])
+        return upload
+
+    @staticmethod
+    @transaction.atomic
+    def complete_upload(upload_id: UUID, user_id: int) -> PostImageUpload:
+        upload = get_object_or_404(
+            PostImageUpload.objects.select_for_update(), id=upload_id, user_id=user_id
+        )
+        if upload.status == PostImageUpload.Status.COMPLETED:
+            return upload
+        if upload.offset != upload.size:
+            raise ValidationError("업로드가 끝나지 않았습니다.")
+
+        path = ImageUploadService.part_path(upload)
+        with open(path, "rb") as f:
+            image = File(f, name=upload.filename)
+            info = ImageValidator.validate_image(image)
+
+            # 게시글 이미지 저장소에 같은 규칙(내용 해시 경로)으로 저장 (판별한 형식의 확장자 사용)
+            field = PostImage._meta.get_field("image_url")
+            name = field.generate_filename(
+                None, os.path.splitext(upload.filename)[0] + info.extension
+            )
+            upload.image_name = field.storage.save(name, image)
+        os.remove(path)
+
+        upload.status = PostImageUpload.Status.COMPLETED
+        upload.width, upload.height = info.width, info.height
+        upload.save(update_fields=["status", "image_name", "width", "height", "updated_at"])
+        return upload
+
+    @staticmethod
+    def cancel_upload(upload_id: UUID, user_id: int) -> None:
+        upload = ImageUploadService.get_upload(upload_id, user_id)
+        path = ImageUploadService.part_path(upload)
+        image_name = upload.image_name
+        upload.delete()
+
+        def remove_files() -> None:
+            if os.path.exists(path):
+                os.remove(path)
+            # 같은 내용의 파일을 다른 게시글 이미지 / 업로드가 공유하고 있으면 남겨 둠
+            if (
+                image_name
+                and not PostImage.objects.filter(image_url=image_name).exists()
+                and not PostImageUpload.objects.filter(image_name=image_name).exists()
+            ):
+                PostImage._meta.get_field("image_url").storage.delete(image_name)
+
+        transaction.on_commit(remove_files)
+
+    @staticmethod
+    def claim_uploads(user_id: int, upload_ids: Sequence[UUID]) -> List[PostImageUpload]:
+        # 게시글에 연결할 완료된 업로드 (요청 순서 유지), 연결 후 세션 삭제
+        if not upload_ids:
+            return []
+
+        uploads = PostImageUpload.objects.select_for_update().in_bulk(
+            list(upload_ids), field_name="id"
+        )
+        claimed = [uploads.get(upload_id) for upload_id in dict.fromkeys(upload_ids)]
+        if any(
+            upload is None
+            or upload.user_id != user_id
+            or upload.status != PostImageUpload.Status.COMPLETED
+            for upload in claimed
+        ):
+            raise ValidationError("완료되지 않았거나 존재하지 않는 업로드입니다.")
+
+        PostImageUpload.objects.filter(id__in=[upload.id for upload in claimed]).delete()
+        return claimed
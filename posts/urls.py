@@ -1,9 +1,15 @@
 from django.urls import path
 
 from .views import (
+    ModerationView,
     PostCreateView,
     PostDeleteView,
+    PostDetailCacheStatsView,
     PostDetailView,
+    PostImageUploadCompleteView,
+    PostImageUploadCreateView,
+    PostImageUploadView,
+    PostLikeStatusView,
     PostLikeView,
     PostListView,
     PostUpdateView,
@@ -15,6 +21,16 @@ app_name = "posts"
 urlpatterns = [
     path("", PostListView.as_view(), name="post-list"),
     path("create/", PostCreateView.as_view(), name="post-create"),
+    path("liked/", PostLikeStatusView.as_view(), name="post-like-status"),
+    path("moderation/", ModerationView.as_view(), name="post-moderation"),
+    path("cache/stats/", PostDetailCacheStatsView.as_view(), name="post-detail-cache-stats"),
+    path("uploads/", PostImageUploadCreateView.as_view(), name="post-image-upload-create"),
+    path("uploads/<uuid:upload_id>/", PostImageUploadView.as_view(), name="post-image-upload"),
+    path(
+        "uploads/<uuid:upload_id>/complete/",
+        PostImageUploadCompleteView.as_view(),
+        name="post-image-upload-complete",
+    ),
     path("<int:post_id>/", PostDetailView.as_view(), name="post-detail"),
     path("<int:post_id>/update/", PostUpdateView.as_view(), name="post-update"),
     path("<int:post_id>/delete/", PostDeleteView.as_view(), name="post-delete"),
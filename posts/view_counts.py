@@ -0,0 +1,129 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    # 게시글 조회수 쓰기 버퍼
+    # - 상세 조회마다 UPDATE 하지 않고 프로세스 메모리에 증가분을 누적
+    # - VIEW_COUNT_FLUSH_INTERVAL 초마다 백그라운드 스레드가
+    #   한 번의 UPDATE ... FROM (VALUES ...) 로 반영
+    # - 누적분이 VIEW_COUNT_MAX_PENDING 을 넘으면 백그라운드 스레드를 깨워 바로 반영
+    #   (요청 스레드에서 반영하면 ATOMIC_REQUESTS 트랜잭션 안에서 다른 요청의 누적분까지
+    #    잠그고, 요청이 롤백되면 버퍼에서 꺼낸 누적분이 함께 사라짐)
+    #   => 프로세스가 비정상 종료되어도 유실되는 조회수는 최대 (주기, 최대 누적 수) 이내
+    # - 정상 종료 시(atexit) 남은 누적분 반영
+    # - 반영 실패 시 누적분을 되돌려 다음 주기에 재시도
+
+    def __init__(self) -> None:
+        self._pending: Counter[int] = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+
+    @property
+    def flush_interval(self) -> float:
+        return float(getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 5))
+
+    @property
+    def max_pending(self) -> int:
+        return int(getattr(settings, "VIEW_COUNT_MAX_PENDING", 1000))
+
+    def add(self, post_id: int, count: int = 1) -> None:
+        with self._lock:
+            self._pending[post_id] += count
+            self._pending_total += count
+            total = self._pending_total
+
+        # 주기가 0 이하이면 버퍼 없이 즉시 반영 (요청 트랜잭션에 포함)
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+
+        if total >= self.max_pending:
+            self._wake.set()
+        self._ensure_flusher()
+
+    def pending(self, post_id: int) -> int:
+        # 아직 DB에 반영되지 않은 조회수 (응답에 더해서 표시)
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def flush(self) -> int:
+        # 누적분을 한 번의 UPDATE 로 반영하고 반영한 게시글 수 반환
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                snapshot: Dict[int, int] = dict(self._pending)
+                self._pending.clear()
+                self._pending_total = 0
+
+            try:
+                self._apply(snapshot)
+            except Exception:
+                logger.exception("조회수 반영 실패: %d개 게시글, 다음 주기에 재시도", len(snapshot))
+                with self._lock:
+                    self._pending.update(snapshot)
+                    self._pending_total += sum(snapshot.values())
+                return 0
+
+            return len(snapshot)
+
+    @staticmethod
+    def _apply(increments: Dict[int, int]) -> None:
+        # 여러 워커가 동시에 반영할 때 교착 상태를 피하기 위해 id 순으로 갱신
+        post_ids = sorted(increments)
+        values = ", ".join(["(%s, %s)"] * len(post_ids))
+        params = [value for post_id in post_ids for value in (post_id, increments[post_id])]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE posts
+                SET view_count = posts.view_count + v.delta
+                FROM (VALUES {values}) AS v(id, delta)
+                WHERE posts.id = v.id
+                """,
+                params,
+            )
+
+    def _ensure_flusher(self) -> None:
+        # gunicorn 워커 fork 이후 프로세스별로 한 번만 스레드 시작
+        pid = os.getpid()
+        if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="view-count-flusher", daemon=True
+            )
+            self._thread_pid = pid
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                # 스레드 전용 DB 커넥션 정리
+                connection.close()
+
+
+view_count_buffer = ViewCountBuffer()
+atexit.register(view_count_buffer.flush)
@@ -1,27 +1,66 @@
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
 
 from django.db import transaction
+from django.utils.decorators import method_decorator
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
-from PIL import Image
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from posts.models import PostImage
+from posts.cache import PostDetailCache, PostListCache
+from posts.conditional import build_etag, is_not_modified, not_modified, with_etag
+from posts.fast_serializers import serialize_post_detail, serialize_post_list
+from posts.image_validation import ImageValidator
+from posts.models import Post, PostImage
+from posts.moderation import ModerationService
 from posts.serializers import (
+    ModerationLogSerializer,
+    ModerationSerializer,
     PostCreateSerializer,
     PostDetailSerializer,
+    PostImageUploadCreateSerializer,
+    PostImageUploadSerializer,
     PostLikeResponseSerializer,
+    PostLikeStatusResponseSerializer,
+    PostLikeToggleResponseSerializer,
     PostListSerializer,
     PostSerializer,
     PostUpdateSerializer,
 )
 from posts.services import PostService
+from posts.uploads import ImageUploadService, parse_content_range
+
+
+def get_post_list_context(
+    request: Request, posts: List[Post], search_keyword: Optional[str] = None
+) -> Dict[str, Any]:
+    # 목록 시리얼라이저 context 구성
+    # 로그인 사용자의 좋아요 여부는 페이지 단위로 한 번에 조회 (게시글마다 쿼리하지 않음)
+    user_id = request.user.id if request.user.is_authenticated else None
+    return {
+        "user_id": user_id,
+        "request": request,
+        "search_keyword": search_keyword,
+        "liked_post_ids": (
+            PostService.get_liked_post_ids(user_id, [post.id for post in posts])
+            if user_id
+            else set()
+        ),
+    }
+
+
+def get_post_list_etag(
+    user_id: Optional[int], versions: List[Tuple[int, int, int]], has_next: bool
+) -> str:
+    # 목록 ETag: 페이지에 포함된 게시글의 (id, 캐시 버전, 조회수) + 다음 페이지 여부
+    # 좋아요 / 댓글 / 수정은 캐시 버전을 올리므로 목록 항목 변경이 모두 반영됨
+    return build_etag("posts", user_id or 0, versions, has_next)
 
 
 # 게시글 목록 조회
@@ -31,10 +70,18 @@ class PostListView(APIView):
 
     @extend_schema(
         parameters=[
-            OpenApiParameter(name="cursor", type=int, description="마지막으로 본 게시글 ID"),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                description="마지막으로 본 게시글 ID (검색 시에는 응답의 next_cursor 문자열)",
+            ),
             OpenApiParameter(name="category", type=str, description="게시글 카테고리"),
             OpenApiParameter(name="search", type=str, description="검색어"),
-            OpenApiParameter(name="top_liked", type=bool, description="좋아요 TOP 10 조회"),
+            OpenApiParameter(
+                name="top_liked",
+                type=bool,
+                description="좋아요 TOP 10 조회 (category 지정 시 카테고리별 TOP 10)",
+            ),
             OpenApiParameter(name="limit", type=int, description="조회할 게시글 수 (5 또는 10)"),
         ],
         responses={200: PostListSerializer(many=True)},
@@ -56,28 +103,66 @@ class PostListView(APIView):
         # cursor 파라미터 처리
         cursor = int(cursor_param) if cursor_param and cursor_param.isdigit() else None
 
-        # context 구성
-        context = {
-            "user_id": request.user.id if request.user.is_authenticated else None,
-            "request": request,
-        }
-
-        # 게시글 목록 조회
-        posts, has_next, next_cursor = PostService.get_post_list(
-            category=category,
-            search_keyword=search,
-            cursor=cursor,
-            limit=limit,  # PAGE_SIZE 대신 limit 사용
-            is_top_liked=is_top_liked,
-        )
+        # 검색어가 있는 경우 전문 검색 (관련도 순, 문자열 커서)
+        if search and not is_top_liked:
+            posts, has_next, search_cursor = PostService.search_posts(
+                search_keyword=search,
+                category=category,
+                cursor=cursor_param,
+                limit=limit,
+            )
+            context = get_post_list_context(request, posts, search_keyword=search)
+            data = serialize_post_list(posts, context)
+            return Response({"data": data, "has_next": has_next, "next_cursor": search_cursor})
+
+        user_id = request.user.id if request.user.is_authenticated else None
+
+        def build() -> Dict[str, Any]:
+            # 게시글 목록 조회
+            posts, has_next, next_cursor = PostService.get_post_list(
+                category=category,
+                cursor=cursor,
+                limit=limit,  # PAGE_SIZE 대신 limit 사용
+                is_top_liked=is_top_liked,
+            )
+
+            context = get_post_list_context(request, posts)
+            data = serialize_post_list(posts, context)
+
+            # TOP 10 조회 시에는 페이지네이션 정보 제외
+            if is_top_liked:
+                body = {"data": data}
+            else:
+                body = {"data": data, "has_next": has_next, "next_cursor": next_cursor}
+
+            versions = [(post.id, post.version, post.view_count) for post in posts]
+            return {"body": body, "etag": get_post_list_etag(user_id, versions, has_next)}
+
+        # 로그인 사용자(is_liked 포함) / TOP 10 / 알 수 없는 카테고리 조회는 캐시하지 않음
+        if (
+            request.user.is_authenticated
+            or is_top_liked
+            or (category and category not in Post.Category.values)
+        ):
+            # 페이지 구성 (id, 캐시 버전, 조회수)만 조회해 변경이 없으면 304
+            state = PostService.get_post_list_versions(
+                category=category, cursor=cursor, limit=limit, is_top_liked=is_top_liked
+            )
+            if state is not None:
+                etag = get_post_list_etag(user_id, *state)
+                if is_not_modified(request, etag):
+                    return not_modified(request, etag)
 
-        serializer = PostListSerializer(posts, many=True, context=context)
+            result = build()
+            return with_etag(request, Response(result["body"]), result["etag"])
 
-        # TOP 10 조회 시에는 페이지네이션 정보 제외
-        if is_top_liked:
-            return Response({"data": serializer.data})
+        # 비로그인 목록은 캐시된 응답과 함께 저장된 ETag 로 비교 (적중 시 DB 조회 없음)
+        result, hit = PostListCache.get_or_build(category, cursor, limit, request, build)
+        if is_not_modified(request, result["etag"]):
+            return not_modified(request, result["etag"])
 
-        return Response({"data": serializer.data, "has_next": has_next, "next_cursor": next_cursor})
+        response = Response(result["body"], headers={"X-Cache": "HIT" if hit else "MISS"})
+        return with_etag(request, response, result["etag"])
 
 
 class PostDetailView(APIView):
@@ -85,79 +170,86 @@ class PostDetailView(APIView):
 
     @extend_schema(responses={200: PostDetailSerializer})
     def get(self, request: Request, post_id: int) -> Response:
-        post = PostService.get_post_detail(
-            post_id=post_id,
-            user_id=request.user.id if request.user.is_authenticated else None,
-        )
+        user_id = request.user.id if request.user.is_authenticated else None
 
-        # 조회수 증가
-        PostService.increase_view_count(post_id)
+        # 존재 여부 / 캐시 버전 / 조회수 / 좋아요 여부만 가볍게 조회
+        state = PostService.get_post_state(post_id, user_id=user_id)
+        is_liked = bool(state.get("is_liked", False))
 
-        context = {
-            "request": request,
-            "user_id": request.user.id if request.user.is_authenticated else None,
-        }
+        # 조회수는 버퍼 반영 주기마다만 바뀌도록 DB 값만 ETag 에 포함
+        etag = build_etag("post", post_id, state["version"], state["view_count"], user_id or 0)
+        if is_not_modified(request, etag):
+            # 재검증 요청도 조회로 집계
+            PostService.increase_view_count(post_id)
+            return not_modified(request, etag)
 
-        serializer = PostDetailSerializer(post, context=context)
-        response = Response(serializer.data)
-        response["Cache-Control"] = "no-cache"
-        return response
+        def build() -> Dict[str, Any]:
+            # 캐시 미적중 시에만 전체 상세 응답 생성 (사용자별 값 제외)
+            post = PostService.get_post_detail(post_id=post_id)
+            context = {"request": request, "user_id": None}
+            return serialize_post_detail(post, context)
 
+        body, hit = PostDetailCache.get_or_build(post_id, state["version"], request, build)
 
-class PostCreateView(APIView):
-    serializer_class = PostCreateSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]  # 로그인 사용자만 작성 가능
+        # 조회수 증가 (버퍼에 누적, 아직 반영되지 않은 조회수를 응답에 포함)
+        PostService.increase_view_count(post_id)
 
-    MAX_IMAGE_SIZE: int = 5 * 1024 * 1024  # 5MB
-    ALLOWED_IMAGE_TYPES: set[str] = {"image/jpeg", "image/png", "image/gif"}
-    MAX_IMAGE_COUNT: int = 10
+        # 사용자별 값 / 실시간 값은 캐시된 응답 위에 덮어씀
+        data = dict(body)
+        data["view_count"] = state["view_count"] + PostService.get_pending_view_count(post_id)
+        data["is_liked"] = is_liked
 
-    @classmethod
-    def validate_images(cls, files: List[Any]) -> List[Any]:
-        if not files:
-            return files
+        response = Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
+        return with_etag(request, response, etag)
 
-        if len(files) > cls.MAX_IMAGE_COUNT:
-            raise ValidationError(f"이미지는 최대 {cls.MAX_IMAGE_COUNT}개까지 업로드 가능합니다")
 
-        total_size = 0
-        for image in files:
-            if not hasattr(image, "size"):
-                raise ValidationError("올바르지 않은 이미지 파일입니다")
+# 게시글 상세 캐시 적중률 조회 (관리자 전용, 공유 캐시 사용 시 전체 워커 합산)
+class PostDetailCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request: Request) -> Response:
+        return Response(PostDetailCache.stats())
 
-            total_size += image.size
-            if image.size > cls.MAX_IMAGE_SIZE:
-                raise ValidationError(
-                    f"이미지 크기는 {cls.MAX_IMAGE_SIZE // 1024 // 1024}MB를 초과할 수 없습니다"
-                )
 
-            if (
-                not hasattr(image, "content_type")
-                or image.content_type not in cls.ALLOWED_IMAGE_TYPES
-            ):
-                raise ValidationError(f"허용된 이미지 형식: {', '.join(cls.ALLOWED_IMAGE_TYPES)}")
+# 관리자 일괄 조치: 배치마다 트랜잭션을 나누므로 요청 전체 트랜잭션(ATOMIC_REQUESTS)에서 제외
+# => 대상이 많아도 잠금이 요청이 끝날 때까지 쌓이지 않음
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ModerationView(APIView):
+    serializer_class = ModerationSerializer
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(request=ModerationSerializer, responses={201: ModerationLogSerializer})
+    def post(self, request: Request) -> Response:
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        log = ModerationService.moderate(moderator_id=request.user.id, **serializer.validated_data)
+        return Response(ModerationLogSerializer(log).data, status=status.HTTP_201_CREATED)
 
-            try:
-                Image.open(image).verify()
-            except Exception:
-                raise ValidationError("손상된 이미지 파일입니다")
 
-        return files
+class PostCreateView(APIView):
+    serializer_class = PostCreateSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]  # 로그인 사용자만 작성 가능
 
     @extend_schema(request=PostCreateSerializer, responses={201: PostDetailSerializer})
     def post(self, request: Request) -> Response:
         serializer = PostCreateSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
+        images = ImageValidator.validate(request.FILES.getlist("images"))
 
         post = PostService.create_post(
             user_id=request.user.id,
             data=serializer.validated_data,
-            images=request.FILES.getlist("images"),
+            images=images,
+            upload_ids=serializer.validated_data.get("upload_ids"),
         )
+        post = PostService.get_post_detail(post_id=post.id)
 
+        # 새 게시글은 좋아요가 없으므로 좋아요 여부를 조회하지 않음
+        context = {"request": request, "liked_post_ids": ()}
         return Response(
-            PostDetailSerializer(post, context={"request": request}).data,
-            status=status.HTTP_201_CREATED,
+            PostDetailSerializer(post, context=context).data, status=status.HTTP_201_CREATED
         )
 
 
@@ -167,23 +259,103 @@ class PostUpdateView(APIView):
 
     @extend_schema(request=PostUpdateSerializer, responses={200: PostDetailSerializer})
     def patch(self, request: Request, post_id: int) -> Response:
-        # 기존 request.data를 새로운 딕셔너리로 복사
-        data = request.data.copy()
-
-        serializer = PostUpdateSerializer(data=data)
+        # request.data 를 복사하면 업로드 파일까지 깊은 복사되므로 그대로 사용
+        serializer = PostUpdateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        add_images = ImageValidator.validate(request.FILES.getlist("add_images"))
 
         post = PostService.update_post(
             post_id=post_id,
             user_id=request.user.id,
             data=serializer.validated_data,
-            add_image=request.FILES.getlist("add_images"),
+            add_image=add_images,
             remove_image_ids=serializer.validated_data.get("remove_image_ids"),
+            add_upload_ids=serializer.validated_data.get("add_upload_ids"),
         )
+        # 좋아요 여부는 상세 조회와 함께 prefetch
+        post = PostService.get_post_detail(post_id=post.id, user_id=request.user.id)
 
         return Response(PostDetailSerializer(post, context={"request": request}).data)
 
 
+class PostImageUploadCreateView(APIView):
+    # 이어 올리기 세션 생성
+    # 1. POST /uploads/ {filename, size} => 세션 id
+    # 2. PUT /uploads/<id>/ (Content-Range: bytes <시작>-<끝>/<전체>, 본문은 청크 바이트)
+    #    연결이 끊기면 GET /uploads/<id>/ 의 offset 부터 다시 전송
+    # 3. POST /uploads/<id>/complete/ => 이미지 검증 후 저장
+    # 4. 게시글 작성 / 수정 시 upload_ids / add_upload_ids 로 참조
+    serializer_class = PostImageUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=PostImageUploadCreateSerializer, responses={201: PostImageUploadSerializer}
+    )
+    def post(self, request: Request) -> Response:
+        serializer = PostImageUploadCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = ImageUploadService.create_upload(
+            user_id=request.user.id,
+            filename=serializer.validated_data["filename"],
+            size=serializer.validated_data["size"],
+        )
+        return Response(PostImageUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class PostImageUploadView(APIView):
+    serializer_class = PostImageUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(responses={200: PostImageUploadSerializer})
+    def get(self, request: Request, upload_id: UUID) -> Response:
+        upload = ImageUploadService.get_upload(upload_id=upload_id, user_id=request.user.id)
+        return Response(PostImageUploadSerializer(upload).data)
+
+    @extend_schema(
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+        parameters=[
+            OpenApiParameter(
+                name="Content-Range",
+                type=str,
+                location=OpenApiParameter.HEADER,
+                required=True,
+                description="bytes <시작>-<끝>/<전체 크기>",
+            )
+        ],
+        responses={200: PostImageUploadSerializer},
+    )
+    def put(self, request: Request, upload_id: UUID) -> Response:
+        # 요청 본문은 request.data 로 파싱하지 않고 스트림에서 나누어 읽어 파일에 기록
+        start, length, total = parse_content_range(
+            request.headers.get("Content-Range"), int(request.headers.get("Content-Length") or 0)
+        )
+        upload = ImageUploadService.write_chunk(
+            upload_id=upload_id,
+            user_id=request.user.id,
+            start=start,
+            length=length,
+            total=total,
+            stream=request._request,
+        )
+        return Response(PostImageUploadSerializer(upload).data)
+
+    @extend_schema(responses={204: None})
+    def delete(self, request: Request, upload_id: UUID) -> Response:
+        ImageUploadService.cancel_upload(upload_id=upload_id, user_id=request.user.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PostImageUploadCompleteView(APIView):
+    serializer_class = PostImageUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=None, responses={200: PostImageUploadSerializer})
+    def post(self, request: Request, upload_id: UUID) -> Response:
+        upload = ImageUploadService.complete_upload(upload_id=upload_id, user_id=request.user.id)
+        return Response(PostImageUploadSerializer(upload).data)
+
+
 class PostDeleteView(APIView):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -194,10 +366,13 @@ class PostDeleteView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+# 좋아요 토글은 단일 SQL 문으로 처리되므로 요청 전체 트랜잭션(ATOMIC_REQUESTS)에서 제외
+# => 게시글 행 잠금이 요청이 끝날 때까지 유지되지 않음
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class PostLikeView(APIView):
-    serializer_class = PostLikeResponseSerializer
+    serializer_class = PostLikeToggleResponseSerializer
 
-    @extend_schema(responses={200: PostLikeResponseSerializer})
+    @extend_schema(responses={200: PostLikeToggleResponseSerializer})
     def post(self, request: Request, post_id: int) -> Response:
         if not request.user.is_authenticated:
             return Response(
@@ -205,11 +380,13 @@ class PostLikeView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        is_liked = PostService.toggle_like(
+        is_liked, like_count = PostService.toggle_like(
             post_id=post_id,
             user_id=request.user.id,
         )
-        return Response({"is_liked": is_liked, "message": "좋아요가 처리되었습니다"})
+        return Response(
+            {"is_liked": is_liked, "like_count": like_count, "message": "좋아요가 처리되었습니다"}
+        )
 
 
 class UserPostListView(APIView):
@@ -238,8 +415,50 @@ class UserPostListView(APIView):
             user_id=request.user.id, cursor=cursor, limit=10
         )
 
-        serializer = PostListSerializer(posts, many=True, context={"request": request})
-        return Response({"data": serializer.data, "has_next": has_next, "next_cursor": next_cursor})
+        context = get_post_list_context(request, posts)
+        data = serialize_post_list(posts, context)
+        return Response({"data": data, "has_next": has_next, "next_cursor": next_cursor})
+
+
+# 여러 게시글의 좋아요 여부 일괄 조회
+class PostLikeStatusView(APIView):
+    serializer_class = PostLikeStatusResponseSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    MAX_POST_IDS: int = 100
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="post_ids",
+                type=str,
+                description="좋아요 여부를 조회할 게시글 ID들을 콤마(,)로 구분하여 입력 (예: '1,2,3')",
+            ),
+        ],
+        responses={200: PostLikeStatusResponseSerializer},
+        # <int:post_id>/liked/ (posts_liked_retrieve) 와 operationId 가 겹치지 않도록 지정
+        operation_id="posts_like_status_retrieve",
+    )
+    def get(self, request: Request) -> Response:
+        if not request.user.is_authenticated:
+            return Response(
+                {"detail": "로그인이 필요한 서비스입니다."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        raw_ids = request.query_params.get("post_ids", "")
+        try:
+            post_ids = list(
+                dict.fromkeys(int(post_id) for post_id in raw_ids.split(",") if post_id)
+            )
+        except ValueError:
+            raise ValidationError("post_ids는 콤마로 구분된 숫자여야 합니다.")
+
+        if len(post_ids) > self.MAX_POST_IDS:
+            raise ValidationError(f"한 번에 최대 {self.MAX_POST_IDS}개까지 조회할 수 있습니다.")
+
+        liked_post_ids = PostService.get_liked_post_ids(request.user.id, post_ids)
+        return Response({"data": {post_id: post_id in liked_post_ids for post_id in post_ids}})
 
 
 # 유저가 좋아요한 게시글 좋아요 boolean 조회